@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import weakref
+
+from backend.scheduler import CancellationToken
+
+
+class _SharedConversion:
+    """Conversion en cours partagée par tous les appelants qui ont fait la même demande."""
+
+    __slots__ = ("task", "token", "waiters")
+
+    def __init__(self, task, token):
+        self.task = task
+        self.token = token
+        self.waiters = 0
+
+
+class AsyncConversionGate:
+    """
+    Exécution asyncio des conversions synchrones du moteur.
+
+    - La conversion tourne dans l'exécuteur par défaut de la boucle : la boucle n'est
+      jamais bloquée par les échanges avec liblouis.
+    - Un sémaphore par boucle limite le nombre de conversions simultanées.
+    - Les demandes identiques en cours sont fusionnées : une seule traduction, dont
+      le résultat est rendu à chaque appelant.
+    - Un délai dépassé n'abandonne que l'attente de l'appelant ; la conversion n'est
+      annulée (jeton) que lorsque plus aucun appelant ne l'attend.
+    """
+
+    def __init__(self, max_concurrency=4):
+        self.max_concurrency = max(1, max_concurrency)
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._in_flight = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def _loop_state(self, loop):
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.max_concurrency)
+                self._semaphores[loop] = semaphore
+                self._in_flight[loop] = {}
+            return semaphore, self._in_flight[loop]
+
+    async def run(self, key, convert, timeout=None):
+        """
+        Exécute `convert(token)` (fonction bloquante) pour la demande `key` et renvoie
+        son résultat ; lève asyncio.TimeoutError si `timeout` est dépassé.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore, in_flight = self._loop_state(loop)
+        shared = in_flight.get(key)
+        if shared is None:
+            token = CancellationToken()
+
+            async def execute():
+                try:
+                    async with semaphore:
+                        token.raise_if_cancelled()
+                        return await loop.run_in_executor(None, convert, token)
+                finally:
+                    if in_flight.get(key) is shared:
+                        del in_flight[key]
+
+            shared = _SharedConversion(None, token)
+            in_flight[key] = shared
+            shared.task = loop.create_task(execute())
+        else:
+            self.coalesced += 1
+
+        shared.waiters += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(shared.task), timeout)
+        finally:
+            shared.waiters -= 1
+            if shared.waiters == 0 and not shared.task.done():
+                shared.token.cancel()
+                shared.task.cancel()
+                if in_flight.get(key) is shared:
+                    del in_flight[key]
@@ -0,0 +1,120 @@
+import math
+import threading
+
+
+class _TuningState:
+    __slots__ = ("batch_size", "latency", "throughput", "batches", "parallel_throughput", "dispatches")
+
+    def __init__(self, batch_size):
+        self.batch_size = batch_size
+        self.latency = None
+        self.throughput = None
+        self.batches = 0
+        self.parallel_throughput = {}
+        self.dispatches = 0
+
+
+class BatchTuner:
+    """
+    Ajuste, par table et par sens, la taille des lots envoyés au moteur et le nombre
+    de lots traités en parallèle.
+
+    - Taille : après chaque lot, la latence mesurée est comparée à `target_latency`.
+      Un lot plein nettement plus rapide que la cible fait grandir la taille (le coût
+      fixe par appel domine) ; un lot trop lent la réduit proportionnellement, pour
+      qu'une modification interactive n'attende jamais un lot trop gros.
+    - Parallélisme : le débit global (lignes/s) est suivi pour chaque niveau de
+      parallélisme essayé ; le meilleur est retenu, les niveaux voisins sont
+      réessayés de temps en temps pour suivre l'évolution de la charge.
+    """
+
+    def __init__(self, target_latency=0.05, initial_size=50, min_size=8, max_size=2000,
+                 max_parallel=4, smoothing=0.3, explore_every=16):
+        self.target_latency = target_latency
+        self.initial_size = initial_size
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_parallel = max(1, max_parallel)
+        self.smoothing = smoothing
+        self.explore_every = explore_every
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def _state(self, key):
+        state = self._states.get(key)
+        if state is None:
+            state = _TuningState(self.initial_size)
+            self._states[key] = state
+        return state
+
+    def _smooth(self, previous, value):
+        if previous is None:
+            return value
+        return previous + self.smoothing * (value - previous)
+
+    def plan(self, key, line_count):
+        """Renvoie (taille de lot, nombre de lots en parallèle) pour `line_count` lignes."""
+        with self._lock:
+            state = self._state(key)
+            batch_size = state.batch_size
+            batch_count = max(1, math.ceil(line_count / batch_size))
+            limit = min(self.max_parallel, batch_count)
+            if limit == 1:
+                return batch_size, 1
+            state.dispatches += 1
+            measured = {p: t for p, t in state.parallel_throughput.items() if p <= limit}
+            untried = [p for p in range(1, limit + 1) if p not in measured]
+            if untried:
+                # Niveau encore jamais mesuré : on part du plus élevé
+                return batch_size, untried[-1]
+            best = max(measured, key=measured.get)
+            if self.explore_every and state.dispatches % self.explore_every == 0:
+                neighbours = [p for p in (best - 1, best + 1) if 1 <= p <= limit]
+                best = neighbours[(state.dispatches // self.explore_every) % len(neighbours)]
+            return batch_size, best
+
+    def record_batch(self, key, line_count, elapsed):
+        """Enregistre la durée d'un lot et ajuste la taille des lots suivants."""
+        if line_count <= 0:
+            return
+        elapsed = max(elapsed, 1e-6)
+        with self._lock:
+            state = self._state(key)
+            state.batches += 1
+            state.latency = self._smooth(state.latency, elapsed)
+            state.throughput = self._smooth(state.throughput, line_count / elapsed)
+            size = state.batch_size
+            if state.latency > self.target_latency:
+                size = int(size * max(0.5, self.target_latency / state.latency))
+            elif line_count >= size and state.latency < self.target_latency / 2:
+                size = int(size * 1.5) + 1
+            state.batch_size = max(self.min_size, min(self.max_size, size))
+
+    def record_dispatch(self, key, parallel, line_count, elapsed):
+        """Enregistre le débit global d'un envoi découpé en plusieurs lots."""
+        if parallel <= 0 or line_count <= 0:
+            return
+        elapsed = max(elapsed, 1e-6)
+        with self._lock:
+            state = self._state(key)
+            state.parallel_throughput[parallel] = self._smooth(
+                state.parallel_throughput.get(parallel), line_count / elapsed
+            )
+
+    def snapshot(self):
+        """Valeurs retenues par (table, sens) : taille de lot, parallélisme, latence et débit mesurés."""
+        with self._lock:
+            snapshot = {}
+            for key, state in self._states.items():
+                parallel = (
+                    max(state.parallel_throughput, key=state.parallel_throughput.get)
+                    if state.parallel_throughput else 1
+                )
+                snapshot[key] = {
+                    "batch_size": state.batch_size,
+                    "parallel": parallel,
+                    "latency": state.latency,
+                    "throughput": state.throughput,
+                    "batches": state.batches,
+                }
+            return snapshot
@@ -1,35 +1,209 @@
 import subprocess
 import os
 import unicodedata
-import re
-from collections import OrderedDict
+from collections import OrderedDict, deque
 from PyQt5.QtWidgets import QMessageBox, QFileDialog
-from backend.config import LOU_TRANSLATE_PATH, TABLES_DIRECTORY
-from concurrent.futures import ThreadPoolExecutor
+from backend.config import (
+    LOU_TRANSLATE_PATH, TABLES_DIRECTORY, TABLE_NAMES,
+    LOU_POOL_MIN_WORKERS, LOU_POOL_MAX_WORKERS, LOU_POOL_IDLE_TIMEOUT,
+    TRANSLATION_CACHE_MAX_BYTES, TRANSLATION_DISK_CACHE_PATH, TRANSLATION_DISK_CACHE_MAX_BYTES,
+    BATCH_TARGET_LATENCY, ASYNC_MAX_CONCURRENCY, GRADE1_FAST_PATH
+)
+from concurrent.futures import ThreadPoolExecutor, CancelledError, FIRST_COMPLETED, wait
 import threading
 import shutil
 import logging
 import json
+import hashlib
+import time
 from backend.language_detector import LanguageDetector
+from backend.lou_pool import LouTranslatePool, LouPoolError
+from backend.table_registry import TableRegistry
+from backend.custom_substitution import SubstitutionTrie
+from backend.translation_cache import TranslationMemo
+from backend.persistent_cache import PersistentTranslationCache
+from backend.batch_tuner import BatchTuner
+from backend.fast_path import Grade1FastPath, table_context_characters
+from backend.layout import LayoutCache, TranslatedDocument, paragraph_chunks
+from backend.async_conversion import AsyncConversionGate
+from backend.scheduler import (
+    PriorityExecutor, TokenRegistry, CancelledConversion,
+    PRIORITY_INTERACTIVE, PRIORITY_VISIBLE, PRIORITY_BACKGROUND
+)
 
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
 CUSTOM_TABLE_FILE = "custom_tables.json"
 
+
+class TranslationBackend:
+    """
+    Interface commune des moteurs de traduction liblouis.
+
+    `translate` reçoit des lignes non vides et renvoie exactement une ligne traduite
+    par ligne reçue, dans le même ordre.
+    """
+
+    name = "abstract"
+
+    def translate(self, lines, table_path, forward=True, capitalize=False):
+        raise NotImplementedError
+
+    def warm_up(self, table_path):
+        pass
+
+    def shutdown(self):
+        pass
+
+
+class SubprocessBackend(TranslationBackend):
+    """Traduction via l'exécutable lou_translate : pool de processus persistants, sinon un processus par lot."""
+
+    name = "subprocess"
+
+    def __init__(self, lou_path, tables_dir):
+        self.lou_path = lou_path
+        self.tables_dir = tables_dir
+        self.pool = LouTranslatePool(
+            lou_path,
+            tables_dir,
+            min_workers=LOU_POOL_MIN_WORKERS,
+            max_workers=LOU_POOL_MAX_WORKERS,
+            idle_timeout=LOU_POOL_IDLE_TIMEOUT
+        )
+
+    def translate(self, lines, table_path, forward=True, capitalize=False):
+        if self.pool.available:
+            try:
+                return self.pool.translate(lines, table_path, forward=forward, capitalize=capitalize)
+            except LouPoolError as e:
+                logging.warning(f"Pool lou_translate indisponible, repli sur un processus par lot : {str(e)}")
+        output = self._run_lou_translate("\n".join(lines), table_path, forward, capitalize).split("\n")
+        # rstrip a pu retirer les dernières lignes si leur traduction est vide
+        output.extend([""] * (len(lines) - len(output)))
+        return output
+
+    def _run_lou_translate(self, batch, table_path, forward, capitalize):
+        cmd = [self.lou_path, "--forward" if forward else "--backward", table_path]
+        if forward and capitalize:
+            cmd.append("--caps-mode=uc")
+        cmd.extend(["--display-table", os.path.join(self.tables_dir, "unicode.dis")])
+        try:
+            result = subprocess.run(
+                cmd,
+                input=batch.encode("utf-8"),
+                capture_output=True,
+                check=True,
+                creationflags=subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
+            )
+            # Decode the raw bytes using UTF-8. If this causes issues, we might need to investigate other encodings or how liblouis outputs.
+            return result.stdout.decode("utf-8", errors="replace").rstrip("\n")
+        except subprocess.CalledProcessError as e:
+            raise Exception(f"Erreur LibLouis: {e.stderr}")
+
+    def warm_up(self, table_path):
+        if not self.pool.available:
+            return
+        self.pool.warm(table_path, forward=True)
+        self.pool.warm(table_path, forward=False)
+
+    def shutdown(self):
+        self.pool.shutdown()
+
+
+class LouisBackend(TranslationBackend):
+    """
+    Traduction en mémoire via le module Python `louis`, sans aucun aller-retour IPC.
+
+    liblouis n'est pas thread-safe : tous les appels passent par un unique thread dédié.
+    Le mode majuscules de lou_translate n'a pas d'équivalent ; ces demandes sont
+    confiées au moteur de repli s'il existe.
+    """
+
+    name = "louis"
+
+    def __init__(self, louis_module, fallback=None):
+        self.louis = louis_module
+        self.fallback = fallback
+        self.mode = louis_module.dotsIO | louis_module.ucBrl
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="liblouis")
+        self._thread_ident = None
+
+    @classmethod
+    def probe(cls, probe_table, fallback=None):
+        """Renvoie un moteur en mémoire si le module `louis` est utilisable, sinon None."""
+        try:
+            import louis
+        except ImportError:
+            return None
+        backend = cls(louis, fallback)
+        try:
+            if probe_table and not backend.translate(["a"], probe_table)[0]:
+                raise ValueError("traduction vide")
+            logging.debug(f"liblouis en mémoire disponible (version {louis.version()})")
+            return backend
+        except Exception as e:
+            logging.warning(f"liblouis en mémoire inutilisable : {str(e)}")
+            # Le moteur de repli reste utilisé par l'appelant : ne fermer que le thread liblouis
+            backend._executor.shutdown(wait=False)
+            return None
+
+    def _translate_in_thread(self, lines, table_path, forward):
+        self._thread_ident = threading.get_ident()
+        tables = [table_path]
+        if forward:
+            return [self.louis.translateString(tables, line, mode=self.mode) for line in lines]
+        return [self.louis.backTranslateString(tables, line, mode=self.mode) for line in lines]
+
+    def translate(self, lines, table_path, forward=True, capitalize=False):
+        if capitalize and self.fallback is not None:
+            return self.fallback.translate(lines, table_path, forward, capitalize)
+        if threading.get_ident() == self._thread_ident:
+            return self._translate_in_thread(lines, table_path, forward)
+        return self._executor.submit(self._translate_in_thread, lines, table_path, forward).result()
+
+    def warm_up(self, table_path):
+        # Compile la table une fois (liblouis la garde en cache) sans bloquer l'appelant
+        self._executor.submit(self._translate_in_thread, ["a"], table_path, True)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+        if self.fallback is not None:
+            self.fallback.shutdown()
+
+
 class BrailleEngine:
     def __init__(self, lou_path=LOU_TRANSLATE_PATH, tables_dir=TABLES_DIRECTORY):
         self.lou_path = self._check_liblouis(lou_path)
         self.tables_dir = self._check_tables_dir(tables_dir)
+        self.table_registry = TableRegistry(self.tables_dir, TABLE_NAMES)
+        self.translation_memo = TranslationMemo(TRANSLATION_CACHE_MAX_BYTES)
+        self.persistent_cache = (
+            PersistentTranslationCache(TRANSLATION_DISK_CACHE_PATH, TRANSLATION_DISK_CACHE_MAX_BYTES)
+            if TRANSLATION_DISK_CACHE_PATH else None
+        )
+        self._cache_namespaces = {}
+        # Traduction directe des tables de grade 1 : chemin -> (empreinte de la table, Grade1FastPath)
+        self._fast_paths = {}
         self.all_custom_tables = {}
+        self.custom_tables_version = 0
+        self._compiled_custom_tables = {}
         self.load_custom_tables()
         self._wrap_cache = OrderedDict()
         self._wrap_cache_max_size = 500
-        self._wrap_cache_width = None
-        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.layout_cache = LayoutCache()
+        self.executor = PriorityExecutor(max_workers=4)
+        self.cancellation_tokens = TokenRegistry(self.executor)
+        self.async_gate = AsyncConversionGate(ASYNC_MAX_CONCURRENCY)
+        self.batch_tuner = BatchTuner(target_latency=BATCH_TARGET_LATENCY, max_parallel=4)
+        # Délais (secondes) entre le lancement d'une conversion et l'affichage du premier braille visible
+        self._time_to_visible = deque(maxlen=100)
         self.lock = threading.Lock()
         self.language_detector = LanguageDetector()
+        self.backend = self._select_backend()
+        self._is_shut_down = False
 
-    def _check_liblouis(self, default_path):
+    def _find_lou_translate(self, default_path):
         paths = [default_path, shutil.which("lou_translate")]
         for path in paths:
             if path and os.path.exists(path):
@@ -39,6 +213,21 @@ class BrailleEngine:
                         return os.path.normpath(path)
                 except Exception:
                     continue
+        return None
+
+    def _check_liblouis(self, default_path):
+        path = self._find_lou_translate(default_path)
+        if path:
+            return path
+        try:
+            import louis  # noqa: F401
+            logging.info("lou_translate introuvable, utilisation de liblouis en mémoire.")
+            return None
+        except ImportError:
+            pass
+        return self._ask_lou_translate()
+
+    def _ask_lou_translate(self):
         QMessageBox.warning(None, "Avertissement", "LibLouis non détecté. Sélectionnez lou_translate.exe.")
         path, _ = QFileDialog.getOpenFileName(None, "Sélectionner lou_translate.exe", "", "Exécutables (*.exe)")
         if path and os.path.exists(path):
@@ -50,13 +239,28 @@ class BrailleEngine:
     def _check_tables_dir(self, tables_dir):
         if os.path.exists(tables_dir):
             return tables_dir
-        default_dir = os.path.join(os.path.dirname(self.lou_path), "..", "share", "liblouis", "tables")
-        if os.path.exists(default_dir):
-            return default_dir
+        if self.lou_path:
+            default_dir = os.path.join(os.path.dirname(self.lou_path), "..", "share", "liblouis", "tables")
+            if os.path.exists(default_dir):
+                return default_dir
         QMessageBox.critical(None, "Erreur", f"Répertoire des tables non trouvé : {tables_dir}")
         import sys
         sys.exit(1)
 
+    def _select_backend(self):
+        """Choisit au démarrage le moteur le plus rapide disponible : liblouis en mémoire, sinon lou_translate."""
+        subprocess_backend = SubprocessBackend(self.lou_path, self.tables_dir) if self.lou_path else None
+        probe_table = next(iter(self.get_available_tables().values()), None)
+        backend = LouisBackend.probe(probe_table, fallback=subprocess_backend)
+        if backend is not None:
+            logging.info("Moteur de traduction : liblouis en mémoire")
+            return backend
+        if subprocess_backend is None:
+            self.lou_path = self._ask_lou_translate()
+            subprocess_backend = SubprocessBackend(self.lou_path, self.tables_dir)
+        logging.info("Moteur de traduction : lou_translate")
+        return subprocess_backend
+
     def load_custom_tables(self):
         self.all_custom_tables.clear()
         if os.path.exists(CUSTOM_TABLE_FILE):
@@ -66,6 +270,7 @@ class BrailleEngine:
             except Exception as e:
                 logging.error(f"Error loading custom tables from {CUSTOM_TABLE_FILE}: {str(e)}")
                 self.all_custom_tables = {}
+        self.invalidate_custom_tables()
 
     def save_custom_tables(self):
         try:
@@ -73,6 +278,25 @@ class BrailleEngine:
                 json.dump(self.all_custom_tables, f, ensure_ascii=False, indent=4)
         except Exception as e:
             logging.error(f"Error saving custom tables to {CUSTOM_TABLE_FILE}: {str(e)}")
+        self.invalidate_custom_tables()
+
+    def invalidate_custom_tables(self):
+        """Signale une modification des tables personnalisées : les automates compilés seront reconstruits."""
+        self.custom_tables_version += 1
+        self._compiled_custom_tables = {}
+        self._cache_namespaces = {}
+        # Les traductions mémorisées dépendent des surcharges : elles ne sont plus valides
+        self.translation_memo.clear()
+
+    def get_custom_substitution(self, table_name, forward=True):
+        """Automate de remplacement (compilé une fois par table, sens et version) de la table personnalisée."""
+        key = (table_name, forward)
+        compiled = self._compiled_custom_tables.get(key)
+        if compiled is None:
+            custom_table = self.all_custom_tables.get(table_name) or {}
+            compiled = SubstitutionTrie.forward(custom_table) if forward else SubstitutionTrie.backward(custom_table)
+            self._compiled_custom_tables[key] = compiled
+        return compiled
 
     def update_custom_tables(self):
         self.load_custom_tables()
@@ -80,15 +304,33 @@ class BrailleEngine:
             self._wrap_cache.clear()
 
     def get_available_tables(self):
-        all_tables = [f for f in os.listdir(self.tables_dir) if f.endswith((".utb", ".ctb"))]
-        table_names = {
-            "Arabe (grade 1)": "ar-ar-g1.utb",
-            "Français (grade 1)": "fr-bfu-comp6.utb",
-            "Français (grade 2)": "fr-bfu-g2.ctb",
-            "Anglais (grade 1)": "en-us-g1.ctb",
-            "Anglais (grade 2)": "en-us-g2.ctb",
-        }
-        return {name: os.path.join(self.tables_dir, filename) for name, filename in table_names.items() if filename in all_tables}
+        return self.table_registry.available_tables()
+
+    def get_table_name(self, table_path):
+        """Nom affiché de la table (clé des tables personnalisées) à partir de son chemin."""
+        return self.table_registry.name_for_path(table_path)
+
+    def language_tables(self, table_path):
+        """
+        Table de chaque langue pour une traduction par paragraphe : `table_path` pour
+        sa propre langue, la table de grade 1 des autres langues disponibles.
+        """
+        detected = self.language_detector.language_to_table
+        tables = {}
+        for language in self.table_registry.languages():
+            if language not in detected:
+                continue
+            # Tables exposées dans l'interface uniquement, la première par ordre de nom
+            exposed = sorted(
+                (info for info in self.table_registry.tables_for_language(language, grade=1) if info.display_name),
+                key=lambda info: info.filename
+            )
+            if exposed:
+                tables[language] = exposed[0].path
+        info = self.table_registry.get_by_path(table_path) if table_path else None
+        if info is not None and info.language in detected:
+            tables[info.language] = table_path
+        return tables
 
     def wrap_text_by_sentence(self, text, width=33, preserve_newlines=True):
         """
@@ -110,66 +352,18 @@ class BrailleEngine:
         if not text or width < 1:
             return ""
 
+        # Les entrées de toutes les largeurs coexistent : changer de largeur ne vide pas le cache
         cache_key = (text, width, "sentence", preserve_newlines)
         with self.lock:
-            if cache_key in self._wrap_cache and self._wrap_cache_width == width:
+            if cache_key in self._wrap_cache:
                 logging.debug("Returning cached result")
                 return self._wrap_cache[cache_key]
 
-        lines = text.split("\n") if preserve_newlines else [text]
-        wrapped_lines = []
-
-        for line in lines:
-            if not line:
-                wrapped_lines.append("")
-                continue
-
-            # Séparer en mots et espaces
-            words = re.split(r'(\s+)', line)
-            words = [w for w in words if w]  # Supprimer les éléments vides
-            current_line = ""
-            line_segments = []
-
-            for word in words:
-                # Si c'est un espace
-                if word.isspace():
-                    if len(current_line) + len(word) <= width:
-                        current_line += word
-                    else:
-                        if current_line:
-                            line_segments.append(current_line.rstrip())
-                        current_line = word.lstrip()
-                    continue
-
-                # Si c'est un mot
-                if len(current_line) + len(word) <= width:
-                    current_line += word
-                else:
-                    # Si la ligne actuelle n'est pas vide, on la sauvegarde
-                    if current_line:
-                        line_segments.append(current_line.rstrip())
-                    
-                    # Si le mot est plus long que la largeur maximale
-                    if len(word) > width:
-                        # On coupe le mot seulement s'il est vraiment trop long
-                        while len(word) > width:
-                            line_segments.append(word[:width])
-                            word = word[width:]
-                        current_line = word
-                    else:
-                        # Sinon on commence une nouvelle ligne avec ce mot
-                        current_line = word
-
-            if current_line:
-                line_segments.append(current_line.rstrip())
-
-            wrapped_lines.extend(line_segments)
-
-        result = "\n".join(wrapped_lines).rstrip()
+        # Les coupures possibles de chaque ligne sont calculées une fois, quelle que soit la largeur
+        result = self.layout_cache.wrap_sentence(text, width, preserve_newlines)
         logging.debug(f"Formatted text: {result[:100]}...")
         with self.lock:
             self._wrap_cache[cache_key] = result
-            self._wrap_cache_width = width
             if len(self._wrap_cache) > self._wrap_cache_max_size:
                 self._wrap_cache.popitem(last=False)
         return result
@@ -179,51 +373,12 @@ class BrailleEngine:
             return ""
         cache_key = (text, width, "braille", preserve_newlines)
         with self.lock:
-            if cache_key in self._wrap_cache and self._wrap_cache_width == width:
+            if cache_key in self._wrap_cache:
                 return self._wrap_cache[cache_key]
 
-        lines = text.split("\n") if preserve_newlines else [text.replace("\n", " ")]
-        wrapped_lines = []
-
-        for line in lines:
-            if not line.strip():
-                wrapped_lines.append("")
-                continue
-            words = re.split(r'(\s+)', line)
-            current_line = []
-            current_length = 0
-
-            for segment in words:
-                segment_length = len(segment)
-                if segment.isspace():
-                    if current_length + segment_length <= width:
-                        current_line.append(segment)
-                        current_length += segment_length
-                    continue
-                if current_length + segment_length <= width:
-                    current_line.append(segment)
-                    current_length += segment_length
-                else:
-                    if current_line:
-                        wrapped_lines.append("".join(current_line).rstrip())
-                    if segment_length > width:
-                        while segment:
-                            if len(segment) <= width:
-                                current_line = [segment]
-                                current_length = len(segment)
-                                break
-                            wrapped_lines.append(segment[:width])
-                            segment = segment[width:]
-                    else:
-                        current_line = [segment]
-                        current_length = segment_length
-            if current_line:
-                wrapped_lines.append("".join(current_line).rstrip())
-
-        result = "\n".join(wrapped_lines)
+        result = self.layout_cache.wrap_braille(text, width, preserve_newlines)
         with self.lock:
             self._wrap_cache[cache_key] = result
-            self._wrap_cache_width = width
             if len(self._wrap_cache) > self._wrap_cache_max_size:
                 self._wrap_cache.popitem(last=False)
         return result
@@ -231,7 +386,7 @@ class BrailleEngine:
     def sync_lines(self, text, braille, width=33, preserve_newlines=True):
         cache_key = (text, braille, width, "sync", preserve_newlines)
         with self.lock:
-            if cache_key in self._wrap_cache and self._wrap_cache_width == width:
+            if cache_key in self._wrap_cache:
                 return self._wrap_cache[cache_key]
 
         text_lines = text.split('\n') if preserve_newlines else [text.replace('\n', ' ')]
@@ -257,222 +412,834 @@ class BrailleEngine:
         result = ("\n".join(synced_text).rstrip(), "\n".join(synced_braille).rstrip())
         with self.lock:
             self._wrap_cache[cache_key] = result
-            self._wrap_cache_width = width
             if len(self._wrap_cache) > self._wrap_cache_max_size:
                 self._wrap_cache.popitem(last=False)
         return result
 
-    def _process_batch(self, batch, table_path, capitalize):
-        cmd = [self.lou_path, "--forward", table_path]
-        if capitalize:
-            cmd.append("--caps-mode=uc")
-        cmd.extend(["--display-table", os.path.join(self.tables_dir, "unicode.dis")])
-        try:
-            result = subprocess.run(
-                cmd,
-                input=batch,
-                text=True,
-                capture_output=True,
-                encoding="utf-8",
-                check=True,
-                creationflags=subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
-            )
-            return result.stdout.rstrip("\n")
-        except subprocess.CalledProcessError as e:
-            raise Exception(f"Erreur LibLouis: {e.stderr}")
+    def warm_up_table(self, table_path):
+        """Prépare en arrière-plan la table (processus lou_translate ou compilation liblouis)."""
+        if not table_path:
+            return
+        threading.Thread(target=self._warm_up_in_thread, args=(table_path,), daemon=True).start()
 
-    def to_braille(self, text, table_path, line_width=33, capitalize=False, section_separator="\u28CD", is_typing=False):
-        if not self.lou_path or not text:
-            return ""
+    def _warm_up_in_thread(self, table_path):
+        self.backend.warm_up(table_path)
+        self.build_fast_path(table_path)
+
+    def build_fast_path(self, table_path):
+        """
+        Sonde liblouis une fois pour une table de grade 1 et garde la correspondance
+        caractère -> cellules de ses caractères sans contexte (`Grade1FastPath`).
+        Renvoie None pour les autres tables ou si la traduction directe est désactivée.
+        """
+        if not GRADE1_FAST_PATH or not table_path:
+            return None
+        info = self.table_registry.get_by_path(table_path)
+        if info is None or info.grade != 1:
+            return None
+        fingerprint = self.table_registry.fingerprint(table_path)
+        entry = self._fast_paths.get(table_path)
+        if entry is not None and entry[0] == fingerprint:
+            return entry[1]
+
+        def probe_translate(lines):
+            # Sans cache : les sondes ne doivent pas remplir les caches de traductions
+            translated = self._dispatch_batches(
+                list(dict.fromkeys(lines)), table_path, True, False, priority=PRIORITY_BACKGROUND
+            )
+            return [translated.get(line, "") for line in lines]
 
         try:
-            text = unicodedata.normalize("NFC", text)
-            
-            # Détection automatique de la langue si aucune table n'est spécifiée
-            if not table_path:
-                braille = self.language_detector.convert_to_braille(text)
-                if braille:
-                    return self.wrap_text_by_sentence(braille, line_width)
-            
-            # Continuer avec la conversion normale si une table est spécifiée
-            available_tables = self.get_available_tables()
-            current_table_name = None
-            for name, path in available_tables.items():
-                if os.path.normpath(path) == os.path.normpath(table_path):
-                    current_table_name = name
-                    break
+            start = time.perf_counter()
+            fast_path = Grade1FastPath.probe(
+                probe_translate, dependent=table_context_characters(self.table_registry.include_closure(table_path))
+            )
+        except Exception as e:
+            logging.warning(f"Traduction directe indisponible pour {os.path.basename(table_path)}: {str(e)}")
+            return None
+        self._fast_paths[table_path] = (fingerprint, fast_path)
+        logging.info(
+            f"Traduction directe {os.path.basename(table_path)} : {len(fast_path)} caractères sans contexte, "
+            f"{len(fast_path.dependent)} dépendants du contexte ({time.perf_counter() - start:.2f} s)"
+        )
+        return fast_path
+
+    def verify_fast_path(self, table_path, lines):
+        """
+        Compare la traduction directe de `table_path` à liblouis (sans cache) sur un
+        corpus ; renvoie les écarts [(ligne, traduction directe, liblouis)].
+        """
+        fast_path = self.build_fast_path(table_path)
+        if fast_path is None:
+            return []
+        lines = [line for text in lines for line in text.split("\n")]
+        return fast_path.verify(lines, lambda batch: self.backend.translate(batch, table_path))
+
+    def translation_cache_stats(self):
+        """Statistiques des caches de traductions (mémoire et disque)."""
+        stats = self.translation_memo.stats()
+        if self.persistent_cache is not None:
+            stats["disk"] = self.persistent_cache.stats()
+        return stats
+
+    def _cache_namespace(self, table_path):
+        """
+        Espace de noms du cache disque : empreinte du contenu de la table (et de ses
+        inclusions), de la table personnalisée associée et du moteur utilisé.
+        """
+        table_fingerprint = self.table_registry.fingerprint(table_path)
+        key = (table_path, table_fingerprint, self.custom_tables_version)
+        namespace = self._cache_namespaces.get(key)
+        if namespace is None:
+            custom_table = self.all_custom_tables.get(self.get_table_name(table_path)) or {}
+            digest = hashlib.sha256()
+            digest.update(table_fingerprint.encode("ascii"))
+            digest.update(json.dumps(custom_table, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+            digest.update(self.backend.name.encode("ascii"))
+            namespace = digest.hexdigest()
+            self._cache_namespaces[key] = namespace
+        return namespace
+
+    def batch_tuning_stats(self):
+        """Taille de lot et parallélisme retenus pour chaque (table, sens), avec les mesures associées."""
+        return self.batch_tuner.snapshot()
+
+    @staticmethod
+    def _tuning_key(table_path, forward):
+        return (os.path.basename(table_path), "forward" if forward else "backward")
+
+    def new_cancellation_token(self, owner):
+        """
+        Jeton de conversion pour `owner` (onglet, document) : le jeton précédent du
+        même propriétaire est annulé et ses tâches encore en file sont abandonnées.
+        """
+        return self.cancellation_tokens.new_token(owner)
 
-            current_custom_table = self.all_custom_tables.get(current_table_name, {})
+    def cancel_conversions(self, owner):
+        """Abandonne le travail en cours ou en attente de `owner`."""
+        self.cancellation_tokens.cancel(owner)
 
-            processed_text_with_surcharges = text
-            for char_text, braille_correct in current_custom_table.items():
-                 processed_text_with_surcharges = processed_text_with_surcharges.replace(char_text, braille_correct)
+    def scheduler_stats(self):
+        """Profondeur de file et compteurs de tâches par classe de priorité."""
+        return self.executor.stats()
 
-            input_lines = processed_text_with_surcharges.split("\n")
-            braille_lines = []
-            batch_size = 50
-            batches = []
-            current_batch = []
-            empty_line_positions = []
+    def record_time_to_visible(self, seconds):
+        """Enregistre le délai avant l'affichage du premier braille de la zone visible."""
+        with self.lock:
+            self._time_to_visible.append(seconds)
+        logging.debug(f"Premier braille visible affiché en {seconds:.3f} secondes")
 
-            is_arabic_table = "ar-ar" in os.path.basename(table_path).lower()
+    def time_to_visible_stats(self):
+        """Délai avant le premier braille visible sur les dernières conversions : nombre, dernier, médian, max."""
+        with self.lock:
+            samples = list(self._time_to_visible)
+        if not samples:
+            return {"count": 0, "last": None, "median": None, "max": None}
+        ordered = sorted(samples)
+        return {"count": len(samples), "last": samples[-1], "median": ordered[len(ordered) // 2], "max": ordered[-1]}
+
+    def _process_batch(self, batch, table_path, forward, capitalize, token=None):
+        if token is not None:
+            token.raise_if_cancelled()
+        start = time.perf_counter()
+        result = self.backend.translate(batch, table_path, forward=forward, capitalize=capitalize)
+        self.batch_tuner.record_batch(self._tuning_key(table_path, forward), len(batch), time.perf_counter() - start)
+        return result
 
-            lines_to_send_to_liblouis = []
-            for line in input_lines:
-                line_to_process = line[::-1] if is_arabic_table else line
-                lines_to_send_to_liblouis.append(line_to_process)
+    def _dispatch_batches(self, lines, table_path, forward, capitalize, parallel=True,
+                          priority=PRIORITY_VISIBLE, token=None):
+        """
+        Envoie des lignes au moteur en lots dont la taille et le parallélisme sont
+        choisis par `self.batch_tuner` ; renvoie {ligne: traduction}.
+        """
+        key = self._tuning_key(table_path, forward)
+        batch_size, parallelism = self.batch_tuner.plan(key, len(lines))
+        batches = [lines[i:i + batch_size] for i in range(0, len(lines), batch_size)]
+        translated = {}
+        if not parallel or parallelism == 1:
+            for batch in batches:
+                translated.update(zip(batch, self._process_batch(batch, table_path, forward, capitalize, token)))
+            return translated
+
+        start = time.perf_counter()
+        pending = deque()
+        try:
+            for batch in batches:
+                future = self.executor.submit(
+                    self._process_batch, batch, table_path, forward, capitalize, token,
+                    priority=priority, token=token
+                )
+                pending.append((batch, future))
+                if len(pending) >= parallelism:
+                    done_batch, future = pending.popleft()
+                    translated.update(zip(done_batch, future.result()))
+            while pending:
+                done_batch, future = pending.popleft()
+                translated.update(zip(done_batch, future.result()))
+        except CancelledError:
+            raise CancelledConversion("Conversion annulée")
+        finally:
+            for _, future in pending:
+                future.cancel()
+        self.batch_tuner.record_dispatch(key, parallelism, len(lines), time.perf_counter() - start)
+        return translated
+
+    def _translate_lines(self, lines, table_path, forward=True, capitalize=False, parallel=True,
+                         priority=PRIORITY_VISIBLE, token=None):
+        """
+        Traduit des lignes non vides, une sortie par ligne d'entrée.
 
+        Avec une table de grade 1 déjà sondée (`build_fast_path`) et inchangée depuis
+        (même empreinte), les lignes composées uniquement de caractères sans contexte
+        sont traduites directement par `str.translate` ; les autres suivent
+        `_translate_cached_lines`.
+        """
+        fast_entry = self._fast_paths.get(table_path) if forward and not capitalize and lines else None
+        if fast_entry is not None and fast_entry[0] != self.table_registry.fingerprint(table_path):
+            # Table modifiée sur le disque : correspondance périmée, sondée de nouveau en arrière-plan
+            self._fast_paths.pop(table_path, None)
+            threading.Thread(target=self.build_fast_path, args=(table_path,), daemon=True).start()
+            fast_entry = None
+        if fast_entry is None:
+            return self._translate_cached_lines(lines, table_path, forward, capitalize, parallel, priority, token)
+        fast_path = fast_entry[1]
+        results = [fast_path.translate(line) for line in lines]
+        rest = [line for line, result in zip(lines, results) if result is None]
+        if not rest:
+            return results
+        translated = iter(self._translate_cached_lines(rest, table_path, forward, capitalize, parallel, priority, token))
+        return [next(translated) if result is None else result for result in results]
+
+    def _translate_cached_lines(self, lines, table_path, forward=True, capitalize=False, parallel=True,
+                                priority=PRIORITY_VISIBLE, token=None):
+        """
+        Traduit des lignes non vides par le moteur, une sortie par ligne d'entrée.
+
+        Les lignes déjà traduites avec la même table, le même sens, le même mode
+        majuscules et la même version des tables personnalisées sont servies par le
+        cache mémoire, puis par le cache disque ; seules les lignes absentes
+        (dédoublonnées) partent au moteur, par lots dimensionnés par `self.batch_tuner`.
+        Avec `parallel=False` les lots sont traités dans le thread appelant (appel
+        depuis une tâche déjà exécutée par `self.executor`). Les lots sont planifiés
+        avec la priorité `priority` et abandonnés si `token` est annulé.
+        """
+        if not lines:
+            return []
+        if token is not None:
+            token.raise_if_cancelled()
+        version = self.custom_tables_version
+        keys = [(table_path, forward, capitalize, version, line) for line in lines]
+        results = self.translation_memo.get_many(keys)
+        missing = list(dict.fromkeys(line for line, result in zip(lines, results) if result is None))
+        if not missing:
+            return results
+
+        translated = {}
+        namespace = None
+        if self.persistent_cache is not None and self.persistent_cache.available:
+            namespace = self._cache_namespace(table_path)
+            translated = self.persistent_cache.get_many(namespace, forward, capitalize, missing)
+            if translated:
+                missing = [line for line in missing if line not in translated]
+
+        if missing:
+            from_backend = self._dispatch_batches(
+                missing, table_path, forward, capitalize, parallel, priority, token
+            )
+            if namespace is not None:
+                self.persistent_cache.put_many(namespace, forward, capitalize, from_backend.items())
+            translated.update(from_backend)
+
+        self.translation_memo.put_many(
+            ((table_path, forward, capitalize, version, line), output) for line, output in translated.items()
+        )
+        return [translated.get(line, "") if result is None else result for line, result in zip(lines, results)]
+
+    def _translate_text_lines(self, input_lines, table_path, forward=True, capitalize=False, parallel=True,
+                              priority=PRIORITY_VISIBLE, token=None):
+        """Traduit une liste de lignes en conservant les lignes vides à leur place."""
+        non_empty_positions = [idx for idx, line in enumerate(input_lines) if line.strip()]
+        translated = self._translate_lines(
+            [input_lines[idx] for idx in non_empty_positions], table_path, forward, capitalize, parallel,
+            priority, token
+        )
+        output_lines = [""] * len(input_lines)
+        for idx, line in zip(non_empty_positions, translated):
+            output_lines[idx] = line
+        return output_lines, non_empty_positions
+
+    def _compose_braille_line(self, braille_line, line_width):
+        line = self.ensure_readability(braille_line)
+        return self.wrap_text_by_sentence(line, line_width, preserve_newlines=True)
+
+    def _compose_text_line(self, text, custom_substitution, is_arabic_table, line_width):
+        # Remplacements personnalisés : correspondance braille la plus longue d'abord
+        text = custom_substitution.apply(text)
+        # Correction : ré-inverser le texte si table arabe
+        if is_arabic_table:
+            text = text[::-1]
+        return self.wrap_text_by_sentence(text, line_width, preserve_newlines=True)
+
+    def to_braille(self, text, table_path, line_width=33, capitalize=False, section_separator="\u28CD", is_typing=False,
+                   priority=None, token=None):
+        """
+        Convertit du texte en braille.
 
-            for idx, line in enumerate(lines_to_send_to_liblouis):
-                if not line.strip():
-                    empty_line_positions.append(idx)
-                    if current_batch:
-                        batches.append("\n".join(current_batch))
-                        current_batch = []
-                    continue
-                current_batch.append(line)
-                if len(current_batch) >= batch_size:
-                    batches.append("\n".join(current_batch))
-                    current_batch = []
-            if current_batch:
-                batches.append("\n".join(current_batch))
-
-            batch_results = []
-            if batches:
-                futures = [self.executor.submit(self._process_batch, batch, table_path, capitalize) for batch in batches]
-                for future in futures:
-                    batch_results.append(future.result())
-
-            braille_non_empty = []
-            for batch_result in batch_results:
-                braille_non_empty.extend([line for line in batch_result.split("\n") if line.strip()])
-
-            braille_result = []
-            non_empty_idx = 0
-            for idx in range(len(input_lines)):
-                if idx in empty_line_positions:
-                    braille_result.append("")
-                else:
-                    if non_empty_idx < len(braille_non_empty):
-                        line = braille_non_empty[non_empty_idx]
-                        line = self.ensure_readability(line)
-                        line = self.wrap_text_by_sentence(line, line_width, preserve_newlines=True)
-                        braille_result.append(line)
-                        non_empty_idx += 1
-
-            while len(braille_result) < len(input_lines):
-                 braille_result.append("")
-
-            braille_output = "\n".join(braille_result).rstrip()
-
-            if not is_typing:
-                original_text_for_sync = text
-                synced_text, synced_braille = self.sync_lines(original_text_for_sync, braille_output, line_width, preserve_newlines=True)
-
-                if section_separator:
-                    synced_braille = synced_braille.replace("\n\n", f"\n{section_separator}\n")
-                return synced_braille.rstrip()
-            return braille_output.rstrip()
+        `priority` est la classe de priorité des lots (par défaut : interactive pendant
+        la frappe, document visible sinon) ; si `token` est annulé pendant la
+        conversion, CancelledConversion est levée.
+        """
+        if not self.backend or not text:
+            return ""
+        try:
+            return self._to_braille(text, table_path, line_width, capitalize, section_separator, is_typing, priority, token)
+        except CancelledConversion:
+            raise
         except Exception as e:
             logging.error(f"Erreur de conversion en braille : {str(e)}")
             QMessageBox.warning(None, "Erreur", f"Erreur de conversion en braille : {e}")
             return ""
 
-    def _process_batch_backward(self, batch, table_path):
-        cmd = [self.lou_path, "--backward", table_path]
-        cmd.extend(["--display-table", os.path.join(self.tables_dir, "unicode.dis")])
+    def _braille_input_lines(self, text, table_path):
+        """Lignes envoyées au moteur : remplacements personnalisés, puis inversion pour l'arabe."""
+        current_table_name = self.get_table_name(table_path)
+
+        custom_substitution = self.get_custom_substitution(current_table_name, forward=True)
+        processed_text_with_surcharges = custom_substitution.apply(text)
+
+        input_lines = processed_text_with_surcharges.split("\n")
+
+        if self._is_arabic_table(table_path):
+            input_lines = [line[::-1] for line in input_lines]
+        return input_lines
+
+    @staticmethod
+    def _is_arabic_table(table_path):
+        return "ar-ar" in os.path.basename(table_path).lower()
+
+    def _translate_braille_lines(self, text, table_path, capitalize, priority, token):
+        """Traduit chaque ligne du texte (déjà normalisé NFC), sans mise en page."""
+        return self._translate_text_lines(
+            self._braille_input_lines(text, table_path), table_path, forward=True, capitalize=capitalize,
+            priority=priority, token=token
+        )
+
+    def tables_for_lines(self, lines, table_path, languages, previous=None):
+        """
+        Table de chaque ligne : celle de la langue de sa suite de lignes (voir
+        `LanguageDetector.language_runs`), `table_path` pour une langue sans table.
+        """
+        default = self.language_detector.table_language(self.get_table_name(table_path)) or 'en'
+        tables = []
+        for language, start, stop in self.language_detector.language_runs(lines, default, previous):
+            tables.extend([languages.get(language, table_path)] * (stop - start))
+        return tables
+
+    def _translate_language_runs(self, text, table_path, languages, capitalize, parallel=True,
+                                 priority=PRIORITY_VISIBLE, token=None, previous=None):
+        """
+        Traduit chaque ligne du texte (déjà normalisé NFC) avec la table de sa langue.
+
+        Le texte est découpé en suites de même langue (`LanguageDetector.language_runs`)
+        et les lignes sont regroupées par table (`languages` : {langue: table}, la
+        table `table_path` pour une langue absente). Chaque table reçoit ses lignes en
+        un seul flux de lots ; les tables sont traduites en parallèle (dans le thread
+        appelant si `parallel` est faux) et les lignes remises à leur place en un seul
+        passage. `previous` est la langue en cours avant le texte (bloc d'un document).
+        Renvoie (lignes traduites, vrai si une table arabe a servi).
+        """
+        lines = text.split("\n")
+        groups = {}  # table -> indices des lignes
+        for idx, table in enumerate(self.tables_for_lines(lines, table_path, languages, previous)):
+            groups.setdefault(table, []).append(idx)
+
+        def translate_group(table, indices, group_parallel):
+            input_lines = self._braille_input_lines("\n".join(lines[idx] for idx in indices), table)
+            braille_lines, _ = self._translate_text_lines(
+                input_lines, table, forward=True, capitalize=capitalize, parallel=group_parallel,
+                priority=priority, token=token
+            )
+            return braille_lines
+
+        # La plus grande suite est traduite ici (ses lots en parallèle), les autres tables à côté
+        ordered = sorted(groups.items(), key=lambda item: len(item[1]), reverse=True)
+        results = {}
+        futures = []
         try:
-            result = subprocess.run(
-                cmd,
-                input=batch.encode("utf-8"),
-                capture_output=True,
-                check=True,
-                creationflags=subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
+            if parallel:
+                futures = [
+                    (table, self.executor.submit(translate_group, table, indices, False, priority=priority, token=token))
+                    for table, indices in ordered[1:]
+                ]
+            else:
+                for table, indices in ordered[1:]:
+                    results[table] = translate_group(table, indices, False)
+            table, indices = ordered[0]
+            results[table] = translate_group(table, indices, parallel)
+            for table, future in futures:
+                results[table] = future.result()
+        except CancelledError:
+            raise CancelledConversion("Conversion annulée")
+        finally:
+            for _, future in futures:
+                future.cancel()
+
+        braille_lines = [""] * len(lines)
+        for table, indices in groups.items():
+            for idx, braille_line in zip(indices, results[table]):
+                braille_lines[idx] = braille_line
+        return braille_lines, any(self._is_arabic_table(table) for table in groups)
+
+    def translate_document(self, text, table_path, capitalize=False, section_separator="\u28CD",
+                           priority=PRIORITY_VISIBLE, token=None, languages=None):
+        """
+        Traduit le texte en braille sans le mettre en page.
+
+        Le document renvoyé se met en page pour n'importe quelle largeur avec
+        `render(width)`, sans nouvel appel au moteur : un changement de largeur ne
+        coûte qu'un passage linéaire. `render(width)` donne le même résultat que
+        `to_braille(text, table_path, width)`, et `offset_map(width)` relie (par mot)
+        les positions du texte à celles du braille rendu. Avec `languages` ({langue:
+        table}, voir `language_tables`), chaque paragraphe est traduit avec la table de
+        sa langue et `table_path` sert aux paragraphes sans langue reconnue. Les
+        erreurs sont propagées à l'appelant.
+        """
+        if not table_path:
+            raise ValueError("Une table braille est requise pour traduire un document.")
+        version = self.custom_tables_version
+        braille_lines = []
+        is_arabic_table = self._is_arabic_table(table_path)
+        if self.backend and text and languages:
+            braille_lines, is_arabic_table = self._translate_language_runs(
+                unicodedata.normalize("NFC", text), table_path, languages, capitalize, priority=priority, token=token
             )
-            # Decode the raw bytes using UTF-8. If this causes issues, we might need to investigate other encodings or how liblouis outputs.
-            decoded_output = result.stdout.decode("utf-8", errors="replace")
-            return decoded_output.rstrip("\n")
-        except subprocess.CalledProcessError as e:
-            raise Exception(f"Erreur LibLouis: {e.stderr}")
+        elif self.backend and text:
+            normalized = unicodedata.normalize("NFC", text)
+            input_lines = self._braille_input_lines(normalized, table_path)
+            braille_lines, _ = self._translate_text_lines(
+                input_lines, table_path, forward=True, capitalize=capitalize, priority=priority, token=token
+            )
+        return TranslatedDocument(
+            text, braille_lines, self.layout_cache,
+            table_path=table_path, version=version, section_separator=section_separator,
+            word_aligned=not is_arabic_table
+        )
+
+    def translate_document_chunks(self, text, table_path, capitalize=False, chunk_chars=4000, max_in_flight=4,
+                                  priority=PRIORITY_VISIBLE, token=None, languages=None):
+        """
+        Traduit le texte par blocs de paragraphes entiers (voir `paragraph_chunks`),
+        convertis en parallèle, et produit dans l'ordre les lignes traduites (non mises
+        en page) de chaque bloc dès qu'il est prêt : une entrée par ligne du texte,
+        comme `translate_document`. `StreamingRender` met ces blocs en page au fil de
+        l'eau. Les erreurs (et CancelledConversion si `token` est annulé) sont
+        propagées à l'appelant.
+        """
+        if not table_path:
+            raise ValueError("Une table braille est requise pour traduire un document.")
+        if not self.backend or not text:
+            return
+        chunks = paragraph_chunks(text.split("\n"), chunk_chars)
+        convert_chunk = self._chunk_translator(table_path, capitalize, token, languages)
+        if languages:
+            yield from self._stream_chunks(
+                self._with_previous_language(chunks), lambda item: convert_chunk(*item),
+                max_in_flight, priority, token
+            )
+        else:
+            yield from self._stream_chunks(chunks, convert_chunk, max_in_flight, priority, token)
+
+    def _with_previous_language(self, chunks):
+        """(bloc, langue de la dernière ligne reconnue avant le bloc) pour chaque bloc, dans l'ordre."""
+        previous = None
+        for chunk in chunks:
+            yield chunk, previous
+            for line in reversed(chunk):
+                language = self.language_detector.paragraph_language(line) if line.strip() else None
+                if language:
+                    previous = language
+                    break
 
-    def from_braille(self, braille_text, table_path, line_width=33, is_typing=False):
-        if not self.lou_path or not braille_text:
-            return ""
+    def _chunk_translator(self, table_path, capitalize, token, languages=None):
+        """Fonction de traduction d'un bloc de lignes source (une sortie non mise en page par ligne)."""
+        def convert_chunk(chunk, previous=None):
+            if languages:
+                # Déjà dans une tâche de l'exécuteur : les tables du bloc sont traduites à la suite
+                return self._translate_language_runs(
+                    unicodedata.normalize("NFC", "\n".join(chunk)), table_path, languages, capitalize,
+                    parallel=False, token=token, previous=previous
+                )[0]
+            input_lines = self._braille_input_lines(unicodedata.normalize("NFC", "\n".join(chunk)), table_path)
+            braille_lines, _ = self._translate_text_lines(
+                input_lines, table_path, forward=True, capitalize=capitalize, parallel=False, token=token
+            )
+            return braille_lines
+        return convert_chunk
 
+    def translate_chunks(self, chunks, table_path, visible=(), capitalize=False, max_in_flight=4, token=None,
+                         languages=None):
+        """
+        Traduit des blocs de lignes source en commençant par ceux de la zone affichée.
+
+        Les blocs `visible` (indices) sont traduits d'abord, en priorité « document
+        visible » ; les autres suivent en arrière-plan, des plus proches de la zone
+        affichée aux plus éloignés. Produit (indice du bloc, lignes traduites) dans
+        l'ordre d'achèvement, avec au plus `max_in_flight` blocs en arrière-plan en
+        cours. Avec `languages`, chaque paragraphe est traduit avec la table de sa
+        langue (voir `translate_document`). Les erreurs (et CancelledConversion si
+        `token` est annulé) sont propagées à l'appelant.
+        """
+        if not table_path:
+            raise ValueError("Une table braille est requise pour traduire un document.")
+        if not self.backend:
+            return
+        visible = [index for index in dict.fromkeys(visible) if 0 <= index < len(chunks)]
+        visible_set = set(visible)
+        if visible:
+            low, high = min(visible), max(visible)
+            rest = sorted(
+                (index for index in range(len(chunks)) if index not in visible_set),
+                key=lambda index: low - index if index < low else index - high
+            )
+        else:
+            rest = list(range(len(chunks)))
+        order = deque((index, PRIORITY_VISIBLE) for index in visible)
+        order.extend((index, PRIORITY_BACKGROUND) for index in rest)
+        convert_chunk = self._chunk_translator(table_path, capitalize, token, languages)
+        # Langue en cours avant chaque bloc : les blocs sont traduits dans le désordre
+        previous = [language for _, language in self._with_previous_language(chunks)] if languages else None
+        limit = max(1, max_in_flight, len(visible))
+        in_flight = {}
         try:
-            available_tables = self.get_available_tables()
-            current_table_name = None
-            for name, path in available_tables.items():
-                if os.path.normpath(path) == os.path.normpath(table_path):
-                    current_table_name = name
-                    break
+            while order or in_flight:
+                while order and len(in_flight) < limit:
+                    index, priority = order.popleft()
+                    future = self.executor.submit(
+                        convert_chunk, chunks[index], previous[index] if previous else None,
+                        priority=priority, token=token
+                    )
+                    in_flight[future] = index
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = in_flight.pop(future)
+                    yield index, future.result()
+        except CancelledError:
+            raise CancelledConversion("Conversion annulée")
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    def _to_braille(self, text, table_path, line_width=33, capitalize=False, section_separator="\u28CD", is_typing=False,
+                    priority=None, token=None):
+        """Conversion en braille sans gestion d'erreur : les exceptions sont propagées à l'appelant."""
+        if not self.backend or not text:
+            return ""
+        if priority is None:
+            priority = PRIORITY_INTERACTIVE if is_typing else PRIORITY_VISIBLE
+
+        text = unicodedata.normalize("NFC", text)
+        
+        # Détection automatique de la langue si aucune table n'est spécifiée
+        if not table_path:
+            braille = self.language_detector.convert_to_braille(text)
+            if braille:
+                return self.wrap_text_by_sentence(braille, line_width)
+        
+        # Continuer avec la conversion normale si une table est spécifiée
+        braille_lines, non_empty_positions = self._translate_braille_lines(text, table_path, capitalize, priority, token)
+        return self._finish_braille(text, braille_lines, non_empty_positions, line_width, section_separator, is_typing)
+
+    def _finish_braille(self, text, braille_lines, non_empty_positions, line_width, section_separator, is_typing):
+        """Mise en page des lignes traduites de `text` (fin de `_to_braille`)."""
+        for idx in non_empty_positions:
+            braille_lines[idx] = self._compose_braille_line(braille_lines[idx], line_width)
+
+        braille_output = "\n".join(braille_lines).rstrip()
+
+        if not is_typing:
+            original_text_for_sync = text
+            synced_text, synced_braille = self.sync_lines(original_text_for_sync, braille_output, line_width, preserve_newlines=True)
+
+            if section_separator:
+                synced_braille = synced_braille.replace("\n\n", f"\n{section_separator}\n")
+            return synced_braille.rstrip()
+        return braille_output.rstrip()
+
+    def from_braille(self, braille_text, table_path, line_width=33, is_typing=False, priority=None, token=None):
+        """Convertit du braille en texte (mêmes règles de priorité et d'annulation que `to_braille`)."""
+        if not self.backend or not braille_text:
+            return ""
+        try:
+            return self._from_braille(braille_text, table_path, line_width, is_typing, priority, token)
+        except CancelledConversion:
+            raise
+        except Exception as e:
+            logging.error(f"Erreur de conversion depuis le braille : {str(e)}")
+            QMessageBox.warning(None, "Erreur", f"Erreur de conversion depuis le braille : {e}")
+            return ""
 
-            current_custom_table = self.all_custom_tables.get(current_table_name, {})
+    def _from_braille(self, braille_text, table_path, line_width=33, is_typing=False, priority=None, token=None):
+        """Conversion depuis le braille sans gestion d'erreur : les exceptions sont propagées à l'appelant."""
+        if not self.backend or not braille_text:
+            return ""
+        if priority is None:
+            priority = PRIORITY_INTERACTIVE if is_typing else PRIORITY_VISIBLE
 
-            is_arabic_table = "ar-ar" in os.path.basename(table_path).lower()
+        input_lines = braille_text.split("\n")
+        text_lines, non_empty_positions = self._translate_text_lines(
+            input_lines, table_path, forward=False, priority=priority, token=token
+        )
+        return self._finish_text(text_lines, non_empty_positions, table_path, line_width)
 
-            input_lines = braille_text.split("\n")
-            text_lines = []
-            batch_size = 50
-            batches = []
-            current_batch = []
-            empty_line_positions = []
+    def _finish_text(self, text_lines, non_empty_positions, table_path, line_width):
+        """Remplacements personnalisés et mise en page des lignes traduites (fin de `_from_braille`)."""
+        current_table_name = self.get_table_name(table_path)
 
-            for idx, line in enumerate(input_lines):
-                if not line.strip():
-                    empty_line_positions.append(idx)
-                    if current_batch:
-                        batches.append("\n".join(current_batch))
-                        current_batch = []
-                    continue
-                current_batch.append(line)
-                if len(current_batch) >= batch_size:
-                    batches.append("\n".join(current_batch))
-                    current_batch = []
-            if current_batch:
-                batches.append("\n".join(current_batch))
-
-            batch_results = []
-            if batches:
-                futures = [self.executor.submit(self._process_batch_backward, batch, table_path) for batch in batches]
-                for future in futures:
-                    batch_results.append(future.result())
-
-            text_non_empty = []
-            for batch_result in batch_results:
-                text_non_empty.extend([line for line in batch_result.split("\n") if line.strip()])
-
-            text_result = []
-            non_empty_idx = 0
-            for idx in range(len(input_lines)):
-                if idx in empty_line_positions:
-                    text_result.append("")
-                else:
-                    if non_empty_idx < len(text_non_empty):
-                        text = text_non_empty[non_empty_idx]
-                        # Apply custom table replacements from longest braille string to shortest
-                        sorted_custom_items = sorted(current_custom_table.items(), key=lambda item: len(item[1]), reverse=True)
-                        for char_text, braille_correct in sorted_custom_items:
-                            text = text.replace(braille_correct, char_text)
-                        # Correction : ré-inverser le texte si table arabe
-                        if is_arabic_table:
-                            text = text[::-1]
-                        text = self.wrap_text_by_sentence(text, line_width, preserve_newlines=True)
-                        text_result.append(text)
-                        non_empty_idx += 1
-
-            text_output = "\n".join(text_result).rstrip()
-            return text_output
+        custom_substitution = self.get_custom_substitution(current_table_name, forward=False)
+
+        is_arabic_table = "ar-ar" in os.path.basename(table_path).lower()
+
+        for idx in non_empty_positions:
+            text_lines[idx] = self._compose_text_line(
+                text_lines[idx], custom_substitution, is_arabic_table, line_width
+            )
+
+        text_output = "\n".join(text_lines).rstrip()
+        return text_output
+
+    def _translate_many(self, line_lists, table_path, forward, capitalize, priority, token):
+        """
+        Traduit plusieurs listes de lignes avec une même table en un seul passage par
+        `_translate_text_lines` : les lignes sont mises bout à bout (et dédoublonnées
+        par le cache), puis redistribuées. Renvoie [(lignes traduites, positions non vides)].
+        """
+        flat_lines = [line for lines in line_lists for line in lines]
+        translated, _ = self._translate_text_lines(
+            flat_lines, table_path, forward, capitalize, priority=priority, token=token
+        )
+        results = []
+        start = 0
+        for lines in line_lists:
+            stop = start + len(lines)
+            results.append((translated[start:stop], [idx for idx, line in enumerate(lines) if line.strip()]))
+            start = stop
+        return results
+
+    @staticmethod
+    def _group_by_table(texts, table_path):
+        """{table: [indices]} pour `texts` ; `table_path` est une table commune ou une table par texte."""
+        table_paths = [table_path] * len(texts) if isinstance(table_path, str) or table_path is None else table_path
+        if len(table_paths) != len(texts):
+            raise ValueError("Une table par texte est attendue")
+        groups = {}
+        for index, (text, path) in enumerate(zip(texts, table_paths)):
+            if text:
+                groups.setdefault(path, []).append(index)
+        return groups
+
+    def to_braille_many(self, texts, table_path, line_width=33, capitalize=False, section_separator="\u28CD",
+                        is_typing=False, priority=None, token=None):
+        """
+        Convertit une liste de textes indépendants en braille : même résultat que
+        `to_braille` appelé sur chaque texte, mais toutes les lignes d'une même table
+        partent au moteur ensemble, dans le moins de lots possible. `table_path` est
+        une table commune ou une liste (une table par texte). Renvoie une liste de
+        même longueur que `texts`.
+        """
+        if not self.backend or not texts:
+            return [""] * len(texts)
+        try:
+            return self._to_braille_many(
+                texts, table_path, line_width, capitalize, section_separator, is_typing, priority, token
+            )
+        except CancelledConversion:
+            raise
+        except Exception as e:
+            logging.error(f"Erreur de conversion en braille : {str(e)}")
+            QMessageBox.warning(None, "Erreur", f"Erreur de conversion en braille : {e}")
+            return [""] * len(texts)
+
+    def _to_braille_many(self, texts, table_path, line_width=33, capitalize=False, section_separator="\u28CD",
+                         is_typing=False, priority=None, token=None):
+        if priority is None:
+            priority = PRIORITY_INTERACTIVE if is_typing else PRIORITY_VISIBLE
+        results = [""] * len(texts)
+        for path, indices in self._group_by_table(texts, table_path).items():
+            if not path:
+                # Détection automatique de la langue : texte par texte
+                for index in indices:
+                    results[index] = self._to_braille(
+                        texts[index], path, line_width, capitalize, section_separator, is_typing, priority, token
+                    )
+                continue
+            normalized = [unicodedata.normalize("NFC", texts[index]) for index in indices]
+            translated = self._translate_many(
+                [self._braille_input_lines(text, path) for text in normalized], path, True, capitalize, priority, token
+            )
+            for index, text, (braille_lines, non_empty_positions) in zip(indices, normalized, translated):
+                results[index] = self._finish_braille(
+                    text, braille_lines, non_empty_positions, line_width, section_separator, is_typing
+                )
+        return results
+
+    def from_braille_many(self, braille_texts, table_path, line_width=33, is_typing=False, priority=None, token=None):
+        """Pendant de `to_braille_many` pour `from_braille` : une liste de textes braille indépendants."""
+        if not self.backend or not braille_texts:
+            return [""] * len(braille_texts)
+        try:
+            return self._from_braille_many(braille_texts, table_path, line_width, is_typing, priority, token)
+        except CancelledConversion:
+            raise
         except Exception as e:
             logging.error(f"Erreur de conversion depuis le braille : {str(e)}")
             QMessageBox.warning(None, "Erreur", f"Erreur de conversion depuis le braille : {e}")
+            return [""] * len(braille_texts)
+
+    def _from_braille_many(self, braille_texts, table_path, line_width=33, is_typing=False, priority=None, token=None):
+        if priority is None:
+            priority = PRIORITY_INTERACTIVE if is_typing else PRIORITY_VISIBLE
+        results = [""] * len(braille_texts)
+        for path, indices in self._group_by_table(braille_texts, table_path).items():
+            translated = self._translate_many(
+                [braille_texts[index].split("\n") for index in indices], path, False, False, priority, token
+            )
+            for index, (text_lines, non_empty_positions) in zip(indices, translated):
+                results[index] = self._finish_text(text_lines, non_empty_positions, path, line_width)
+        return results
+
+    async def to_braille_async(self, text, table_path, line_width=33, capitalize=False, section_separator="\u28CD",
+                               is_typing=False, priority=None, timeout=None):
+        """
+        Pendant asyncio de `to_braille` : même résultat, sans bloquer la boucle.
+
+        Les demandes identiques simultanées sont fusionnées, le nombre de conversions
+        en parallèle est limité (ASYNC_MAX_CONCURRENCY) et `timeout` (secondes) lève
+        asyncio.TimeoutError. Les erreurs de traduction sont propagées à l'appelant.
+        """
+        if not self.backend or not text:
+            return ""
+        key = ("to_braille", text, table_path, line_width, capitalize, section_separator, is_typing, priority)
+        return await self.async_gate.run(
+            key,
+            lambda token: self._to_braille(
+                text, table_path, line_width, capitalize, section_separator, is_typing, priority, token
+            ),
+            timeout
+        )
+
+    async def from_braille_async(self, braille_text, table_path, line_width=33, is_typing=False,
+                                 priority=None, timeout=None):
+        """Pendant asyncio de `from_braille` (mêmes garanties que `to_braille_async`)."""
+        if not self.backend or not braille_text:
             return ""
+        key = ("from_braille", braille_text, table_path, line_width, is_typing, priority)
+        return await self.async_gate.run(
+            key,
+            lambda token: self._from_braille(braille_text, table_path, line_width, is_typing, priority, token),
+            timeout
+        )
+
+    def _stream(self, lines, convert_chunk, chunk_size, max_in_flight, priority, token):
+        """
+        Découpe un itérable de lignes en blocs de `chunk_size` lignes convertis par
+        `self.executor` et produit les résultats ligne à ligne, dans l'ordre.
+        """
+        def line_chunks():
+            chunk = []
+            for line in lines:
+                chunk.append(line.rstrip("\r\n"))
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+
+        for result in self._stream_chunks(line_chunks(), convert_chunk, max_in_flight, priority, token):
+            yield from result
+
+    def _stream_chunks(self, chunks, convert_chunk, max_in_flight, priority, token):
+        """
+        Convertit un itérable de blocs avec `self.executor` et produit le résultat de
+        chaque bloc, dans l'ordre. Au plus `max_in_flight` blocs sont en cours : la
+        lecture de l'entrée est suspendue tant que le consommateur n'a pas repris le
+        résultat du bloc le plus ancien, ce qui borne la mémoire utilisée.
+        """
+        max_in_flight = max(1, max_in_flight)
+        in_flight = deque()
+        try:
+            for chunk in chunks:
+                in_flight.append(self.executor.submit(convert_chunk, chunk, priority=priority, token=token))
+                while len(in_flight) >= max_in_flight:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
+        except CancelledError:
+            raise CancelledConversion("Conversion annulée")
+        finally:
+            # Générateur abandonné : inutile de traduire les blocs restants
+            for future in in_flight:
+                future.cancel()
+
+    def to_braille_stream(self, lines, table_path, line_width=33, capitalize=False, chunk_size=200, max_in_flight=4,
+                          priority=PRIORITY_BACKGROUND, token=None):
+        """
+        Traduit en braille un itérable de lignes (fichier, pages d'un PDF, ...) et produit
+        une sortie par ligne d'entrée, dans l'ordre, avec une mémoire bornée.
+
+        Chaque sortie est la ligne braille mise en forme à `line_width` (elle peut donc
+        contenir des retours à la ligne) ; une ligne vide donne une chaîne vide. Les
+        erreurs de traduction (et CancelledConversion si `token` est annulé) sont
+        propagées à l'appelant.
+        """
+        if not table_path:
+            raise ValueError("Une table braille est requise pour la conversion en flux.")
+        custom_substitution = self.get_custom_substitution(self.get_table_name(table_path), forward=True)
+        is_arabic_table = "ar-ar" in os.path.basename(table_path).lower()
+
+        def convert_chunk(chunk):
+            input_lines = [custom_substitution.apply(unicodedata.normalize("NFC", line)) for line in chunk]
+            if is_arabic_table:
+                input_lines = [line[::-1] for line in input_lines]
+            braille_lines, non_empty_positions = self._translate_text_lines(
+                input_lines, table_path, forward=True, capitalize=capitalize, parallel=False, token=token
+            )
+            for idx in non_empty_positions:
+                braille_lines[idx] = self._compose_braille_line(braille_lines[idx], line_width)
+            return braille_lines
+
+        return self._stream(lines, convert_chunk, chunk_size, max_in_flight, priority, token)
+
+    def from_braille_stream(self, lines, table_path, line_width=33, chunk_size=200, max_in_flight=4,
+                            priority=PRIORITY_BACKGROUND, token=None):
+        """Pendant de `to_braille_stream` : texte produit ligne à ligne depuis un itérable de lignes braille."""
+        if not table_path:
+            raise ValueError("Une table braille est requise pour la conversion en flux.")
+        custom_substitution = self.get_custom_substitution(self.get_table_name(table_path), forward=False)
+        is_arabic_table = "ar-ar" in os.path.basename(table_path).lower()
+
+        def convert_chunk(chunk):
+            text_lines, non_empty_positions = self._translate_text_lines(
+                chunk, table_path, forward=False, parallel=False, token=token
+            )
+            for idx in non_empty_positions:
+                text_lines[idx] = self._compose_text_line(
+                    text_lines[idx], custom_substitution, is_arabic_table, line_width
+                )
+            return text_lines
+
+        return self._stream(lines, convert_chunk, chunk_size, max_in_flight, priority, token)
 
     def ensure_readability(self, braille_text):
         return braille_text.rstrip()
 
     def shutdown(self):
+        if getattr(self, "_is_shut_down", True):
+            return
+        self._is_shut_down = True
         self.executor.shutdown(wait=True)
+        self.backend.shutdown()
+        if self.persistent_cache is not None:
+            self.persistent_cache.close()
 
     def __del__(self):
         self.shutdown()
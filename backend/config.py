@@ -13,11 +13,47 @@ FONT_PATH = os.getenv("FONT_PATH", r"C:\Users\LENOVO\Downloads\Noto_Sans_Symbols
 LOU_TRANSLATE_PATH = os.getenv("LOU_TRANSLATE_PATH", r"C:\msys64\usr\bin\lou_translate.exe")
 TABLES_DIRECTORY = os.getenv("TABLES_DIR", r"C:\msys64\usr\share\liblouis\tables")
 
-# Tables de conversion harmonisées
+# Pool de processus lou_translate persistants
+LOU_POOL_MIN_WORKERS = int(os.getenv("LOU_POOL_MIN_WORKERS", "1"))
+LOU_POOL_MAX_WORKERS = int(os.getenv("LOU_POOL_MAX_WORKERS", "4"))
+LOU_POOL_IDLE_TIMEOUT = float(os.getenv("LOU_POOL_IDLE_TIMEOUT", "120"))
+
+# Cache mémoire des traductions ligne par ligne (partagé par tous les onglets)
+TRANSLATION_CACHE_MAX_BYTES = int(os.getenv("TRANSLATION_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+# Dossier de cache de l'utilisateur, hors de l'arborescence du projet
+if os.name == "nt":
+    USER_CACHE_FOLDER = os.path.join(os.getenv("LOCALAPPDATA") or os.path.expanduser(r"~\AppData\Local"), "BrailleConverter")
+else:
+    USER_CACHE_FOLDER = os.path.join(os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "braille-converter")
+
+# Cache disque des traductions (SQLite, partagé entre instances) ; chemin vide pour le désactiver
+TRANSLATION_DISK_CACHE_PATH = os.getenv("TRANSLATION_DISK_CACHE_PATH", os.path.join(USER_CACHE_FOLDER, "translation_cache.db"))
+TRANSLATION_DISK_CACHE_MAX_BYTES = int(os.getenv("TRANSLATION_DISK_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Latence visée (en secondes) pour un lot de lignes envoyé au moteur de traduction
+BATCH_TARGET_LATENCY = float(os.getenv("BATCH_TARGET_LATENCY", "0.05"))
+
+# Nombre maximal de conversions asynchrones (API asyncio) exécutées simultanément
+ASYNC_MAX_CONCURRENCY = int(os.getenv("ASYNC_MAX_CONCURRENCY", "4"))
+
+# Écrans traduits en priorité avant et après la zone affichée d'un grand document
+VIEWPORT_MARGIN_SCREENS = int(os.getenv("VIEWPORT_MARGIN_SCREENS", "2"))
+
+# Taille (en caractères) à partir de laquelle un document s'ouvre dans des vues paginées
+PAGED_VIEW_MIN_CHARS = int(os.getenv("PAGED_VIEW_MIN_CHARS", str(1024 * 1024)))
+
+# Caractères lus pour détecter la langue pendant la saisie (début du texte et paragraphe modifié)
+LANGUAGE_SAMPLE_CHARS = int(os.getenv("LANGUAGE_SAMPLE_CHARS", "2000"))
+
+# Traduction directe (sans liblouis) des lignes sans caractère dépendant du contexte, tables de grade 1 ; 0 pour la désactiver
+GRADE1_FAST_PATH = os.getenv("GRADE1_FAST_PATH", "1") == "1"
+
+# Tables de conversion harmonisées (noms affichés dans l'interface)
 TABLE_NAMES = {
-    "Arabe (Grade 1)": "ar-ar-g1.utb",  # Arabe grade 1
-    "Français (Grade 1)": "fr-bfu-comp6.utb",  # Français grade 1
-    "Français (Grade 2)": "fr-bfu-g2.ctb",  # Français grade 2
-    "Anglais (Grade 1)": "en-us-g1.ctb",  # Anglais grade 1
-    "Anglais (Grade 2)": "en-us-g2.ctb",  # Anglais grade 2
+    "Arabe (grade 1)": "ar-ar-g1.utb",  # Arabe grade 1
+    "Français (grade 1)": "fr-bfu-comp6.utb",  # Français grade 1
+    "Français (grade 2)": "fr-bfu-g2.ctb",  # Français grade 2
+    "Anglais (grade 1)": "en-us-g1.ctb",  # Anglais grade 1
+    "Anglais (grade 2)": "en-us-g2.ctb",  # Anglais grade 2
 }
\ No newline at end of file
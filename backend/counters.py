@@ -0,0 +1,55 @@
+import re
+
+from backend.line_store import line_rows
+
+WORD_PATTERN = re.compile(r"\b\w+\b")
+
+
+class TextCounters:
+    """
+    Compteurs d'un texte (lignes affichées, mots) tenus à jour ligne par ligne.
+
+    Chaque ligne garde sa longueur et son nombre de mots ; une modification ne
+    recompte que les lignes remplacées (`replace_lines`) et corrige les totaux de
+    la différence. Le nombre de lignes affichées suit la règle de `PageIndex` : une
+    ligne de `n` caractères occupe `ceil(n / width)` rangées, une au moins.
+    """
+
+    __slots__ = ("width", "word_count", "line_count", "_lengths", "_words")
+
+    def __init__(self, text="", width=33):
+        self.width = max(1, width)
+        self._lengths = []
+        self._words = []
+        self.word_count = 0
+        self.line_count = 0
+        self.replace_lines(0, 0, text.split("\n"))
+
+    @property
+    def paragraph_count(self):
+        return len(self._lengths)
+
+    def replace_lines(self, first, removed, lines):
+        """Remplace `removed` lignes à partir de `first` par `lines` (textes des nouvelles lignes)."""
+        old = slice(first, first + removed)
+        lengths = [len(line) for line in lines]
+        words = [len(WORD_PATTERN.findall(line)) for line in lines]
+        self.word_count += sum(words) - sum(self._words[old])
+        self.line_count += (
+            sum(line_rows(length, self.width) for length in lengths)
+            - sum(line_rows(length, self.width) for length in self._lengths[old])
+        )
+        self._lengths[old] = lengths
+        self._words[old] = words
+
+    def set_width(self, width):
+        """Change la largeur des lignes ; seul le nombre de lignes affichées est recalculé."""
+        width = max(1, width)
+        if width != self.width:
+            self.width = width
+            self.line_count = sum(line_rows(length, width) for length in self._lengths)
+
+    def page_count(self, lines_per_page):
+        if lines_per_page <= 0:
+            return 1
+        return (self.line_count + lines_per_page - 1) // lines_per_page
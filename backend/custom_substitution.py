@@ -0,0 +1,78 @@
+_VALUE = None  # clé réservée du nœud : remplacement associé au motif qui se termine ici
+
+
+class SubstitutionTrie:
+    """
+    Table de remplacements compilée en trie, appliquée en une seule passe.
+
+    À chaque position, le motif le plus long qui commence à cette position est
+    remplacé (correspondance la plus à gauche, puis la plus longue), puis la lecture
+    reprend après le motif. Le coût est linéaire en la taille du texte (au facteur
+    longueur maximale d'un motif près), quel que soit le nombre d'entrées.
+    """
+
+    __slots__ = ("_root", "size")
+
+    def __init__(self, mapping):
+        self._root = {}
+        self.size = 0
+        for pattern, replacement in mapping:
+            if not pattern:
+                continue
+            node = self._root
+            for char in pattern:
+                node = node.setdefault(char, {})
+            # En cas de doublon, la première entrée l'emporte
+            if _VALUE not in node:
+                node[_VALUE] = replacement
+                self.size += 1
+
+    @classmethod
+    def forward(cls, custom_table):
+        """Remplacements texte → braille d'une table personnalisée."""
+        return cls(custom_table.items())
+
+    @classmethod
+    def backward(cls, custom_table):
+        """Remplacements braille → texte d'une table personnalisée."""
+        return cls((braille, char_text) for char_text, braille in custom_table.items())
+
+    def __bool__(self):
+        return self.size > 0
+
+    def apply(self, text):
+        if not self.size or not text:
+            return text
+        root = self._root
+        length = len(text)
+        parts = []
+        last = 0
+        i = 0
+        while i < length:
+            node = root.get(text[i])
+            if node is None:
+                i += 1
+                continue
+            match_end = -1
+            match_value = None
+            j = i
+            while True:
+                j += 1
+                if _VALUE in node:
+                    match_end = j
+                    match_value = node[_VALUE]
+                if j >= length:
+                    break
+                node = node.get(text[j])
+                if node is None:
+                    break
+            if match_end < 0:
+                i += 1
+                continue
+            parts.append(text[last:i])
+            parts.append(match_value)
+            i = last = match_end
+        if not parts:
+            return text
+        parts.append(text[last:])
+        return "".join(parts)
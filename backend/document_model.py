@@ -0,0 +1,275 @@
+from itertools import accumulate
+from bisect import bisect_right
+
+from backend.incremental import diff_lines
+
+
+class Paragraph:
+    """Paragraphe du document et son emplacement de traduction."""
+
+    __slots__ = ("text", "version", "braille", "braille_key", "braille_version")
+
+    def __init__(self, text, version=0):
+        self.text = text
+        self.version = version
+        self.braille = None
+        self.braille_key = None
+        self.braille_version = -1
+
+    def is_translated(self, key):
+        return self.braille_key == key and self.braille_version == self.version
+
+
+class DocumentModel:
+    """
+    Document découpé en paragraphes, sans dépendance à Qt.
+
+    Les paragraphes sont rangés par blocs de `chunk_size` (corde à deux niveaux) :
+    retrouver le paragraphe d'une position ne parcourt que les longueurs des blocs
+    puis un seul bloc, et une modification ne touche que les paragraphes concernés,
+    sans recopier le texte entier.
+
+    Chaque paragraphe porte sa traduction et deux compteurs : `version` (numéro de
+    la dernière modification du document qui l'a touché) et `braille_version` (version
+    traduite). Un paragraphe est à retraduire si ces deux compteurs diffèrent ou si la
+    clé de traduction (table, largeur, ...) a changé. Les paragraphes modifiés depuis
+    la dernière traduction sont suivis à part : retraduire ne parcourt qu'eux.
+    """
+
+    def __init__(self, text="", chunk_size=256):
+        self.chunk_size = max(2, chunk_size)
+        self.version = 0
+        self.translation_key = None
+        self._chunks = []
+        self._chunk_lengths = []  # caractères par bloc, un séparateur compris par paragraphe
+        self._dirty = set()  # paragraphes modifiés depuis la dernière traduction pour `translation_key`
+        self._load([Paragraph(line) for line in text.split("\n")])
+
+    def _load(self, paragraphs):
+        size = self.chunk_size
+        self._chunks = [paragraphs[i:i + size] for i in range(0, len(paragraphs), size)] or [[Paragraph("")]]
+        self._chunk_lengths = [sum(len(p.text) + 1 for p in chunk) for chunk in self._chunks]
+        self._dirty = {p for p in self.paragraphs() if not p.is_translated(self.translation_key)}
+
+    def __len__(self):
+        """Nombre de caractères du texte (séparateurs de paragraphes compris)."""
+        return sum(self._chunk_lengths) - 1
+
+    @property
+    def paragraph_count(self):
+        return sum(len(chunk) for chunk in self._chunks)
+
+    def paragraphs(self):
+        for chunk in self._chunks:
+            yield from chunk
+
+    def _chunk_of_paragraph(self, index):
+        """(bloc, position dans le bloc) du paragraphe `index`."""
+        for chunk_index, chunk in enumerate(self._chunks):
+            if index < len(chunk):
+                return chunk_index, index
+            index -= len(chunk)
+        raise IndexError("Paragraphe hors du document")
+
+    def paragraph(self, index):
+        chunk_index, position = self._chunk_of_paragraph(index)
+        return self._chunks[chunk_index][position]
+
+    def locate(self, offset):
+        """(indice du paragraphe, position dans le paragraphe) du caractère `offset`."""
+        if not 0 <= offset <= len(self):
+            raise IndexError(f"Position hors du document : {offset}")
+        starts = list(accumulate(self._chunk_lengths, initial=0))
+        chunk_index = min(bisect_right(starts, offset) - 1, len(self._chunks) - 1)
+        offset -= starts[chunk_index]
+        index = sum(len(chunk) for chunk in self._chunks[:chunk_index])
+        for paragraph in self._chunks[chunk_index]:
+            if offset <= len(paragraph.text):
+                return index, offset
+            offset -= len(paragraph.text) + 1
+            index += 1
+        raise IndexError(f"Position hors du document : {offset}")
+
+    def paragraph_start(self, index):
+        """Position du premier caractère du paragraphe `index`."""
+        chunk_index, position = self._chunk_of_paragraph(index)
+        start = sum(self._chunk_lengths[:chunk_index])
+        return start + sum(len(p.text) + 1 for p in self._chunks[chunk_index][:position])
+
+    def slice(self, start, end):
+        """Texte entre `start` et `end`, sans reconstruire le document."""
+        first, first_offset = self.locate(start)
+        last, last_offset = self.locate(end)
+        if first == last:
+            return self.paragraph(first).text[first_offset:last_offset]
+        parts = [self.paragraph(first).text[first_offset:]]
+        parts.extend(self.paragraph(index).text for index in range(first + 1, last))
+        parts.append(self.paragraph(last).text[:last_offset])
+        return "\n".join(parts)
+
+    def text(self):
+        return "\n".join(paragraph.text for paragraph in self.paragraphs())
+
+    # Mêmes accès par lignes que `LineStore` (vues paginées) : une ligne par paragraphe
+
+    @property
+    def line_count(self):
+        return self.paragraph_count
+
+    def line_start(self, index):
+        return self.paragraph_start(index)
+
+    def lines(self, start, stop):
+        """Texte des paragraphes `start` à `stop` (exclu)."""
+        result = []
+        stop = min(stop, self.paragraph_count)
+        if start >= stop:
+            return result
+        chunk_index, position = self._chunk_of_paragraph(start)
+        for chunk in self._chunks[chunk_index:]:
+            for paragraph in chunk[position:]:
+                result.append(paragraph.text)
+                if len(result) == stop - start:
+                    return result
+            position = 0
+        return result
+
+    def line_lengths(self):
+        for paragraph in self.paragraphs():
+            yield len(paragraph.text)
+
+    def replace(self, start, end, text):
+        """
+        Remplace les caractères [start, end) par `text`.
+
+        Renvoie (premier paragraphe touché, nombre de paragraphes retirés, nombre de
+        paragraphes insérés). Les paragraphes dont le texte ne change pas gardent leur
+        traduction.
+        """
+        if start > end:
+            raise ValueError(f"Intervalle invalide : {start} > {end}")
+        first, first_offset = self.locate(start)
+        last, last_offset = self.locate(end)
+        self.version += 1
+
+        if first == last and "\n" not in text:
+            chunk_index, position = self._chunk_of_paragraph(first)
+            paragraph = self._chunks[chunk_index][position]
+            new_text = paragraph.text[:first_offset] + text + paragraph.text[last_offset:]
+            if new_text != paragraph.text:
+                self._chunk_lengths[chunk_index] += len(new_text) - len(paragraph.text)
+                paragraph.text = new_text
+                paragraph.version = self.version
+                self._dirty.add(paragraph)
+            return first, 1, 1
+
+        old = [self.paragraph(index) for index in range(first, last + 1)]
+        new_texts = (old[0].text[:first_offset] + text + old[-1].text[last_offset:]).split("\n")
+        # Paragraphes inchangés en tête et en queue : mêmes objets, traduction conservée
+        head = 0
+        while head < min(len(old), len(new_texts)) and old[head].text == new_texts[head]:
+            head += 1
+        tail = 0
+        while (tail < min(len(old), len(new_texts)) - head
+               and old[len(old) - 1 - tail].text == new_texts[len(new_texts) - 1 - tail]):
+            tail += 1
+        middle = [Paragraph(line, self.version) for line in new_texts[head:len(new_texts) - tail]]
+        new_paragraphs = old[:head] + middle + old[len(old) - tail:]
+        self._dirty.difference_update(old[head:len(old) - tail])
+        self._dirty.update(middle)
+        self._splice(first, len(old), new_paragraphs)
+        return first, len(old), len(new_paragraphs)
+
+    def insert(self, offset, text):
+        return self.replace(offset, offset, text)
+
+    def delete(self, start, end):
+        return self.replace(start, end, "")
+
+    def _splice(self, first, count, new_paragraphs):
+        """Remplace `count` paragraphes à partir de `first`, en ne recomposant que les blocs touchés."""
+        first_chunk, position = self._chunk_of_paragraph(first)
+        last_chunk, last_position = self._chunk_of_paragraph(first + count - 1)
+        merged = (self._chunks[first_chunk][:position] + new_paragraphs
+                  + self._chunks[last_chunk][last_position + 1:])
+        size = self.chunk_size
+        chunks = [merged[i:i + size] for i in range(0, len(merged), size)]
+        lengths = [sum(len(p.text) + 1 for p in chunk) for chunk in chunks]
+        self._chunks[first_chunk:last_chunk + 1] = chunks
+        self._chunk_lengths[first_chunk:last_chunk + 1] = lengths
+        if not self._chunks:
+            self._load([Paragraph("", self.version)])
+
+    def set_text(self, text):
+        """
+        Remplace le texte entier lorsque seules ses deux versions sont connues : les
+        paragraphes sont alignés par `diff_lines` et seuls les paragraphes ajoutés ou
+        modifiés perdent leur traduction.
+        """
+        new_lines = text.split("\n")
+        old = list(self.paragraphs())
+        opcodes = diff_lines([paragraph.text for paragraph in old], new_lines)
+        if all(tag == "equal" for tag, *_ in opcodes):
+            return
+        self.version += 1
+        paragraphs = []
+        for tag, i1, i2, j1, j2 in opcodes:
+            if tag == "equal":
+                paragraphs.extend(old[i1:i2])
+            elif tag != "delete":
+                paragraphs.extend(Paragraph(line, self.version) for line in new_lines[j1:j2])
+        self._load(paragraphs)
+
+    def _stale(self, key):
+        if key != self.translation_key:
+            return list(self.paragraphs())
+        return list(self._dirty)
+
+    def stale_count(self, key):
+        """Nombre de paragraphes non vides à (re)traduire pour `key`."""
+        return sum(1 for p in self._stale(key) if p.text.strip())
+
+    def retranslate(self, key, translate):
+        """
+        Traduit en un seul lot les paragraphes non vides dont la traduction manque ou
+        est périmée pour `key` ; `translate(lignes)` renvoie une traduction par ligne.
+        Renvoie le nombre de paragraphes traduits.
+        """
+        stale = self._stale(key)
+        texts = list(dict.fromkeys(p.text for p in stale if p.text.strip()))
+        translated = dict(zip(texts, translate(texts))) if texts else {}
+        for paragraph in stale:
+            self.set_braille(paragraph, translated.get(paragraph.text, ""), key, paragraph.version)
+        self.translation_key = key
+        self._dirty.clear()
+        return len(texts)
+
+    def store_all(self, key, outputs, version):
+        """
+        Range une traduction complète (une sortie par paragraphe) obtenue pour la
+        version `version` du document ; ignorée si le document a changé depuis.
+        """
+        if version != self.version or len(outputs) != self.paragraph_count:
+            return False
+        for paragraph, braille in zip(self.paragraphs(), outputs):
+            self.set_braille(paragraph, braille, key, paragraph.version)
+        self.translation_key = key
+        self._dirty.clear()
+        return True
+
+    @staticmethod
+    def set_braille(paragraph, braille, key, version):
+        """
+        Range la traduction d'un paragraphe, sauf s'il a été modifié depuis que la
+        traduction a été demandée (`version`).
+        """
+        if paragraph.version != version:
+            return False
+        paragraph.braille = braille
+        paragraph.braille_key = key
+        paragraph.braille_version = version
+        return True
+
+    def braille_text(self):
+        """Traductions des paragraphes, dans l'ordre (chaîne vide pour un paragraphe non traduit)."""
+        return "\n".join(paragraph.braille or "" for paragraph in self.paragraphs())
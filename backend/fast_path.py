@@ -0,0 +1,179 @@
+import re
+import string
+
+# Caractères sondés : ASCII imprimable, lettres latines accentuées, ponctuation
+# typographique courante, lettres, signes et chiffres arabes
+CANDIDATE_CHARACTERS = "".join(dict.fromkeys(
+    string.ascii_letters + string.digits + string.punctuation
+    + "".join(chr(code) for code in range(0xC0, 0x100) if chr(code) not in "×÷")
+    + "œŒ«»‘’“”–—…"
+    + "".join(chr(code) for code in range(0x0621, 0x064B))
+    + "،؛؟"
+    + "".join(chr(code) for code in range(0x0660, 0x066A))
+))
+
+# Règles liblouis dont le résultat dépend du contexte, quelle que soit la longueur de l'opérande
+CONTEXT_OPCODES = frozenset({
+    "word", "begword", "midword", "endword", "partword", "prfword", "sufword", "begmidword", "midendword",
+    "begnum", "midnum", "endnum", "joinword", "lowword", "contraction", "literal", "largesign", "syllable",
+    "nocont", "compbrl", "repword", "rependword", "decpoint", "hyphen",
+})
+# Règles sur une suite de caractères : dépendantes du contexte si l'opérande a plus d'un caractère
+SEQUENCE_OPCODES = frozenset({"always", "repeated", "replace"})
+# Règles à motifs : les chaînes entre guillemets (et l'opérande central de `match`)
+PATTERN_OPCODES = frozenset({"context", "correct", "pass2", "pass3", "pass4", "match"})
+RULE_PREFIXES = ("nofor", "noback")
+
+_ESCAPE_RE = re.compile(r"\\(x[0-9a-fA-F]{4}|y[0-9a-fA-F]{5}|z[0-9a-fA-F]{8}|.)")
+_QUOTED_RE = re.compile(r'"((?:[^"\\]|\\.)*)"')
+_SIMPLE_ESCAPES = {"s": " ", "t": "\t", "n": "\n", "r": "\r", "f": "\f", "v": "\v", "e": "\x1b"}
+
+
+def _unescape(operand):
+    def replace(match):
+        escape = match.group(1)
+        if len(escape) > 1:
+            return chr(int(escape[1:], 16))
+        return _SIMPLE_ESCAPES.get(escape, escape)
+    return _ESCAPE_RE.sub(replace, operand)
+
+
+def table_context_characters(paths):
+    """
+    Caractères qu'une table (et ses inclusions, `paths`) traite selon leur contexte :
+    opérandes des règles contextuelles (`midword`, `midnum`...), des règles sur plus
+    d'un caractère (`always ...`) et des motifs (`context`, `correct`, `match`...).
+    Le sondage par paires de `Grade1FastPath.probe` ne voit pas les règles de trois
+    caractères ou plus.
+    """
+    dependent = set()
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as table_file:
+                lines = table_file.readlines()
+        except OSError:
+            continue
+        for line in lines:
+            tokens = line.split()
+            while tokens and tokens[0] in RULE_PREFIXES:
+                tokens = tokens[1:]
+            if len(tokens) < 2 or tokens[0].startswith("#"):
+                continue
+            opcode, operand = tokens[0], _unescape(tokens[1])
+            if opcode in CONTEXT_OPCODES or (opcode in SEQUENCE_OPCODES and len(operand) > 1):
+                dependent.update(operand)
+            elif opcode in PATTERN_OPCODES:
+                for quoted in _QUOTED_RE.findall(line):
+                    dependent.update(_unescape(quoted))
+                if opcode == "match" and len(tokens) > 2:
+                    dependent.update(_unescape(tokens[2]))
+    return dependent
+
+
+class Grade1FastPath:
+    """
+    Traduction directe (`str.translate`) des lignes d'une table de grade 1 composées
+    uniquement de caractères sans contexte.
+
+    Un caractère est sans contexte lorsque liblouis le traduit toujours par les mêmes
+    cellules, quels que soient ses voisins : sa traduction seule, doublée, à côté de
+    chacun des autres caractères sans contexte et de part et d'autre d'une espace est
+    la concaténation des traductions de chaque caractère (voir `probe`). Les autres
+    caractères (majuscules et chiffres précédés d'un indicateur, signes qui changent
+    selon leur position...) sont `dependent` : une ligne qui en contient passe par
+    liblouis. Les espaces ne sont acceptées qu'à l'intérieur d'une ligne, et doublées
+    seulement si liblouis les conserve telles quelles.
+    """
+
+    __slots__ = ("mapping", "dependent", "double_spaces", "_table", "_other")
+
+    def __init__(self, mapping, dependent=(), double_spaces=False):
+        self.mapping = dict(mapping)
+        self.dependent = frozenset(dependent)
+        self.double_spaces = double_spaces
+        self._table = str.maketrans(self.mapping)
+        self._other = re.compile("[^" + "".join(re.escape(char) for char in self.mapping) + "]")
+
+    def __len__(self):
+        return len(self.mapping)
+
+    def covers(self, line):
+        """Vrai si la ligne peut être traduite sans liblouis."""
+        return (
+            bool(line) and line[0] != " " and line[-1] != " "
+            and self._other.search(line) is None
+            and (self.double_spaces or "  " not in line)
+        )
+
+    def translate(self, line):
+        """Traduction de la ligne, ou None si elle contient un caractère à confier à liblouis."""
+        return line.translate(self._table) if self.covers(line) else None
+
+    @classmethod
+    def probe(cls, translate, candidates=CANDIDATE_CHARACTERS, dependent=()):
+        """
+        Construit la correspondance en sondant le moteur une fois : `translate(lignes)`
+        renvoie une traduction par ligne (liblouis, sans cache). Environ un appel par
+        paire de caractères retenus, en trois lots. Les caractères de `dependent`
+        (voir `table_context_characters`) sont exclus d'office.
+        """
+        known = set(dependent)
+        candidates = [char for char in dict.fromkeys(candidates) if char.strip() and char not in known]
+        # 1. Chaque caractère seul et doublé
+        outputs = translate([probe for char in candidates for probe in (char, char + char)])
+        cells = {}
+        for index, char in enumerate(candidates):
+            alone, doubled = outputs[2 * index], outputs[2 * index + 1]
+            if alone and doubled == alone + alone:
+                cells[char] = alone
+        dependent = (set(candidates) - set(cells)) | known
+        if not cells:
+            return cls({}, dependent)
+
+        # 2. Espace entre deux caractères, simple et doublée
+        reference = next(iter(cells))
+        space_probes = [reference + " " + reference, reference + "  " + reference]
+        space_probes += [probe for char in cells for probe in (char + " " + reference, reference + " " + char)]
+        outputs = translate(space_probes)
+        single, double = outputs[0], outputs[1]
+        prefix = cells[reference]
+        space = None
+        if single.startswith(prefix) and single.endswith(prefix) and len(single) > 2 * len(prefix):
+            space = single[len(prefix):len(single) - len(prefix)]
+        if " " in known:
+            space = None
+        if space is None:
+            # Espaces non reproductibles : seules les lignes sans espace passent sans liblouis
+            mapping = {}
+        else:
+            mapping = {" ": space}
+            for index, char in enumerate(cells):
+                before, after = outputs[2 + 2 * index], outputs[3 + 2 * index]
+                if before != cells[char] + space + prefix or after != prefix + space + cells[char]:
+                    dependent.add(char)
+        for char in dependent:
+            cells.pop(char, None)
+
+        # 3. Chaque paire de caractères restants
+        chars = list(cells)
+        pairs = [first + second for first in chars for second in chars if first != second]
+        for pair, output in zip(pairs, translate(pairs) if pairs else []):
+            if output != cells[pair[0]] + cells[pair[1]]:
+                dependent.update(pair)
+        mapping.update((char, cells[char]) for char in chars if char not in dependent)
+        double_spaces = space is not None and double == prefix + space + space + prefix
+        return cls(mapping, dependent, double_spaces)
+
+    def verify(self, lines, translate):
+        """
+        Compare la traduction directe à celle du moteur (`translate(lignes)`) sur les
+        lignes couvertes d'un corpus ; renvoie les écarts (ligne, directe, moteur).
+        """
+        covered = [line for line in dict.fromkeys(lines) if self.covers(line)]
+        if not covered:
+            return []
+        expected = translate(covered)
+        return [
+            (line, line.translate(self._table), output)
+            for line, output in zip(covered, expected) if line.translate(self._table) != output
+        ]
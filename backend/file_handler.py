@@ -21,6 +21,7 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
 from xml.sax.saxutils import escape
 from docx.shared import Pt, Inches
 from docx.enum.text import WD_BREAK
+from backend.layout import wrap_stream
 
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -678,40 +679,7 @@ class FileHandler:
 
     def _wrap_text(self, text, max_width):
         logging.debug(f"_wrap_text called with text='{text[:50]}...', max_width={max_width}")
-        if not text or max_width < 1:
-            return text
-
-        lines = []
-        current_line = ""
-        segments = re.split(r'(\s+|[^\s]+)', text)
-        segments = [s for s in segments if s]
-
-        for segment in segments:
-            if segment.isspace():
-                if len(current_line) + len(segment) <= max_width:
-                    current_line += segment
-                else:
-                    if current_line:
-                        lines.append(current_line.rstrip())
-                    current_line = segment.lstrip()
-                continue
-
-            if len(current_line) + len(segment) <= max_width:
-                current_line += segment
-            else:
-                if current_line:
-                    lines.append(current_line.rstrip())
-                    current_line = segment
-                else:
-                    while len(segment) > max_width:
-                        lines.append(segment[:max_width])
-                        segment = segment[max_width:]
-                    current_line = segment
-
-        if current_line:
-            lines.append(current_line.rstrip())
-
-        result = "\n".join(lines)
+        result = wrap_stream(text, max_width)
         logging.debug(f"Wrapped text: {result[:100]}...")
         return result
 
@@ -0,0 +1,95 @@
+def _myers_blocks(a, b, max_edits):
+    """
+    Blocs communs (i, j, longueur) de deux suites d'entiers, par l'algorithme de
+    Myers en O((N + M) D). Renvoie None si plus de `max_edits` modifications sont
+    nécessaires.
+    """
+    n, m = len(a), len(b)
+    limit = min(n + m, max_edits)
+    offset = limit + 1
+    v = [0] * (2 * limit + 3)
+    trace = []
+    for d in range(limit + 1):
+        # Valeurs de l'étape précédente, pour k dans [-d, d]
+        trace.append(v[offset - d:offset + d + 1])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return _backtrack(trace, n, m)
+    return None
+
+
+def _backtrack(trace, x, y):
+    blocks = []
+    for d in range(len(trace) - 1, 0, -1):
+        previous = trace[d]
+        k = x - y
+        if k == -d or (k != d and previous[k - 1 + d] < previous[k + 1 + d]):
+            previous_k = k + 1
+            start_x = previous[previous_k + d]
+        else:
+            previous_k = k - 1
+            start_x = previous[previous_k + d] + 1
+        if x > start_x:
+            blocks.append((start_x, start_x - k, x - start_x))
+        x = previous[previous_k + d]
+        y = x - previous_k
+    if x > 0:
+        blocks.append((0, 0, x))
+    blocks.reverse()
+    return blocks
+
+
+def diff_lines(old_lines, new_lines, max_edits=2000):
+    """
+    Différence entre deux listes de lignes, sous forme d'opérations
+    (étiquette, i1, i2, j1, j2) comme `difflib.SequenceMatcher.get_opcodes` :
+    'equal', 'replace', 'delete' ou 'insert'.
+
+    Le début et la fin communs sont retirés, les lignes restantes sont remplacées par
+    des entiers (une ligne identique, un même entier), puis l'algorithme de Myers les
+    aligne : le coût de l'alignement suit la taille de la modification, pas celle du
+    document. Au-delà de `max_edits` modifications, la partie centrale est simplement
+    remplacée.
+    """
+    n, m = len(old_lines), len(new_lines)
+    prefix = 0
+    while prefix < n and prefix < m and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < n - prefix and suffix < m - prefix and old_lines[n - 1 - suffix] == new_lines[m - 1 - suffix]:
+        suffix += 1
+
+    blocks = []
+    if prefix:
+        blocks.append((0, 0, prefix))
+    if prefix < n - suffix and prefix < m - suffix:
+        ids = {}
+        a = [ids.setdefault(line, len(ids)) for line in old_lines[prefix:n - suffix]]
+        b = [ids.setdefault(line, len(ids)) for line in new_lines[prefix:m - suffix]]
+        for i, j, size in _myers_blocks(a, b, max_edits) or ():
+            blocks.append((prefix + i, prefix + j, size))
+    if suffix:
+        blocks.append((n - suffix, m - suffix, suffix))
+
+    opcodes = []
+    i = j = 0
+    for block_i, block_j, size in blocks + [(n, m, 0)]:
+        if i < block_i and j < block_j:
+            opcodes.append(("replace", i, block_i, j, block_j))
+        elif i < block_i:
+            opcodes.append(("delete", i, block_i, j, j))
+        elif j < block_j:
+            opcodes.append(("insert", i, i, j, block_j))
+        if size:
+            opcodes.append(("equal", block_i, block_i + size, block_j, block_j + size))
+        i, j = block_i + size, block_j + size
+    return opcodes
@@ -1,47 +1,162 @@
-import louis
-from langdetect import detect
 import logging
-from backend.config import TABLE_NAMES, TABLES_DIRECTORY
+import threading
+from collections import OrderedDict
+from backend.config import TABLE_NAMES, TABLES_DIRECTORY, LANGUAGE_SAMPLE_CHARS
 import os
 import re
 
 # Constante pour la conversion inverse
 LOU_BACKTRANSLATE = 0x0002
 
+ARABIC_LETTERS = re.compile(r'[\u0600-\u06FF\u0750-\u077F\uFB50-\uFDFF\uFE70-\uFEFF]')
+LATIN_LETTERS = re.compile(r'[A-Za-z\u00C0-\u024F]')
+NON_LETTERS = re.compile(r'[^a-z\u00E0-\u00FF\u0153]+')
+FRENCH_LETTERS = re.compile(r'[éèêëàâîïôùûüçœ]')
+
+# Profils de trigrammes fréquents (espaces compris) propres à chaque langue ; les
+# trigrammes fréquents dans les deux langues (« ion », « ent », « es »...) n'y sont pas
+FRENCH_TRIGRAMS = frozenset((
+    " de", "de ", " le", "le ", "la ", " la", " et", "et ", "les", " qu", "que", "ue ",
+    "des", " pa", "ne ", "ur ", "our", "ait", "men", "ous", " un", "une", "par", "ans",
+    " en", "en ", "dan", " da", "est", "ais", "qui", "eme", "lle", "ell", "pou", " po",
+    "tre", "ons", "ez ", "aux", "au ", " du", "du ", "ux ", " ce", "ce ", " ne", " pl",
+    "ett", "oir", "eur", "ien", " so", "son", " au", "ire", " mo", "nou", "vou", " vo",
+))
+ENGLISH_TRIGRAMS = frozenset((
+    " th", "the", "he ", "and", " an", "nd ", " of", "of ", "ing", "ng ", " to", "to ",
+    "is ", "ed ", "hat", "tha", " is", " wa", "for", " fo", "her", "his", "thi", "ith",
+    "wit", " wi", "was", "you", " yo", "ly ", "ere", "oul", "uld", " be", "ave", "hav",
+    " ha", "ver", "all", "are", " ar", " it", "it ", " wh", "whi", "hic", "ich", "ght",
+    "igh", " sh", "sho", "out", "ow ", " ho", "ey ", "thr", "ry ", "ts ", "ke ", "wor",
+))
+
+# Langue d'une table braille, d'après le début de son nom affiché
+TABLE_LANGUAGES = {'Arabe': 'ar', 'Français': 'fr', 'Anglais': 'en'}
+
+
 class LanguageDetector:
-    def __init__(self):
+    """
+    Détection de la langue (arabe, français, anglais) hors ligne.
+
+    Chaque paragraphe est résumé par son histogramme d'écritures (lettres arabes,
+    lettres latines) et un score français/anglais tiré des profils de trigrammes et
+    des lettres accentuées ; ces résumés sont gardés en cache par paragraphe, si bien
+    que seul un paragraphe modifié est réanalysé. La langue d'un texte est celle des
+    résumés additionnés de ses paragraphes.
+    """
+
+    def __init__(self, cache_size=4096):
         # Mapper les codes de langue aux noms de tables
         self.language_to_table = {
             'ar': 'Arabe (grade 1)',
             'fr': 'Français (grade 1)',
             'en': 'Anglais (grade 1)'
         }
-        
-    def detect_language(self, text):
-        """Détecte la langue du texte (arabe, français, anglais) avec heuristique, sinon langdetect."""
+        self.cache_size = cache_size
+        self._profiles = OrderedDict()  # paragraphe -> (lettres arabes, lettres latines, score français)
+        self._lock = threading.Lock()
+
+    def _profile(self, paragraph):
+        with self._lock:
+            profile = self._profiles.get(paragraph)
+            if profile is not None:
+                self._profiles.move_to_end(paragraph)
+                return profile
+        arabic = len(ARABIC_LETTERS.findall(paragraph))
+        latin = len(LATIN_LETTERS.findall(paragraph))
+        score = 0
+        if latin:
+            words = " " + NON_LETTERS.sub(" ", paragraph.lower()).strip() + " "
+            for index in range(len(words) - 2):
+                trigram = words[index:index + 3]
+                if trigram in FRENCH_TRIGRAMS:
+                    score += 1
+                elif trigram in ENGLISH_TRIGRAMS:
+                    score -= 1
+            score += 3 * len(FRENCH_LETTERS.findall(words))
+        profile = (arabic, latin, score)
+        with self._lock:
+            self._profiles[paragraph] = profile
+            if len(self._profiles) > self.cache_size:
+                self._profiles.popitem(last=False)
+        return profile
+
+    def detect_paragraphs(self, paragraphs):
+        """Langue ('ar', 'fr' ou 'en') d'un ensemble de paragraphes (échantillon du texte)."""
+        arabic = latin = score = 0
+        for paragraph in paragraphs:
+            if not paragraph.strip():
+                continue
+            paragraph_arabic, paragraph_latin, paragraph_score = self._profile(paragraph[:LANGUAGE_SAMPLE_CHARS])
+            arabic += paragraph_arabic
+            latin += paragraph_latin
+            score += paragraph_score
+        if arabic and arabic >= latin:
+            return 'ar'
+        return 'fr' if score > 0 else 'en'
+
+    def paragraph_language(self, paragraph):
+        """Langue d'un paragraphe, ou None s'il ne contient aucun indice (ligne vide, nombres, nom propre...)."""
+        arabic, latin, score = self._profile(paragraph[:LANGUAGE_SAMPLE_CHARS])
+        if arabic and arabic >= latin:
+            return 'ar'
+        if not latin or not score:
+            return None
+        return 'fr' if score > 0 else 'en'
+
+    def language_runs(self, lines, default='en', previous=None):
+        """
+        Découpe des lignes en suites de même langue : liste de (langue, première
+        ligne, ligne suivant la dernière). Une ligne sans indice de langue rejoint la
+        suite qui la précède ; en tête de texte, elle prend la langue `previous` (fin
+        du texte qui précède), sinon celle de la suite suivante, sinon `default`.
+        """
+        languages = [self.paragraph_language(line) if line.strip() else None for line in lines]
+        current = previous or next((language for language in languages if language), default)
+        runs = []
+        for index, language in enumerate(languages):
+            language = language or current
+            current = language
+            if runs and runs[-1][0] == language:
+                runs[-1][2] = index + 1
+            else:
+                runs.append([language, index, index + 1])
+        return [tuple(run) for run in runs]
+
+    @staticmethod
+    def table_language(table_name):
+        """Langue ('ar', 'fr', 'en') d'une table d'après son nom affiché, None si inconnue."""
+        for prefix, language in TABLE_LANGUAGES.items():
+            if table_name and table_name.startswith(prefix):
+                return language
+        return None
+
+    @staticmethod
+    def sample(text, position=None, sample_chars=LANGUAGE_SAMPLE_CHARS):
+        """
+        Paragraphes à analyser : ceux du début du texte jusqu'à `sample_chars`
+        caractères, plus le paragraphe contenant `position` (zone modifiée).
+        """
+        paragraphs = text[:sample_chars].split("\n")
+        if position is not None and position > sample_chars:
+            start = text.rfind("\n", 0, position) + 1
+            end = text.find("\n", position)
+            paragraphs.append(text[start:end if end != -1 else len(text)])
+        return paragraphs
+
+    def detect_language(self, text, position=None):
+        """Détecte la langue du texte (arabe, français, anglais) d'après un échantillon borné."""
         try:
-            # Heuristique pour l'arabe
-            if re.search(r'[\u0600-\u06FF]', text):
-                logging.debug("Heuristique : caractères arabes détectés.")
-                return 'ar'
-            # Heuristique pour le français (lettres accentuées courantes)
-            if re.search(r'[éèêëàâäîïôöùûüçœÉÈÊËÀÂÄÎÏÔÖÙÛÜÇŒ]', text):
-                logging.debug("Heuristique : caractères français détectés.")
-                return 'fr'
-            # Sinon, utiliser langdetect (pour l'anglais ou autres)
-            lang_code = detect(text)
-            logging.debug(f"Langue détectée par langdetect : {lang_code}")
-            # On force 'en' si ce n'est ni 'ar' ni 'fr'
-            if lang_code not in ('ar', 'fr'):
-                return 'en'
+            lang_code = self.detect_paragraphs(self.sample(text, position))
+            logging.debug(f"Langue détectée : {lang_code}")
             return lang_code
         except Exception as e:
             logging.error(f"Erreur lors de la détection de la langue : {str(e)}")
             return 'en'  # Par défaut, anglais
-            
+
     def get_braille_table(self, lang_code):
         """Retourne le chemin complet de la table braille correspondant à la langue détectée."""
-        table_name = self.language_to_table.get(lang_code, 'Anglais (Grade 1)')
+        table_name = self.language_to_table.get(lang_code, 'Anglais (grade 1)')
         table_file = TABLE_NAMES.get(table_name)
         if table_file:
             return os.path.join(TABLES_DIRECTORY, table_file)
@@ -59,7 +174,8 @@ class LanguageDetector:
                 logging.error(f"Aucune table trouvée pour la langue {lang_code}")
                 return None
             
-            # Convertir en braille
+            # Convertir en braille (module `louis` facultatif : importé seulement ici)
+            import louis
             braille = louis.translateString([table_path], text)
             
             logging.debug(f"Conversion réussie : {text[:50]}... -> {braille[:50]}...")
@@ -79,6 +195,7 @@ class LanguageDetector:
                 return None
             
             # Convertir depuis le braille
+            import louis
             text = louis.translateString([table_path], braille_text, mode=LOU_BACKTRANSLATE)
             
             logging.debug(f"Conversion inverse réussie : {braille_text[:50]}... -> {text[:50]}...")
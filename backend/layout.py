@@ -0,0 +1,608 @@
+import re
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+
+from backend.offset_map import OffsetMap
+
+try:
+    import numpy as np
+except ImportError:  # la détection vectorisée est facultative
+    np = None
+
+# Un jeton est soit une suite d'espaces, soit un mot (suite sans espace)
+_TOKEN_RE = re.compile(r'\s+|\S+')
+_WORD_RE = re.compile(r'\S+')
+
+# Au-delà de cette longueur, la détection des coupures est vectorisée avec numpy
+NUMPY_TOKENIZE_THRESHOLD = 1 << 16
+
+# Tous les caractères d'espacement Unicode sont dans le plan de base, avant U+3001
+_WHITESPACE_LIMIT = 0x3000
+_whitespace_table = None
+
+
+def _numpy_space_mask(text):
+    global _whitespace_table
+    if _whitespace_table is None:
+        table = np.zeros(_WHITESPACE_LIMIT + 1, dtype=bool)
+        table[[c for c in range(_WHITESPACE_LIMIT + 1) if chr(c).isspace()]] = True
+        # Dernière case : tout caractère au-delà de la limite (jamais un espace)
+        table[_WHITESPACE_LIMIT] = chr(_WHITESPACE_LIMIT).isspace()
+        _whitespace_table = table
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    beyond = codes > _WHITESPACE_LIMIT
+    mask = _whitespace_table[np.minimum(codes, _WHITESPACE_LIMIT)]
+    mask[beyond] = False
+    return mask
+
+
+def token_bounds(text):
+    """
+    Fins des jetons (mot ou suite d'espaces) de `text` et nature du premier jeton.
+
+    Les jetons alternent mot / espaces : le jeton k est un espace si et seulement si
+    (k pair) == `first_is_space`. Pour les textes très longs, les frontières sont
+    détectées en un seul passage vectorisé (numpy).
+    """
+    if not text:
+        return [], False
+    if np is None or len(text) < NUMPY_TOKENIZE_THRESHOLD:
+        ends = [match.end() for match in _TOKEN_RE.finditer(text)]
+        return ends, text[0].isspace()
+    is_space = _numpy_space_mask(text)
+    ends = (np.flatnonzero(is_space[1:] != is_space[:-1]) + 1).tolist()
+    ends.append(len(text))
+    return ends, bool(is_space[0])
+
+
+def tokenize(text):
+    """Découpe `text` en jetons (mot ou suite d'espaces, indicateur d'espace)."""
+    if not text:
+        return []
+    if np is None or len(text) < NUMPY_TOKENIZE_THRESHOLD:
+        return [(token, token.isspace()) for token in _TOKEN_RE.findall(text)]
+    ends, is_space = token_bounds(text)
+    tokens = []
+    start = 0
+    for end in ends:
+        tokens.append((text[start:end], is_space))
+        is_space = not is_space
+        start = end
+    return tokens
+
+
+class WrapPolicy:
+    """
+    Règles de coupure d'un algorithme de mise en page.
+
+    - `drop_overflow_spaces` : des espaces qui ne tiennent plus sur la ligne sont
+      supprimés sans provoquer de retour à la ligne (sinon ils en provoquent un).
+    - `split_long_words_mid_line` : un mot trop long est coupé même s'il suit du
+      texte sur la ligne (sinon il n'est coupé qu'en début de ligne).
+    - `open_on_leading_space` : une ligne qui commence par un espace compte comme
+      déjà entamée (comportement historique de `wrap_text`).
+    """
+
+    __slots__ = ("name", "drop_overflow_spaces", "split_long_words_mid_line", "open_on_leading_space")
+
+    def __init__(self, name, drop_overflow_spaces=False, split_long_words_mid_line=True, open_on_leading_space=False):
+        self.name = name
+        self.drop_overflow_spaces = drop_overflow_spaces
+        self.split_long_words_mid_line = split_long_words_mid_line
+        self.open_on_leading_space = open_on_leading_space
+
+    def __repr__(self):
+        return f"WrapPolicy({self.name})"
+
+
+# Texte et braille affichés (BrailleEngine.wrap_text_by_sentence)
+SENTENCE = WrapPolicy("sentence")
+# Braille (BrailleEngine.wrap_text) : les espaces en trop sont supprimés
+BRAILLE = WrapPolicy("braille", drop_overflow_spaces=True, open_on_leading_space=True)
+# Texte continu pour l'impression et le G-code (FileHandler._wrap_text)
+STREAM = WrapPolicy("stream", split_long_words_mid_line=False)
+
+
+def break_tokens(tokens, width, policy=SENTENCE):
+    """
+    Algorithme de coupure commun : un seul passage sur les jetons, lignes construites
+    par listes (aucune concaténation répétée de chaînes). Renvoie les segments.
+    """
+    if width < 1:
+        raise ValueError(f"Largeur de ligne invalide : {width}")
+    segments = []
+    current = []
+    current_length = 0
+    line_open = bool(policy.open_on_leading_space and tokens and tokens[0][1])
+    for token, is_space in tokens:
+        length = len(token)
+        if current_length + length <= width:
+            current.append(token)
+            current_length += length
+            line_open = True
+            continue
+        if is_space:
+            if policy.drop_overflow_spaces:
+                continue
+            # Les espaces en fin de ligne disparaissent avec la coupure
+            if line_open:
+                segments.append("".join(current).rstrip())
+            current = []
+            current_length = 0
+            line_open = False
+            continue
+        if line_open:
+            segments.append("".join(current).rstrip())
+            if not policy.split_long_words_mid_line:
+                current = [token]
+                current_length = length
+                continue
+        # Un mot plus long que la largeur est coupé
+        while length > width:
+            segments.append(token[:width])
+            token = token[width:]
+            length -= width
+        current = [token]
+        current_length = length
+        line_open = True
+    if line_open:
+        segments.append("".join(current).rstrip())
+    return segments
+
+
+def wrap_stream(text, width):
+    """
+    Mise en page d'un texte continu (impression, G-code) : les retours à la ligne
+    comptent comme des espaces. Texte souvent volumineux et lu une seule fois : pas
+    de mise en cache.
+    """
+    if not text or width < 1:
+        return text
+    return "\n".join(break_spans(text, width, STREAM))
+
+
+def break_spans(text, width, policy=SENTENCE):
+    """
+    Variante de `break_tokens` qui avance ligne par ligne plutôt que jeton par jeton.
+
+    Pour chaque ligne, le dernier jeton qui tient est trouvé par recherche
+    dichotomique sur les fins de jetons, et le segment est découpé directement dans
+    le texte : aucune chaîne n'est créée par jeton. Réservée aux règles où une ligne
+    est une portion contiguë du texte (pas `drop_overflow_spaces`).
+    """
+    if width < 1:
+        raise ValueError(f"Largeur de ligne invalide : {width}")
+    if policy.drop_overflow_spaces or policy.open_on_leading_space:
+        return break_tokens(tokenize(text), width, policy)
+    ends, first_is_space = token_bounds(text)
+    token_count = len(ends)
+    segments = []
+    k = 0
+    line_start = None  # début du contenu de la ligne en cours (None : ligne vide)
+    while k < token_count:
+        if line_start is None:
+            start = ends[k - 1] if k else 0
+            length = ends[k] - start
+            if length <= width:
+                line_start = start
+                k += 1
+            elif (k % 2 == 0) == first_is_space:
+                k += 1
+                continue
+            else:
+                while length > width:
+                    segments.append(text[start:start + width])
+                    start += width
+                    length -= width
+                line_start = start
+                k += 1
+        # Jetons qui tiennent encore sur la ligne : tous ceux qui finissent avant line_start + width
+        last = max(k - 1, bisect_right(ends, line_start + width) - 1)
+        segments.append(text[line_start:ends[last]].rstrip())
+        k = last + 1
+        if k >= token_count:
+            break
+        # Jeton k : premier qui dépasse
+        start = ends[k - 1]
+        length = ends[k] - start
+        if (k % 2 == 0) == first_is_space:
+            line_start = None
+            k += 1
+            continue
+        if length > width and policy.split_long_words_mid_line:
+            while length > width:
+                segments.append(text[start:start + width])
+                start += width
+                length -= width
+        line_start = start
+        k += 1
+        if k >= token_count:
+            segments.append(text[line_start:ends[k - 1]].rstrip())
+            break
+    return segments
+
+
+def fill_words(text, width):
+    """
+    Remplit des lignes de mots séparés par une seule espace (espaces et retours à la
+    ligne d'origine fusionnés) ; les mots trop longs ne sont pas coupés.
+    """
+    lines = []
+    current = []
+    current_length = 0
+    for word in text.split():
+        word_length = len(word)
+        # len(current) : nombre d'espaces nécessaires entre les mots de la ligne
+        if current_length + word_length + len(current) <= width:
+            current.append(word)
+            current_length += word_length
+        else:
+            if current:
+                lines.append(" ".join(current))
+            current = [word]
+            current_length = word_length
+    if current:
+        lines.append(" ".join(current))
+    return "\n".join(lines)
+
+
+class LineBreaks:
+    """
+    Possibilités de coupure d'une ligne, calculées une seule fois.
+
+    La ligne est découpée en jetons (mots et suites d'espaces) ; chaque largeur
+    demandée est ensuite mise en page en un seul passage linéaire sur ces jetons,
+    sans nouvelle analyse du texte. Les très longues lignes passent par
+    `break_spans` (frontières vectorisées, avancée ligne par ligne). Les résultats
+    sont conservés par largeur.
+    """
+
+    __slots__ = ("text", "_tokens", "_by_width")
+
+    def __init__(self, text):
+        self.text = text
+        self._tokens = None
+        self._by_width = {}
+
+    @property
+    def tokens(self):
+        if self._tokens is None:
+            self._tokens = tokenize(self.text)
+        return self._tokens
+
+    def wrap(self, width, policy=SENTENCE):
+        """Segments de la ligne pour `width` selon `policy`."""
+        key = (width, policy.name)
+        segments = self._by_width.get(key)
+        if segments is None:
+            if (len(self.text) >= NUMPY_TOKENIZE_THRESHOLD and self._tokens is None
+                    and not policy.drop_overflow_spaces and not policy.open_on_leading_space):
+                segments = break_spans(self.text, width, policy)
+            else:
+                segments = break_tokens(self.tokens, width, policy)
+            self._by_width[key] = segments
+        return segments
+
+
+class LayoutCache:
+    """
+    Module de mise en page unique : cache LRU des découpages de lignes (`LineBreaks`),
+    partagé par toutes les largeurs et tous les algorithmes.
+
+    Changer de largeur ne relit pas le texte : seule la passe de mise en page est
+    refaite, à partir des jetons déjà calculés.
+    """
+
+    def __init__(self, max_lines=8192):
+        self.max_lines = max_lines
+        self._lines = OrderedDict()
+        self._lock = threading.Lock()
+
+    def breaks(self, line):
+        with self._lock:
+            breaks = self._lines.get(line)
+            if breaks is not None:
+                self._lines.move_to_end(line)
+                return breaks
+        breaks = LineBreaks(line)
+        with self._lock:
+            self._lines[line] = breaks
+            if len(self._lines) > self.max_lines:
+                self._lines.popitem(last=False)
+        return breaks
+
+    def wrap_sentence(self, text, width=33, preserve_newlines=True):
+        """Mise en page de `text` à `width` colonnes, sans couper les mots sauf s'ils sont trop longs."""
+        if not text or width < 1:
+            return ""
+        lines = text.split("\n") if preserve_newlines else [text]
+        wrapped_lines = []
+        for line in lines:
+            if not line:
+                wrapped_lines.append("")
+                continue
+            wrapped_lines.extend(self.breaks(line).wrap(width, SENTENCE))
+        return "\n".join(wrapped_lines).rstrip()
+
+    def wrap_braille(self, text, width=33, preserve_newlines=True):
+        """Mise en page du braille : lignes blanches vidées, espaces en trop supprimés."""
+        if not text or width < 1:
+            return ""
+        lines = text.split("\n") if preserve_newlines else [text.replace("\n", " ")]
+        wrapped_lines = []
+        for line in lines:
+            if not line.strip():
+                wrapped_lines.append("")
+                continue
+            wrapped_lines.extend(self.breaks(line).wrap(width, BRAILLE))
+        return "\n".join(wrapped_lines)
+
+    def clear(self):
+        with self._lock:
+            self._lines.clear()
+
+
+class TranslatedDocument:
+    """
+    Résultat de traduction conservé sans mise en page.
+
+    Les lignes traduites sont gardées entières ; `render(width)` les met en page
+    pour une largeur donnée en un passage linéaire, sans aucun appel au moteur de
+    traduction. Les rendus sont mémorisés par largeur.
+
+    `offset_map(width)` relie les positions du texte source à celles du rendu : un
+    ancrage par ligne, puis par caractère braille si liblouis a fourni ses positions
+    d'entrée (`input_positions`), sinon par mot lorsque la ligne source et sa
+    traduction ont le même nombre de mots (`word_aligned`).
+    """
+
+    def __init__(self, source_text, translated_lines, layout_cache, table_path=None, version=None,
+                 section_separator="\u28CD", input_positions=None, word_aligned=True):
+        self.source_text = source_text
+        self.translated_lines = translated_lines
+        self.layout_cache = layout_cache
+        self.table_path = table_path
+        self.version = version
+        self.section_separator = section_separator
+        self.input_positions = input_positions
+        self.word_aligned = word_aligned
+        self._renders = {}
+        self._offset_maps = {}
+
+    def matches(self, source_text, table_path, version):
+        """Vrai si le document correspond toujours au texte, à la table et aux tables personnalisées."""
+        return self.source_text == source_text and self.table_path == table_path and self.version == version
+
+    def _wrapped_lines(self, width):
+        wrapped = []
+        for line in self.translated_lines:
+            line = line.rstrip()
+            wrapped.append(self.layout_cache.wrap_sentence(line, width) if line else "")
+        return wrapped
+
+    def render(self, width):
+        rendered = self._renders.get(width)
+        if rendered is None:
+            rendered = "\n".join(self._wrapped_lines(width)).rstrip()
+            if self.section_separator:
+                rendered = rendered.replace("\n\n", f"\n{self.section_separator}\n")
+            self._renders[width] = rendered
+        return rendered
+
+    def offset_map(self, width):
+        """Correspondance texte source <-> braille rendu à `width` colonnes (voir `OffsetMap`)."""
+        offset_map = self._offset_maps.get(width)
+        if offset_map is not None:
+            return offset_map
+        source_lines = self.source_text.split("\n")
+        wrapped_lines = self._wrapped_lines(width)
+        anchors = []
+        rendered_start = 0
+        source_start = 0
+        for index, (line, wrapped) in enumerate(zip(self.translated_lines, wrapped_lines)):
+            source_line = source_lines[index] if index < len(source_lines) else ""
+            line = line.rstrip()
+            if line:
+                inner = OffsetMap()
+                for source_offset, braille_offset in self._line_anchors(index, source_line, line):
+                    inner.add(source_offset, braille_offset)
+                place, boundaries = self._segment_placer(line, self.layout_cache.breaks(line).wrap(width, SENTENCE))
+                points = [(place(braille_offset), source_offset) for source_offset, braille_offset in inner]
+                # Les coupures de lignes sont aussi des ancrages : l'interpolation ne les traverse jamais
+                for braille_offset, placed in boundaries:
+                    points.append((placed, inner.text_offset(braille_offset)))
+                for placed, source_offset in sorted(points):
+                    anchors.append((source_start + source_offset, rendered_start + placed))
+            else:
+                anchors.append((source_start, rendered_start))
+            rendered_start += len(wrapped) + 1
+            source_start += len(source_line) + 1
+
+        rendered = self.render(width)
+        # Chaque "\n\n" remplacé par le séparateur de sections décale la suite d'un caractère
+        insertions = []
+        if self.section_separator:
+            joined = "\n".join(wrapped_lines).rstrip()
+            insertions = [match.start() + 1 for match in re.finditer("\n\n", joined)]
+        offset_map = OffsetMap()
+        for source_offset, braille_offset in anchors:
+            braille_offset += bisect_right(insertions, braille_offset)
+            offset_map.add(source_offset, min(braille_offset, len(rendered)))
+        offset_map.add(len(self.source_text), len(rendered))
+        self._offset_maps[width] = offset_map
+        return offset_map
+
+    @staticmethod
+    def _segment_placer(line, segments):
+        """
+        Renvoie la fonction qui place une position de la ligne traduite dans la ligne
+        mise en page, et les couples (position traduite, position placée) du premier et
+        du dernier caractère de chaque segment.
+        """
+        starts = []
+        placed_starts = []
+        boundaries = []
+        cursor = 0
+        placed = 0
+        for segment in segments:
+            cursor = line.find(segment, cursor) if segment else cursor
+            starts.append(cursor)
+            placed_starts.append(placed)
+            if segment:
+                boundaries.append((cursor, placed))
+                boundaries.append((cursor + len(segment) - 1, placed + len(segment) - 1))
+            cursor += len(segment)
+            placed += len(segment) + 1
+
+        def place(offset):
+            index = max(0, bisect_right(starts, offset) - 1)
+            return placed_starts[index] + max(0, min(offset - starts[index], len(segments[index])))
+
+        return place, boundaries
+
+    def _line_anchors(self, index, source_line, line):
+        """Ancrages (position source, position traduite) d'une ligne, relatifs à son début."""
+        anchors = [(0, 0)]
+        positions = self.input_positions[index] if self.input_positions and index < len(self.input_positions) else None
+        if positions:
+            for braille_offset, source_offset in enumerate(positions[:len(line)]):
+                anchors.append((min(source_offset, len(source_line)), braille_offset))
+        elif self.word_aligned:
+            source_words = list(_WORD_RE.finditer(source_line))
+            braille_words = list(_WORD_RE.finditer(line))
+            if len(source_words) == len(braille_words):
+                for source_word, braille_word in zip(source_words, braille_words):
+                    anchors.append((source_word.start(), braille_word.start()))
+                    anchors.append((source_word.end(), braille_word.end()))
+        anchors.append((len(source_line), len(line)))
+        return anchors
+
+
+def paragraph_chunks(lines, max_chars=4000):
+    """
+    Regroupe un itérable de lignes en blocs d'environ `max_chars` caractères, sans
+    jamais couper une ligne. Passé `max_chars`, le bloc est fermé à la prochaine ligne
+    vide (fin de paragraphe), ou au plus tard à deux fois `max_chars`.
+    """
+    chunk = []
+    size = 0
+    for line in lines:
+        chunk.append(line)
+        size += len(line) + 1
+        if size >= 2 * max_chars or (size >= max_chars and not line.strip()):
+            yield chunk
+            chunk = []
+            size = 0
+    if chunk:
+        yield chunk
+
+
+class StreamingRender:
+    """
+    Mise en page au fil de l'eau des lignes traduites d'un document, bloc par bloc.
+
+    La concaténation des morceaux renvoyés par `feed` est exactement
+    `TranslatedDocument.render(width)` pour les mêmes lignes : les lignes vides et
+    les espaces de fin sont retenus jusqu'à la ligne non vide suivante, si bien que
+    chaque morceau finit sur un caractère visible et que le séparateur de sections
+    (deux retours à la ligne) s'applique morceau par morceau.
+
+    `started` et `held` reprennent le rendu au milieu d'un document : `started` si des
+    lignes précèdent, `held` les retours à la ligne retenus après la dernière ligne
+    non vide.
+    """
+
+    def __init__(self, layout_cache, width, section_separator="\u28CD", started=False, held=""):
+        self.layout_cache = layout_cache
+        self.width = width
+        self.section_separator = section_separator
+        self.translated_lines = []
+        self._held = held
+        self._started = started
+
+    def feed(self, translated_lines):
+        """Ajoute les lignes traduites suivantes et renvoie le morceau de rendu prêt à afficher."""
+        self.translated_lines.extend(translated_lines)
+        parts = []
+        for line in translated_lines:
+            line = line.rstrip()
+            wrapped = self.layout_cache.wrap_sentence(line, self.width) if line else ""
+            if self._started:
+                self._held += "\n"
+            self._started = True
+            content = wrapped.rstrip()
+            if not content:
+                self._held += wrapped
+                continue
+            parts.append(self._held + content)
+            self._held = wrapped[len(content):]
+        piece = "".join(parts)
+        if self.section_separator:
+            piece = piece.replace("\n\n", f"\n{self.section_separator}\n")
+        return piece
+
+
+class ChunkedRender:
+    """
+    Mise en page de blocs de lignes traduits dans le désordre (voir `paragraph_chunks`).
+
+    L'état de rendu au début de chaque bloc (lignes vides retenues) se déduit du texte
+    source, les lignes vides du texte donnant des lignes vides en braille : chaque bloc
+    est mis en page dès sa traduction et `place` indique où l'insérer parmi les blocs
+    déjà placés. Une fois tous les blocs placés, `text()` est le rendu du document
+    entier (à comparer à `TranslatedDocument.render` si une ligne non vide a donné une
+    traduction vide).
+    """
+
+    def __init__(self, layout_cache, width, chunks, section_separator="\u28CD"):
+        self.layout_cache = layout_cache
+        self.width = width
+        self.section_separator = section_separator
+        self.chunks = chunks
+        self.starts = []  # indice de la première ligne de chaque bloc
+        self._states = []
+        line_count = 0
+        last_content = None  # indice de la dernière ligne non vide
+        for chunk in chunks:
+            self.starts.append(line_count)
+            if not line_count:
+                self._states.append((False, ""))
+            else:
+                held = line_count - 1 - (last_content if last_content is not None else 0)
+                self._states.append((True, "\n" * held))
+            for offset, line in enumerate(chunk):
+                if line.strip():
+                    last_content = line_count + offset
+            line_count += len(chunk)
+        self.line_count = line_count
+        self._pieces = [None] * len(chunks)
+        self._translations = [None] * len(chunks)
+
+    def chunks_between(self, first_line, last_line):
+        """Indices des blocs qui recouvrent les lignes `first_line` à `last_line` (incluses)."""
+        first = max(0, bisect_right(self.starts, first_line) - 1)
+        last = bisect_right(self.starts, last_line)
+        return list(range(first, min(last, len(self.chunks))))
+
+    def place(self, index, translated_lines):
+        """Met en page le bloc `index` ; renvoie (position d'insertion dans le rendu, morceau)."""
+        started, held = self._states[index]
+        render = StreamingRender(self.layout_cache, self.width, self.section_separator, started, held)
+        piece = render.feed(translated_lines)
+        self._pieces[index] = piece
+        self._translations[index] = translated_lines
+        position = sum(len(placed) for placed in self._pieces[:index] if placed)
+        return position, piece
+
+    @property
+    def complete(self):
+        return all(piece is not None for piece in self._pieces)
+
+    @property
+    def translated_lines(self):
+        """Lignes traduites du document, dans l'ordre (tous les blocs doivent être placés)."""
+        return [line for lines in self._translations for line in lines]
+
+    def text(self):
+        return "".join(piece or "" for piece in self._pieces)
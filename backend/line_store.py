@@ -0,0 +1,126 @@
+from array import array
+from bisect import bisect_right
+
+
+def line_rows(length, width):
+    """Rangées occupées à l'écran par une ligne de `length` caractères (une au moins)."""
+    return max(1, -(-length // width))
+
+
+class LineStore:
+    """
+    Texte en lecture seule découpé en lignes, sans un objet Python par ligne.
+
+    Le texte est gardé en une seule chaîne et l'index ne contient que la position de
+    début de chaque ligne (`array` d'entiers, 8 octets par ligne) : une page se lit à
+    la demande par `lines(début, fin)`. `append` prolonge le texte (conversion
+    affichée bloc par bloc) sans réindexer les lignes existantes.
+    """
+
+    __slots__ = ("_text", "_starts")
+
+    def __init__(self, text=""):
+        self._text = ""
+        self._starts = array("q", [0])
+        self.append(text)
+
+    @classmethod
+    def from_file(cls, file_path, encoding="utf-8"):
+        with open(file_path, "r", encoding=encoding, errors="replace") as f:
+            return cls(f.read())
+
+    def append(self, text):
+        """Ajoute `text` à la fin (la dernière ligne se prolonge jusqu'au premier retour à la ligne)."""
+        if not text:
+            return
+        base = len(self._text)
+        self._text += text
+        position = text.find("\n")
+        while position != -1:
+            self._starts.append(base + position + 1)
+            position = text.find("\n", position + 1)
+
+    @property
+    def line_count(self):
+        return len(self._starts)
+
+    def __len__(self):
+        """Nombre de caractères du texte."""
+        return len(self._text)
+
+    def line_start(self, index):
+        """Position du premier caractère de la ligne `index`."""
+        return self._starts[index]
+
+    def _line_end(self, index):
+        return self._starts[index + 1] - 1 if index + 1 < len(self._starts) else len(self._text)
+
+    def line(self, index):
+        return self._text[self._starts[index]:self._line_end(index)]
+
+    def lines(self, start, stop):
+        """Lignes `start` à `stop` (exclue)."""
+        stop = min(stop, len(self._starts))
+        if start >= stop:
+            return []
+        return self._text[self._starts[start]:self._line_end(stop - 1)].split("\n")
+
+    def line_lengths(self):
+        """Longueur (en caractères) de chaque ligne, dans l'ordre."""
+        starts = self._starts
+        for index in range(len(starts) - 1):
+            yield starts[index + 1] - starts[index] - 1
+        yield len(self._text) - starts[-1]
+
+    def text(self):
+        return self._text
+
+
+class PageIndex:
+    """
+    Découpage d'un document en pages, calculé sur les seules longueurs de lignes.
+
+    Une ligne de `n` caractères occupe `ceil(n / width)` rangées à l'écran (une au
+    moins) ; une page reçoit des lignes entières tant qu'elle ne dépasse pas
+    `rows_per_page` rangées (une ligne plus longue qu'une page forme une page à elle
+    seule). Le nombre de pages et la page d'une ligne se lisent dans l'index, sans
+    mise en page Qt.
+    """
+
+    __slots__ = ("rows_per_page", "width", "line_count", "_starts")
+
+    def __init__(self, line_lengths, rows_per_page=29, width=33):
+        self.rows_per_page = max(1, rows_per_page)
+        self.width = max(1, width)
+        self._starts = array("q", [0])  # première ligne de chaque page
+        rows = 0
+        line_count = 0
+        for length in line_lengths:
+            length_rows = line_rows(length, self.width)
+            if rows and rows + length_rows > self.rows_per_page:
+                self._starts.append(line_count)
+                rows = 0
+            rows += length_rows
+            line_count += 1
+        self.line_count = max(1, line_count)
+
+    @property
+    def page_count(self):
+        return len(self._starts)
+
+    def page_lines(self, page):
+        """(première ligne, ligne suivant la dernière) de la page `page`."""
+        start = self._starts[page]
+        stop = self._starts[page + 1] if page + 1 < len(self._starts) else self.line_count
+        return start, stop
+
+    def page_of_line(self, line):
+        return max(0, bisect_right(self._starts, line) - 1)
+
+    def shift(self, page, delta):
+        """Décale de `delta` lignes les pages qui suivent `page` (lignes ajoutées ou retirées dans `page`)."""
+        if not delta:
+            return
+        for index in range(page + 1, len(self._starts)):
+            self._starts[index] += delta
+        self.line_count += delta
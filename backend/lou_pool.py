@@ -0,0 +1,393 @@
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+import logging
+
+
+class LouPoolError(Exception):
+    """Erreur d'un processus lou_translate persistant (mort, muet ou indisponible)."""
+
+
+class LouWorker:
+    """
+    Processus lou_translate de longue durée, lié à une table et à un sens de conversion.
+
+    Les lignes sont envoyées sur stdin et les traductions lues ligne par ligne sur stdout.
+    Un thread lecteur vide stdout en continu pour que l'envoi d'un gros lot ne bloque
+    jamais sur un tuyau plein.
+    """
+
+    def __init__(self, cmd, response_timeout=10.0):
+        self.cmd = cmd
+        self.response_timeout = response_timeout
+        self.process = None
+        self._output = queue.Queue()
+        self._reader = None
+        self.last_used = time.monotonic()
+        self.requests_served = 0
+
+    def start(self):
+        self.process = subprocess.Popen(
+            self.cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
+        )
+        self._output = queue.Queue()
+        self._reader = threading.Thread(target=self._read_output, args=(self.process.stdout, self._output), daemon=True)
+        self._reader.start()
+        self.last_used = time.monotonic()
+
+    @staticmethod
+    def _read_output(stream, output):
+        try:
+            for line in stream:
+                output.put(line.rstrip("\r\n"))
+        except (OSError, ValueError):
+            pass
+        finally:
+            # None signale la fin du flux (processus terminé)
+            output.put(None)
+
+    def is_alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def translate(self, lines, timeout=None):
+        """Traduit une liste de lignes non vides et renvoie une ligne de sortie par ligne d'entrée."""
+        if not self.is_alive():
+            raise LouPoolError("Processus lou_translate arrêté")
+        timeout = self.response_timeout if timeout is None else timeout
+        try:
+            self.process.stdin.write("\n".join(lines) + "\n")
+            self.process.stdin.flush()
+        except (OSError, ValueError) as e:
+            raise LouPoolError(f"Écriture impossible vers lou_translate : {e}")
+
+        results = []
+        deadline = time.monotonic() + timeout
+        for _ in lines:
+            try:
+                line = self._output.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                raise LouPoolError("Délai de réponse de lou_translate dépassé")
+            if line is None:
+                raise LouPoolError("lou_translate s'est arrêté pendant la traduction")
+            results.append(line)
+        self.last_used = time.monotonic()
+        self.requests_served += 1
+        return results
+
+    def ping(self, timeout=None):
+        """Vérifie que le processus répond en traduisant une ligne courte."""
+        try:
+            return len(self.translate(["a"], timeout=timeout)) == 1
+        except LouPoolError:
+            return False
+
+    def stop(self):
+        if self.process is None:
+            return
+        try:
+            if self.process.stdin:
+                self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.terminate()
+            self.process.wait(timeout=2)
+        except Exception:
+            try:
+                self.process.kill()
+            except Exception:
+                pass
+        self.process = None
+
+
+class _WorkerGroup:
+    """Processus disponibles et occupés pour une clé (table, sens, mode majuscules)."""
+
+    def __init__(self, cmd):
+        self.cmd = cmd
+        self.idle = []
+        self.total = 0
+        self.busy = 0
+        self.waiting = 0
+        self.restarts = 0
+        # ready : un processus a répondu au sondage ; warming : préchauffage en cours
+        self.ready = False
+        self.warming = False
+        self.condition = threading.Condition()
+
+
+class LouTranslatePool:
+    """
+    Pool de processus lou_translate persistants, un groupe par (table, sens, mode majuscules).
+
+    - Les processus sont réutilisés d'un lot à l'autre : plus de démarrage ni de
+      recompilation de table à chaque appel.
+    - Un thread de maintenance vérifie l'état des processus, redémarre ceux qui sont
+      morts et arrête ceux qui sont inactifs au-delà de `min_workers`.
+    - Le pool grandit à la demande jusqu'à `max_workers` processus par groupe.
+
+    `translate` ne démarre jamais de processus lui-même : les démarrages (et le
+    sondage `ping`, limité à `probe_timeout`) ont lieu dans `warm` ou dans un thread
+    d'arrière-plan. Le premier lot d'un groupe qui n'a pas été préchauffé attend la
+    fin de ce préchauffage. Si lou_translate ne répond pas ligne par ligne (sortie
+    non vidée sur un tuyau), le pool se déclare indisponible dès le sondage :
+    `translate` lève alors LouPoolError et l'appelant revient au mode un processus
+    par lot.
+    """
+
+    def __init__(self, lou_path, tables_dir, min_workers=1, max_workers=4,
+                 idle_timeout=60.0, response_timeout=10.0, check_interval=5.0, probe_timeout=2.0):
+        self.lou_path = lou_path
+        self.tables_dir = tables_dir
+        self.min_workers = max(0, min_workers)
+        self.max_workers = max(1, max_workers)
+        self.idle_timeout = idle_timeout
+        self.response_timeout = response_timeout
+        self.check_interval = check_interval
+        self.probe_timeout = probe_timeout
+        self.available = bool(lou_path)
+        self._groups = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._maintenance_thread = None
+        # stdbuf force une sortie ligne par ligne lorsque lou_translate écrit dans un tuyau
+        self._line_buffer_prefix = ["stdbuf", "-oL"] if os.name != "nt" and shutil.which("stdbuf") else []
+
+    def _command(self, table_path, forward, capitalize):
+        cmd = self._line_buffer_prefix + [self.lou_path, "--forward" if forward else "--backward", table_path]
+        if forward and capitalize:
+            cmd.append("--caps-mode=uc")
+        cmd.extend(["--display-table", os.path.join(self.tables_dir, "unicode.dis")])
+        return cmd
+
+    def _group(self, table_path, forward, capitalize):
+        key = (os.path.normpath(table_path), bool(forward), bool(capitalize))
+        with self._lock:
+            group = self._groups.get(key)
+            if group is None:
+                group = _WorkerGroup(self._command(table_path, forward, capitalize))
+                self._groups[key] = group
+            self._ensure_maintenance_thread()
+        return group
+
+    def _ensure_maintenance_thread(self):
+        if self._maintenance_thread is None and not self._stop_event.is_set():
+            self._maintenance_thread = threading.Thread(target=self._maintenance_loop, daemon=True)
+            self._maintenance_thread.start()
+
+    def _spawn(self, group):
+        """Démarre un processus et vérifie qu'il répond (hors chemin critique uniquement)."""
+        worker = LouWorker(group.cmd, self.response_timeout)
+        try:
+            worker.start()
+        except OSError as e:
+            self._disable()
+            raise LouPoolError(f"Impossible de démarrer lou_translate : {e}")
+        if not worker.ping(timeout=self.probe_timeout):
+            worker.stop()
+            self._disable()
+            logging.warning("lou_translate ne répond pas en mode persistant, pool désactivé.")
+            raise LouPoolError("lou_translate ne répond pas en mode persistant")
+        return worker
+
+    def _disable(self):
+        """Déclare le pool indisponible et réveille les appelants en attente d'un processus."""
+        self.available = False
+        with self._lock:
+            groups = list(self._groups.values())
+        for group in groups:
+            with group.condition:
+                group.condition.notify_all()
+
+    def _grow(self, group):
+        """Ajoute en arrière-plan un processus au groupe (déjà compté dans `group.total`)."""
+        try:
+            worker = self._spawn(group)
+        except LouPoolError as e:
+            logging.error(f"Démarrage d'un processus lou_translate impossible : {str(e)}")
+            with group.condition:
+                group.total -= 1
+                group.condition.notify_all()
+            return
+        with group.condition:
+            group.idle.append(worker)
+            group.condition.notify()
+
+    def _acquire(self, group):
+        """
+        Prend un processus libre du groupe. S'il n'y en a pas, un processus est ajouté
+        en arrière-plan (jusqu'à `max_workers`) et l'appelant attend le premier libéré.
+        """
+        with group.condition:
+            while True:
+                if self._stop_event.is_set():
+                    raise LouPoolError("Pool lou_translate arrêté")
+                if not self.available:
+                    raise LouPoolError("Pool lou_translate indisponible")
+                if group.idle:
+                    worker = group.idle.pop()
+                    group.busy += 1
+                    return worker
+                if group.total < self.max_workers:
+                    group.total += 1
+                    threading.Thread(target=self._grow, args=(group,), daemon=True).start()
+                group.waiting += 1
+                group.condition.wait()
+                group.waiting -= 1
+
+    def _release(self, group, worker, healthy):
+        with group.condition:
+            group.busy -= 1
+            if healthy and worker.is_alive() and not self._stop_event.is_set():
+                group.idle.append(worker)
+            else:
+                worker.stop()
+                group.total -= 1
+            group.condition.notify()
+
+    def translate(self, lines, table_path, forward=True, capitalize=False):
+        """Traduit des lignes non vides via un processus persistant du groupe correspondant."""
+        if not self.available:
+            raise LouPoolError("Pool lou_translate indisponible")
+        if not lines:
+            return []
+        group = self._group(table_path, forward, capitalize)
+        if not group.ready:
+            self._wait_ready(group)
+        worker = self._acquire(group)
+        healthy = False
+        try:
+            results = worker.translate(lines)
+            healthy = True
+            return results
+        finally:
+            self._release(group, worker, healthy)
+
+    def warm(self, table_path, forward=True, capitalize=False):
+        """Démarre à l'avance les processus minimum d'un groupe, hors du chemin critique."""
+        if not self.available:
+            return
+        self._warm_group(self._group(table_path, forward, capitalize))
+
+    def _wait_ready(self, group):
+        """Lance le préchauffage du groupe en arrière-plan et attend qu'un processus ait répondu."""
+        with group.condition:
+            if not group.warming:
+                group.warming = True
+                threading.Thread(target=self._run_warm, args=(group,), daemon=True).start()
+            while not group.ready:
+                if self._stop_event.is_set() or not self.available or not group.warming:
+                    raise LouPoolError("Pool lou_translate indisponible")
+                group.condition.wait()
+
+    def _warm_group(self, group):
+        with group.condition:
+            if group.warming:
+                # Préchauffage déjà lancé (par `translate`) : attendre qu'il se termine
+                while group.warming:
+                    group.condition.wait()
+                return
+            group.warming = True
+        self._run_warm(group)
+
+    def _run_warm(self, group):
+        """Préchauffe le groupe ; `group.warming` a été mis à vrai par l'appelant."""
+        try:
+            self._top_up(group, max(self.min_workers, 1))
+        finally:
+            with group.condition:
+                group.warming = False
+                group.condition.notify_all()
+
+    def _top_up(self, group, target):
+        target = min(target, self.max_workers)
+        while self.available and not self._stop_event.is_set():
+            with group.condition:
+                if group.total >= target:
+                    return
+                group.total += 1
+            try:
+                worker = self._spawn(group)
+            except LouPoolError as e:
+                with group.condition:
+                    group.total -= 1
+                logging.error(f"Préchauffage lou_translate impossible : {str(e)}")
+                return
+            with group.condition:
+                group.idle.append(worker)
+                group.ready = True
+                group.condition.notify()
+
+    def _maintenance_loop(self):
+        while not self._stop_event.wait(self.check_interval):
+            try:
+                self.check_workers()
+            except Exception as e:
+                logging.error(f"Erreur de maintenance du pool lou_translate : {str(e)}")
+
+    def check_workers(self):
+        """Redémarre les processus morts et réduit les groupes inactifs à `min_workers`."""
+        now = time.monotonic()
+        with self._lock:
+            groups = list(self._groups.values())
+        for group in groups:
+            to_stop = []
+            with group.condition:
+                alive = []
+                for worker in group.idle:
+                    if not worker.is_alive():
+                        to_stop.append(worker)
+                        group.total -= 1
+                        group.restarts += 1
+                    else:
+                        alive.append(worker)
+                # Les plus anciens en tête : on arrête d'abord ceux qui dorment depuis longtemps
+                alive.sort(key=lambda w: w.last_used)
+                while alive and group.total > self.min_workers and now - alive[0].last_used > self.idle_timeout:
+                    to_stop.append(alive.pop(0))
+                    group.total -= 1
+                group.idle = alive
+            for worker in to_stop:
+                worker.stop()
+            if to_stop:
+                self._top_up(group, self.min_workers)
+
+    def stats(self):
+        """Renvoie l'état de chaque groupe : processus totaux, occupés, en attente et redémarrés."""
+        with self._lock:
+            items = list(self._groups.items())
+        stats = {}
+        for (table_path, forward, capitalize), group in items:
+            with group.condition:
+                stats[(os.path.basename(table_path), "forward" if forward else "backward", capitalize)] = {
+                    "total": group.total,
+                    "idle": len(group.idle),
+                    "busy": group.busy,
+                    "waiting": group.waiting,
+                    "restarts": group.restarts,
+                }
+        return stats
+
+    def shutdown(self):
+        self._stop_event.set()
+        with self._lock:
+            groups = list(self._groups.values())
+            self._groups.clear()
+        for group in groups:
+            with group.condition:
+                idle = group.idle
+                group.idle = []
+                group.condition.notify_all()
+            for worker in idle:
+                worker.stop()
@@ -0,0 +1,68 @@
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+class OffsetMap:
+    """
+    Correspondance entre positions du texte et positions du braille.
+
+    La table est une suite de points d'ancrage (position texte, position braille)
+    croissants dans les deux sens, stockés dans deux `array` d'entiers. Une recherche
+    dans un sens ou dans l'autre est une recherche dichotomique (O(log n)), suivie
+    d'une interpolation linéaire entre les deux ancrages qui l'encadrent. Lorsque
+    plusieurs ancrages tombent sur la position cherchée, `prefer_first` retient le
+    premier plutôt que le dernier : par défaut, une position du texte désigne le début
+    de sa traduction.
+    """
+
+    __slots__ = ("_text", "_braille")
+
+    def __init__(self):
+        self._text = array("q")
+        self._braille = array("q")
+
+    def add(self, text_offset, braille_offset):
+        """
+        Ajoute un ancrage. Un ancrage qui reculerait dans l'un des deux sens (réordonnancement
+        par liblouis, table arabe inversée) est ignoré : l'interpolation le remplace.
+        """
+        if self._text and (text_offset < self._text[-1] or braille_offset < self._braille[-1]):
+            return
+        self._text.append(text_offset)
+        self._braille.append(braille_offset)
+
+    def __len__(self):
+        return len(self._text)
+
+    def __iter__(self):
+        return zip(self._text, self._braille)
+
+    @property
+    def nbytes(self):
+        return self._text.itemsize * len(self._text) + self._braille.itemsize * len(self._braille)
+
+    @staticmethod
+    def _lookup(source, target, offset, prefer_first=False):
+        if not source:
+            return offset
+        if prefer_first:
+            index = bisect_left(source, offset)
+            if index < len(source) and source[index] == offset:
+                return target[index]
+        index = bisect_right(source, offset) - 1
+        if index < 0:
+            return target[0]
+        if index + 1 == len(source):
+            return target[index]
+        start, end = source[index], source[index + 1]
+        if end == start:
+            return target[index]
+        return target[index] + (offset - start) * (target[index + 1] - target[index]) // (end - start)
+
+    def braille_offset(self, text_offset, prefer_first=True):
+        """Position dans le braille correspondant à la position `text_offset` du texte."""
+        return self._lookup(self._text, self._braille, text_offset, prefer_first)
+
+    def text_offset(self, braille_offset, prefer_first=False):
+        """Position dans le texte correspondant à la position `braille_offset` du braille."""
+        return self._lookup(self._braille, self._text, braille_offset, prefer_first)
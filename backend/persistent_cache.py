@@ -0,0 +1,223 @@
+import os
+import sqlite3
+import threading
+import time
+import logging
+from pathlib import Path
+
+# Nombre maximal de paramètres par requête IN (limite historique de SQLite : 999)
+_MAX_QUERY_PARAMS = 500
+
+
+class PersistentTranslationCache:
+    """
+    Cache disque (SQLite) des traductions ligne par ligne, conservé d'un lancement à l'autre.
+
+    - Les entrées sont rangées par espace de noms : une empreinte du contenu des
+      tables (et inclusions), des surcharges personnalisées et du moteur. Une mise à
+      jour des tables change l'empreinte, les anciennes entrées ne sont plus lues
+      et finissent supprimées par le compactage.
+    - La base est en mode WAL avec un délai d'attente sur les verrous : plusieurs
+      instances de l'application peuvent la lire et l'écrire en même temps.
+    - Un thread de fond applique la taille maximale en supprimant les entrées les
+      moins récemment utilisées, puis libère l'espace du fichier.
+    - Une seule connexion, partagée par tous les threads (moteur, préchauffage,
+      compactage) sous un verrou, et fermée par `close`.
+
+    Toute erreur SQLite est journalisée et traitée comme un échec de cache : la
+    traduction ne dépend jamais de la disponibilité de la base.
+    """
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024, compaction_interval=300.0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.compaction_interval = compaction_interval
+        self.available = True
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+        self._lock = threading.RLock()  # connexion et compteurs
+        self._touched = set()
+        self._touched_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._compaction_thread = None
+        try:
+            Path(os.path.dirname(path) or ".").mkdir(parents=True, exist_ok=True)
+            self._create_tables()
+        except (sqlite3.Error, OSError) as e:
+            logging.error(f"Cache de traductions persistant indisponible ({path}) : {e}")
+            self.available = False
+            return
+        if compaction_interval:
+            self._compaction_thread = threading.Thread(target=self._compaction_loop, daemon=True)
+            self._compaction_thread.start()
+
+    def _connection(self):
+        """Connexion partagée ; à utiliser sous `self._lock`."""
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn = conn
+        return self._conn
+
+    def _create_tables(self):
+        with self._lock:
+            conn = self._connection()
+            # auto_vacuum doit être choisi avant la création de la première table
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            with conn:
+                conn.execute('''CREATE TABLE IF NOT EXISTS translations (
+                        namespace TEXT NOT NULL,
+                        forward INTEGER NOT NULL,
+                        capitalize INTEGER NOT NULL,
+                        source TEXT NOT NULL,
+                        output TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        last_used REAL NOT NULL,
+                        PRIMARY KEY (namespace, forward, capitalize, source)
+                    )''')
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations(last_used)")
+
+    def get_many(self, namespace, forward, capitalize, lines):
+        """Renvoie {ligne: traduction} pour les lignes présentes dans le cache."""
+        if not self.available or not lines:
+            return {}
+        found = {}
+        unique_lines = list(dict.fromkeys(lines))
+        with self._lock:
+            try:
+                conn = self._connection()
+                for start in range(0, len(unique_lines), _MAX_QUERY_PARAMS):
+                    chunk = unique_lines[start:start + _MAX_QUERY_PARAMS]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = conn.execute(
+                        f"SELECT source, output FROM translations "
+                        f"WHERE namespace = ? AND forward = ? AND capitalize = ? AND source IN ({placeholders})",
+                        (namespace, int(forward), int(capitalize), *chunk)
+                    )
+                    found.update(rows)
+            except sqlite3.Error as e:
+                logging.error(f"Lecture du cache de traductions impossible : {e}")
+                return {}
+            self.hits += len(found)
+            self.misses += len(unique_lines) - len(found)
+        if found:
+            # La date d'utilisation est mise à jour par lots lors du compactage
+            with self._touched_lock:
+                self._touched.update((namespace, int(forward), int(capitalize), line) for line in found)
+        return found
+
+    def put_many(self, namespace, forward, capitalize, items):
+        """Enregistre des couples (ligne, traduction)."""
+        if not self.available:
+            return
+        now = time.time()
+        rows = [
+            (namespace, int(forward), int(capitalize), line, output,
+             len(line.encode("utf-8")) + len(output.encode("utf-8")), now)
+            for line, output in items
+        ]
+        if not rows:
+            return
+        with self._lock:
+            try:
+                conn = self._connection()
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO translations "
+                        "(namespace, forward, capitalize, source, output, size, last_used) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        rows
+                    )
+            except sqlite3.Error as e:
+                logging.error(f"Écriture du cache de traductions impossible : {e}")
+
+    def _flush_touched(self, conn):
+        with self._touched_lock:
+            touched = self._touched
+            self._touched = set()
+        if touched:
+            now = time.time()
+            with conn:
+                conn.executemany(
+                    "UPDATE translations SET last_used = ? "
+                    "WHERE namespace = ? AND forward = ? AND capitalize = ? AND source = ?",
+                    [(now, *key) for key in touched]
+                )
+
+    def compact(self):
+        """Applique la taille maximale : supprime les entrées les moins récemment utilisées."""
+        if not self.available:
+            return
+        with self._lock:
+            self._compact()
+
+    def _compact(self):
+        try:
+            conn = self._connection()
+            self._flush_touched(conn)
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM translations").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            # On descend sous 90 % du budget pour ne pas compacter à chaque passage
+            to_free = total - int(self.max_bytes * 0.9)
+            freed = 0
+            count = 0
+            for (size,) in conn.execute("SELECT size FROM translations ORDER BY last_used"):
+                freed += size
+                count += 1
+                if freed >= to_free:
+                    break
+            with conn:
+                deleted = conn.execute(
+                    "DELETE FROM translations WHERE rowid IN "
+                    "(SELECT rowid FROM translations ORDER BY last_used LIMIT ?)",
+                    (count,)
+                ).rowcount
+            conn.execute("PRAGMA incremental_vacuum")
+            logging.info(f"Cache de traductions compacté : {deleted} entrées supprimées")
+        except sqlite3.Error as e:
+            logging.error(f"Compactage du cache de traductions impossible : {e}")
+
+    def _compaction_loop(self):
+        while not self._stop_event.wait(self.compaction_interval):
+            self.compact()
+
+    def stats(self):
+        with self._lock:
+            stats = {"available": self.available, "hits": self.hits, "misses": self.misses, "entries": 0, "bytes": 0}
+            if not self.available:
+                return stats
+            try:
+                entries, size = self._connection().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM translations"
+                ).fetchone()
+                stats.update(entries=entries, bytes=size)
+            except sqlite3.Error as e:
+                logging.error(f"Lecture des statistiques du cache impossible : {e}")
+            return stats
+
+    def clear(self):
+        if not self.available:
+            return
+        with self._lock:
+            try:
+                conn = self._connection()
+                with conn:
+                    conn.execute("DELETE FROM translations")
+                conn.execute("PRAGMA incremental_vacuum")
+            except sqlite3.Error as e:
+                logging.error(f"Vidage du cache de traductions impossible : {e}")
+
+    def close(self):
+        """Compacte une dernière fois et ferme la connexion ; le cache n'est plus utilisé ensuite."""
+        self._stop_event.set()
+        if self._compaction_thread is not None:
+            self._compaction_thread.join()
+        with self._lock:
+            if self.available:
+                self._compact()
+                self.available = False
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
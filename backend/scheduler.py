@@ -0,0 +1,210 @@
+import heapq
+import itertools
+import threading
+import weakref
+from concurrent.futures import Future
+
+# Classes de priorité (la plus petite valeur passe en premier)
+PRIORITY_INTERACTIVE = 0  # frappe au clavier, conversion en temps réel
+PRIORITY_VISIBLE = 1      # document affiché à l'écran
+PRIORITY_BACKGROUND = 2   # imports, conversions complètes, flux
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_VISIBLE: "visible",
+    PRIORITY_BACKGROUND: "background",
+}
+
+
+class CancelledConversion(Exception):
+    """Conversion abandonnée parce que son jeton a été annulé (texte modifié entre-temps)."""
+
+
+class CancellationToken:
+    """Jeton partagé par les tâches d'une même conversion ; l'annuler abandonne celles qui restent."""
+
+    __slots__ = ("_event",)
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise CancelledConversion("Conversion annulée")
+
+
+class _WorkItem:
+    __slots__ = ("future", "fn", "args", "kwargs", "priority", "token")
+
+    def __init__(self, future, fn, args, kwargs, priority, token):
+        self.future = future
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.token = token
+
+    def run(self):
+        if not self.future.set_running_or_notify_cancel():
+            return
+        try:
+            if self.token is not None:
+                self.token.raise_if_cancelled()
+            result = self.fn(*self.args, **self.kwargs)
+        except BaseException as e:
+            self.future.set_exception(e)
+        else:
+            self.future.set_result(result)
+
+
+class PriorityExecutor:
+    """
+    Pool de threads à file de priorité, compatible avec `ThreadPoolExecutor.submit`.
+
+    - Les tâches sont servies par classe de priorité (interactive, document visible,
+      arrière-plan), puis dans l'ordre de soumission.
+    - Une tâche dont le jeton est annulé est abandonnée sans être exécutée ; son
+      future est annulé.
+    - Une tâche soumise depuis un thread du pool est exécutée immédiatement dans ce
+      thread : une tâche qui attend ses sous-tâches ne peut pas bloquer le pool.
+    """
+
+    def __init__(self, max_workers=4, thread_name_prefix="braille-engine"):
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+        self._queue = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._threads = []
+        self._worker_idents = set()
+        self._idle = 0
+        self._shutdown = False
+        self._submitted = {priority: 0 for priority in PRIORITY_NAMES}
+        self._completed = {priority: 0 for priority in PRIORITY_NAMES}
+        self._cancelled = {priority: 0 for priority in PRIORITY_NAMES}
+
+    def submit(self, fn, *args, priority=PRIORITY_VISIBLE, token=None, **kwargs):
+        future = Future()
+        item = _WorkItem(future, fn, args, kwargs, priority, token)
+        if threading.get_ident() in self._worker_idents:
+            item.run()
+            return future
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("Impossible de soumettre une tâche après l'arrêt du pool")
+            self._submitted[priority] = self._submitted.get(priority, 0) + 1
+            heapq.heappush(self._queue, (priority, next(self._counter), item))
+            # Threads créés à la demande, jusqu'à max_workers
+            if self._idle < len(self._queue) and len(self._threads) < self.max_workers:
+                self._start_worker()
+            self._condition.notify()
+        return future
+
+    def _start_worker(self):
+        thread = threading.Thread(
+            target=self._worker,
+            name=f"{self.thread_name_prefix}-{len(self._threads)}",
+            daemon=True
+        )
+        self._threads.append(thread)
+        thread.start()
+
+    def _worker(self):
+        self._worker_idents.add(threading.get_ident())
+        while True:
+            with self._condition:
+                while not self._queue and not self._shutdown:
+                    self._idle += 1
+                    self._condition.wait()
+                    self._idle -= 1
+                if not self._queue:
+                    return
+                priority, _, item = heapq.heappop(self._queue)
+                if item.token is not None and item.token.cancelled:
+                    self._cancelled[priority] = self._cancelled.get(priority, 0) + 1
+                    item.future.cancel()
+                    continue
+            item.run()
+            with self._condition:
+                self._completed[priority] = self._completed.get(priority, 0) + 1
+
+    def cancel_pending(self, token):
+        """Retire de la file toutes les tâches encore en attente du jeton `token`."""
+        with self._condition:
+            kept = []
+            for entry in self._queue:
+                item = entry[2]
+                if item.token is token:
+                    self._cancelled[entry[0]] = self._cancelled.get(entry[0], 0) + 1
+                    item.future.cancel()
+                else:
+                    kept.append(entry)
+            if len(kept) != len(self._queue):
+                heapq.heapify(kept)
+                self._queue = kept
+
+    def stats(self):
+        """Profondeur de file et compteurs (soumises, terminées, annulées) par classe de priorité."""
+        with self._condition:
+            depth = {priority: 0 for priority in PRIORITY_NAMES}
+            for priority, _, _ in self._queue:
+                depth[priority] = depth.get(priority, 0) + 1
+            return {
+                PRIORITY_NAMES.get(priority, str(priority)): {
+                    "queued": depth.get(priority, 0),
+                    "submitted": self._submitted.get(priority, 0),
+                    "completed": self._completed.get(priority, 0),
+                    "cancelled": self._cancelled.get(priority, 0),
+                }
+                for priority in sorted(set(depth) | set(self._submitted))
+            }
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        with self._condition:
+            self._shutdown = True
+            if cancel_futures:
+                for _, _, item in self._queue:
+                    item.future.cancel()
+                self._queue = []
+            self._condition.notify_all()
+            threads = list(self._threads)
+        if wait:
+            for thread in threads:
+                if thread.ident != threading.get_ident():
+                    thread.join()
+
+
+class TokenRegistry:
+    """
+    Jeton courant de chaque propriétaire (onglet, document) : en demander un nouveau
+    annule le précédent, ce qui abandonne le travail devenu obsolète.
+    """
+
+    def __init__(self, executor):
+        self.executor = executor
+        self._tokens = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def new_token(self, owner):
+        token = CancellationToken()
+        with self._lock:
+            previous = self._tokens.get(owner)
+            self._tokens[owner] = token
+        if previous is not None:
+            previous.cancel()
+            self.executor.cancel_pending(previous)
+        return token
+
+    def cancel(self, owner):
+        with self._lock:
+            token = self._tokens.pop(owner, None)
+        if token is not None:
+            token.cancel()
+            self.executor.cancel_pending(token)
@@ -0,0 +1,231 @@
+import hashlib
+import os
+import re
+import threading
+import time
+import logging
+
+TABLE_EXTENSIONS = (".utb", ".ctb", ".tbl", ".dis", ".uti", ".cti")
+TRANSLATION_TABLE_EXTENSIONS = (".utb", ".ctb")
+
+_METADATA_RE = re.compile(r'^#([+-])\s*([\w-]+)\s*:\s*(.*?)\s*$')
+_INCLUDE_RE = re.compile(r'^\s*include\s+(\S+)', re.IGNORECASE)
+_GRADE_FROM_NAME_RE = re.compile(r'-g(\d)\b')
+
+
+def _path_key(path):
+    return os.path.normcase(os.path.normpath(path))
+
+
+class TableInfo:
+    """Métadonnées d'une table liblouis, relues uniquement si le fichier change (mtime)."""
+
+    __slots__ = ("filename", "path", "mtime", "metadata", "includes", "language", "grade", "display_name")
+
+    def __init__(self, filename, path, mtime):
+        self.filename = filename
+        self.path = path
+        self.mtime = mtime
+        self.metadata = {}
+        self.includes = []
+        self.language = None
+        self.grade = None
+        self.display_name = None
+
+    def __repr__(self):
+        return f"TableInfo({self.filename}, language={self.language}, grade={self.grade})"
+
+
+class TableRegistry:
+    """
+    Registre des tables braille du répertoire liblouis.
+
+    Le répertoire n'est listé qu'une fois (puis seulement si son mtime change), les
+    en-têtes de métadonnées (`#+language: fr`, `#+grade: 1`, ...) et les directives
+    `include` sont lus à la demande puis mis en cache par table et invalidés par mtime.
+    Les recherches chemin → nom affiché sont de simples accès dictionnaire.
+    """
+
+    def __init__(self, tables_dir, display_names=None, check_interval=1.0):
+        self.tables_dir = tables_dir
+        self.display_names = dict(display_names or {})
+        self.check_interval = check_interval
+        self._lock = threading.RLock()
+        self._files = {}
+        self._infos = {}
+        self._dir_mtime = None
+        self._last_check = 0.0
+        self._available = {}
+        self._name_by_path = {}
+        self._fully_indexed = False
+        self._by_language = {}
+        self._fingerprints = {}
+
+    def _stat_mtime(self, path):
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return None
+
+    def refresh(self, force=False):
+        """Relit la liste des tables si le répertoire a changé (vérifié au plus une fois par `check_interval`)."""
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._dir_mtime is not None and now - self._last_check < self.check_interval:
+                return
+            self._last_check = now
+            dir_mtime = self._stat_mtime(self.tables_dir)
+            if not force and dir_mtime is not None and dir_mtime == self._dir_mtime:
+                return
+            self._dir_mtime = dir_mtime
+            try:
+                filenames = [f for f in os.listdir(self.tables_dir) if f.endswith(TABLE_EXTENSIONS)]
+            except OSError as e:
+                logging.error(f"Impossible de lister les tables braille {self.tables_dir} : {str(e)}")
+                filenames = []
+            self._files = {f: os.path.join(self.tables_dir, f) for f in filenames}
+            self._infos = {f: info for f, info in self._infos.items() if f in self._files}
+            self._fully_indexed = False
+            self._by_language = {}
+            self._rebuild_display_index()
+
+    def _rebuild_display_index(self):
+        self._available = {
+            name: self._files[filename]
+            for name, filename in self.display_names.items()
+            if filename in self._files
+        }
+        self._name_by_path = {_path_key(path): name for name, path in self._available.items()}
+
+    def _parse(self, filename, path, mtime):
+        info = TableInfo(filename, path, mtime)
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    if line.startswith("#"):
+                        match = _METADATA_RE.match(line)
+                        if match:
+                            info.metadata.setdefault(match.group(2).lower(), match.group(3))
+                        continue
+                    match = _INCLUDE_RE.match(line)
+                    if match:
+                        info.includes.append(match.group(1))
+        except OSError as e:
+            logging.error(f"Impossible de lire la table {path} : {str(e)}")
+        language = info.metadata.get("language")
+        info.language = language.split("-")[0].lower() if language else filename.split("-")[0].lower()
+        grade = info.metadata.get("grade")
+        if grade is None:
+            if info.metadata.get("contraction") == "no" or "comp" in filename:
+                grade = "1"
+            else:
+                match = _GRADE_FROM_NAME_RE.search(filename)
+                grade = match.group(1) if match else None
+        info.grade = int(grade) if grade and grade.isdigit() else None
+        for name, display_filename in self.display_names.items():
+            if display_filename == filename:
+                info.display_name = name
+                break
+        return info
+
+    def get(self, filename):
+        """Renvoie les métadonnées d'une table (par nom de fichier), relues si le fichier a changé."""
+        self.refresh()
+        with self._lock:
+            path = self._files.get(filename)
+            if path is None:
+                return None
+            mtime = self._stat_mtime(path)
+            info = self._infos.get(filename)
+            if info is None or info.mtime != mtime:
+                info = self._parse(filename, path, mtime)
+                self._infos[filename] = info
+                self._fully_indexed = False
+            return info
+
+    def get_by_path(self, table_path):
+        return self.get(os.path.basename(table_path))
+
+    def available_tables(self):
+        """Tables connues de l'interface : {nom affiché: chemin complet}."""
+        self.refresh()
+        with self._lock:
+            return dict(self._available)
+
+    def name_for_path(self, table_path):
+        """Nom affiché d'une table à partir de son chemin (None si la table n'est pas exposée)."""
+        if not table_path:
+            return None
+        self.refresh()
+        return self._name_by_path.get(_path_key(table_path))
+
+    def _ensure_indexed(self):
+        self.refresh()
+        with self._lock:
+            if self._fully_indexed:
+                return
+            by_language = {}
+            for filename in self._files:
+                if not filename.endswith(TRANSLATION_TABLE_EXTENSIONS):
+                    continue
+                info = self.get(filename)
+                by_language.setdefault(info.language, []).append(info)
+            self._by_language = by_language
+            self._fully_indexed = True
+
+    def tables_for_language(self, language, grade=None):
+        """Tables de traduction d'une langue (code ISO), éventuellement filtrées par grade."""
+        self._ensure_indexed()
+        with self._lock:
+            infos = self._by_language.get(language.lower(), [])
+            if grade is not None:
+                infos = [info for info in infos if info.grade == grade]
+            return list(infos)
+
+    def languages(self):
+        self._ensure_indexed()
+        with self._lock:
+            return sorted(self._by_language)
+
+    def include_closure(self, table_path):
+        """Chemins de la table et de toutes les tables incluses, dans l'ordre de découverte."""
+        closure = []
+        seen = set()
+        pending = [os.path.basename(table_path)]
+        while pending:
+            filename = pending.pop(0)
+            if filename in seen:
+                continue
+            seen.add(filename)
+            info = self.get(filename)
+            if info is None:
+                continue
+            closure.append(info.path)
+            pending.extend(os.path.basename(include) for include in info.includes)
+        return closure
+
+    def fingerprint(self, table_path):
+        """
+        Empreinte SHA-256 du contenu de la table et de ses inclusions.
+
+        Recalculée seulement si l'un des fichiers change (mtime) : une mise à jour des
+        tables change l'empreinte et invalide donc les traductions mises en cache.
+        """
+        closure = self.include_closure(table_path)
+        state = tuple((path, self._stat_mtime(path)) for path in closure)
+        with self._lock:
+            cached = self._fingerprints.get(table_path)
+            if cached is not None and cached[0] == state:
+                return cached[1]
+        digest = hashlib.sha256()
+        for path, _ in state:
+            digest.update(os.path.basename(path).encode("utf-8"))
+            try:
+                with open(path, "rb") as f:
+                    digest.update(f.read())
+            except OSError as e:
+                logging.error(f"Impossible de lire la table {path} : {str(e)}")
+        fingerprint = digest.hexdigest()
+        with self._lock:
+            self._fingerprints[table_path] = (state, fingerprint)
+        return fingerprint
@@ -0,0 +1,97 @@
+import sys
+import threading
+from collections import OrderedDict
+
+# Surcoût approximatif d'une entrée (tuple de clé, nœud de l'OrderedDict)
+_ENTRY_OVERHEAD = 160
+
+
+class TranslationMemo:
+    """
+    Cache mémoire LRU des traductions ligne par ligne, borné en octets.
+
+    Les clés sont des tuples (table, sens, mode majuscules, version des tables
+    personnalisées, ligne) ; la valeur est la ligne traduite. Les compteurs de
+    succès et d'échecs permettent de suivre l'efficacité du cache.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _entry_size(key, value):
+        return sys.getsizeof(key[-1]) + sys.getsizeof(value) + _ENTRY_OVERHEAD
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def get_many(self, keys):
+        """Renvoie la valeur de chaque clé (None si absente), dans l'ordre des clés."""
+        results = []
+        with self._lock:
+            entries = self._entries
+            for key in keys:
+                value = entries.get(key)
+                if value is None:
+                    self.misses += 1
+                else:
+                    entries.move_to_end(key)
+                    self.hits += 1
+                results.append(value)
+        return results
+
+    def put(self, key, value):
+        self.put_many(((key, value),))
+
+    def put_many(self, items):
+        if self.max_bytes <= 0:
+            return
+        with self._lock:
+            entries = self._entries
+            for key, value in items:
+                size = self._entry_size(key, value)
+                if size > self.max_bytes:
+                    continue
+                previous = entries.pop(key, None)
+                if previous is not None:
+                    self._bytes -= self._entry_size(key, previous)
+                entries[key] = value
+                self._bytes += size
+            while self._bytes > self.max_bytes and entries:
+                old_key, old_value = entries.popitem(last=False)
+                self._bytes -= self._entry_size(old_key, old_value)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
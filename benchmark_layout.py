@@ -0,0 +1,84 @@
+"""
+Mesure du débit du module de mise en page (backend/layout.py) sur des textes de
+plusieurs mégaoctets.
+
+    python benchmark_layout.py [--size-mb 4] [--widths 20,33,80]
+"""
+import argparse
+import random
+import time
+
+import backend.layout as layout
+
+WORDS = [
+    "le", "braille", "est", "un", "système", "d'écriture", "tactile", "à", "points",
+    "saillants", "conçu", "pour", "les", "personnes", "aveugles", "ou", "malvoyantes.",
+    "⠃⠗⠁⠊⠇⠇⠑", "anticonstitutionnellement", "العربية",
+]
+
+
+def build_text(size_bytes, seed=42):
+    rng = random.Random(seed)
+    parts = []
+    size = 0
+    while size < size_bytes:
+        words = [rng.choice(WORDS) for _ in range(rng.randint(5, 60))]
+        paragraph = " ".join(words) + ("\n\n" if rng.random() < 0.2 else "\n")
+        parts.append(paragraph)
+        size += len(paragraph.encode("utf-8"))
+    return "".join(parts)
+
+
+def measure(label, func, text, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    megabytes = len(text.encode("utf-8")) / (1024 * 1024)
+    print(f"{label:<45} {best * 1000:9.1f} ms  {megabytes / best:8.1f} Mo/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=float, default=4.0)
+    parser.add_argument("--widths", default="20,33,80")
+    args = parser.parse_args()
+
+    text = build_text(int(args.size_mb * 1024 * 1024))
+    widths = [int(w) for w in args.widths.split(",")]
+    print(f"Texte : {len(text.encode('utf-8')) / (1024 * 1024):.1f} Mo, {text.count(chr(10))} lignes")
+    print(f"numpy : {'disponible' if layout.np is not None else 'absent'}\n")
+
+    threshold = layout.NUMPY_TOKENIZE_THRESHOLD
+    layout.NUMPY_TOKENIZE_THRESHOLD = float("inf")
+    measure("tokenize (expression régulière)", lambda: layout.tokenize(text), text)
+    if layout.np is not None:
+        layout.NUMPY_TOKENIZE_THRESHOLD = 0
+        measure("tokenize (numpy)", lambda: layout.tokenize(text), text)
+    layout.NUMPY_TOKENIZE_THRESHOLD = threshold
+
+    one_line = text.replace("\n", " ")
+    for width in widths:
+        measure(f"break_tokens, ligne unique (largeur {width})",
+                lambda: layout.break_tokens(layout.tokenize(one_line), width), one_line)
+        measure(f"break_spans, ligne unique (largeur {width})",
+                lambda: layout.break_spans(one_line, width), one_line)
+
+    for width in widths:
+        measure(f"wrap_sentence, cache froid (largeur {width})",
+                lambda: layout.LayoutCache(max_lines=1 << 20).wrap_sentence(text, width), text)
+    cache = layout.LayoutCache(max_lines=1 << 20)
+    cache.wrap_sentence(text, widths[0])
+    for width in widths[1:]:
+        measure(f"wrap_sentence, jetons en cache (largeur {width})",
+                lambda: cache.wrap_sentence(text, width), text, repeat=1)
+    for width in widths:
+        measure(f"wrap_braille (largeur {width})",
+                lambda: layout.LayoutCache(max_lines=1 << 20).wrap_braille(text, width), text)
+        measure(f"wrap_stream (largeur {width})", lambda: layout.wrap_stream(text, width), text)
+        measure(f"fill_words (largeur {width})", lambda: layout.fill_words(text, width), text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+from PyQt5.QtWidgets import QAbstractScrollArea
+from PyQt5.QtCore import Qt, QEvent, QPointF, QRectF
+from PyQt5.QtGui import QPainter, QPixmap, QFont, QFontMetricsF, QColor, QPalette
+import logging
+
+BRAILLE_BASE = 0x2800
+BRAILLE_CELLS = 256
+ATLAS_COLUMNS = 16
+
+# Position (colonne, rangée) de chaque point dans la cellule, dans l'ordre des bits
+# Unicode : points 1 2 3 4 5 6 puis 7 8
+DOT_POSITIONS = ((0, 0), (0, 1), (0, 2), (1, 0), (1, 1), (1, 2), (0, 3), (1, 3))
+
+
+class GlyphAtlas:
+    """
+    Les 256 cellules braille (U+2800 à U+28FF) dessinées une fois pour toutes dans
+    une seule image, pour une police et une couleur données.
+
+    Toutes les cellules ont la même taille (`cell_width` x `cell_height`) : afficher
+    un caractère revient à recopier un rectangle de l'atlas. En mode `dot_preview`,
+    chaque cellule montre ses huit emplacements de points (pleins ou vides) au lieu
+    du glyphe de la police. Les autres caractères (texte non traduit) sont dessinés
+    à la demande et gardés à part.
+    """
+
+    def __init__(self, font, color, dot_preview=False, pixel_ratio=1.0):
+        self.font = QFont(font)
+        self.color = QColor(color)
+        self.dot_preview = dot_preview
+        self.pixel_ratio = max(1.0, pixel_ratio)
+        metrics = QFontMetricsF(self.font)
+        self.cell_width = max(1.0, metrics.horizontalAdvance(chr(BRAILLE_BASE + 0xFF)))
+        self.cell_height = max(1.0, metrics.height())
+        self._ascent = metrics.ascent()
+        self._others = {}  # caractère -> image d'une cellule
+        rows = BRAILLE_CELLS // ATLAS_COLUMNS
+        self.pixmap = self._new_pixmap(ATLAS_COLUMNS * self.cell_width, rows * self.cell_height)
+        painter = QPainter(self.pixmap)
+        try:
+            self._prepare(painter)
+            for cell in range(BRAILLE_CELLS):
+                x, y = (cell % ATLAS_COLUMNS) * self.cell_width, (cell // ATLAS_COLUMNS) * self.cell_height
+                if self.dot_preview:
+                    self._draw_dots(painter, x, y, cell)
+                else:
+                    painter.drawText(QPointF(x, y + self._ascent), chr(BRAILLE_BASE + cell))
+        finally:
+            painter.end()
+
+    def _new_pixmap(self, width, height):
+        pixmap = QPixmap(int(width * self.pixel_ratio + 0.5), int(height * self.pixel_ratio + 0.5))
+        pixmap.fill(Qt.transparent)
+        return pixmap
+
+    def _prepare(self, painter):
+        painter.scale(self.pixel_ratio, self.pixel_ratio)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        painter.setFont(self.font)
+        painter.setPen(self.color)
+
+    def _draw_dots(self, painter, x, y, cell):
+        """Huit emplacements de points : disque plein si le point est levé, cercle sinon."""
+        # Marge autour des points pour séparer les cellules voisines
+        margin_x, margin_y = self.cell_width * 0.15, self.cell_height * 0.1
+        step_x = (self.cell_width - 2 * margin_x) / 2
+        step_y = (self.cell_height - 2 * margin_y) / 4
+        radius = max(1.0, min(step_x, step_y) * 0.3)
+        for bit, (column, row) in enumerate(DOT_POSITIONS):
+            center = QPointF(x + margin_x + step_x * (column + 0.5), y + margin_y + step_y * (row + 0.5))
+            if cell & (1 << bit):
+                painter.setBrush(self.color)
+                painter.drawEllipse(center, radius, radius)
+            else:
+                painter.setBrush(Qt.NoBrush)
+                painter.drawEllipse(center, radius * 0.4, radius * 0.4)
+
+    def source(self, char):
+        """(image, rectangle source en pixels) du caractère `char`, ou None s'il est vide."""
+        code = ord(char)
+        if BRAILLE_BASE <= code < BRAILLE_BASE + BRAILLE_CELLS:
+            cell = code - BRAILLE_BASE
+            if cell == 0 and not self.dot_preview:
+                return None
+            ratio = self.pixel_ratio
+            return self.pixmap, QRectF(
+                (cell % ATLAS_COLUMNS) * self.cell_width * ratio,
+                (cell // ATLAS_COLUMNS) * self.cell_height * ratio,
+                self.cell_width * ratio,
+                self.cell_height * ratio,
+            )
+        if char.isspace():
+            return None
+        pixmap = self._others.get(char)
+        if pixmap is None:
+            pixmap = self._new_pixmap(self.cell_width, self.cell_height)
+            painter = QPainter(pixmap)
+            try:
+                self._prepare(painter)
+                painter.drawText(QPointF(0, self._ascent), char)
+            finally:
+                painter.end()
+            self._others[char] = pixmap
+        return pixmap, QRectF(pixmap.rect())
+
+
+class TextDocumentLines:
+    """Accès par lignes (comme `LineStore`) aux blocs d'un `QTextDocument`."""
+
+    def __init__(self, document):
+        self.document = document
+
+    @property
+    def line_count(self):
+        return self.document.blockCount()
+
+    def lines(self, start, stop):
+        stop = min(stop, self.document.blockCount())
+        result = []
+        block = self.document.findBlockByNumber(start) if start < stop else None
+        while block is not None and block.isValid() and len(result) < stop - start:
+            result.append(block.text())
+            block = block.next()
+        return result
+
+
+class BrailleCanvas(QAbstractScrollArea):
+    """
+    Affichage en lecture seule d'un texte braille, sans mise en page Qt.
+
+    Chaque caractère occupe une cellule de l'atlas (`GlyphAtlas`) ; seules les lignes
+    visibles sont lues dans la source (`LineStore`, `DocumentModel` ou un
+    `QTextDocument` via `set_document`) et recopiées depuis l'atlas. Un changement
+    de police ou de zoom ne redessine que les 256 cellules de l'atlas.
+    """
+
+    def __init__(self, font=None, dot_preview=False, parent=None):
+        super().__init__(parent)
+        self.source = None
+        self._document = None
+        self._font = QFont(font) if font is not None else QFont(self.font())
+        self._dot_preview = dot_preview
+        self._atlas = None
+        self._max_columns = 0  # ligne la plus longue déjà affichée (défilement horizontal)
+        self.verticalScrollBar().setSingleStep(1)
+        self.horizontalScrollBar().setSingleStep(1)
+        self.verticalScrollBar().valueChanged.connect(self.viewport().update)
+        self.horizontalScrollBar().valueChanged.connect(self.viewport().update)
+
+    @property
+    def atlas(self):
+        if self._atlas is None:
+            self._atlas = GlyphAtlas(
+                self._font,
+                self.palette().color(QPalette.Text),
+                self._dot_preview,
+                self.devicePixelRatioF(),
+            )
+        return self._atlas
+
+    @property
+    def glyph_font(self):
+        return QFont(self._font)
+
+    def set_source(self, source):
+        """Affiche `source` (objet avec `line_count` et `lines(début, fin)`)."""
+        if self._document is not None:
+            try:
+                self._document.contentsChanged.disconnect(self.refresh)
+            except TypeError:
+                pass
+            self._document = None
+        self.source = source
+        self._max_columns = 0
+        self.refresh()
+
+    def set_document(self, document):
+        """Affiche les blocs de `document` et suit ses modifications."""
+        self.set_source(TextDocumentLines(document))
+        self._document = document
+        # `contentsChanged` (contrairement à `contentsChange`) est émis même sans mise en page
+        document.contentsChanged.connect(self.refresh)
+
+    def set_font(self, font):
+        """Change la police (ou sa taille pour le zoom) : seul l'atlas est redessiné."""
+        self._font = QFont(font)
+        self._atlas = None
+        self.refresh()
+
+    def set_dot_preview(self, enabled):
+        if enabled != self._dot_preview:
+            self._dot_preview = enabled
+            self._atlas = None
+            self.viewport().update()
+
+    def refresh(self):
+        """Recalcule les barres de défilement et redessine la zone visible."""
+        atlas = self.atlas
+        line_count = self.source.line_count if self.source is not None else 0
+        rows = max(1, int(self.viewport().height() // atlas.cell_height))
+        columns = max(1, int(self.viewport().width() // atlas.cell_width))
+        vertical = self.verticalScrollBar()
+        vertical.setPageStep(rows)
+        vertical.setRange(0, max(0, line_count - rows))
+        horizontal = self.horizontalScrollBar()
+        horizontal.setPageStep(columns)
+        horizontal.setRange(0, max(0, self._max_columns - columns))
+        self.viewport().update()
+
+    def paintEvent(self, event):
+        if self.source is None:
+            return
+        try:
+            atlas = self.atlas
+            first_line = self.verticalScrollBar().value()
+            first_column = self.horizontalScrollBar().value()
+            rows = int(self.viewport().height() // atlas.cell_height) + 1
+            columns = int(self.viewport().width() // atlas.cell_width) + 1
+            scale = 1.0 / atlas.pixel_ratio
+            half_width, half_height = atlas.cell_width / 2, atlas.cell_height / 2
+
+            cells = []  # fragments recopiés depuis l'atlas en un seul appel
+            others = []
+            longest = self._max_columns
+            for row, line in enumerate(self.source.lines(first_line, first_line + rows)):
+                longest = max(longest, len(line))
+                y = row * atlas.cell_height
+                for column, char in enumerate(line[first_column:first_column + columns]):
+                    source = atlas.source(char)
+                    if source is None:
+                        continue
+                    pixmap, rect = source
+                    position = QPointF(column * atlas.cell_width + half_width, y + half_height)
+                    fragment = QPainter.PixmapFragment.create(position, rect, scale, scale)
+                    if pixmap is atlas.pixmap:
+                        cells.append(fragment)
+                    else:
+                        others.append((fragment, pixmap))
+
+            painter = QPainter(self.viewport())
+            try:
+                if cells:
+                    painter.drawPixmapFragments(cells, atlas.pixmap)
+                for fragment, pixmap in others:
+                    painter.drawPixmapFragments([fragment], pixmap)
+            finally:
+                painter.end()
+
+            if longest > self._max_columns:
+                self._max_columns = longest
+                horizontal = self.horizontalScrollBar()
+                horizontal.setRange(0, max(0, longest - horizontal.pageStep()))
+        except Exception as e:
+            logging.error(f"Erreur lors de l'affichage du braille: {str(e)}")
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.refresh()
+
+    def changeEvent(self, event):
+        # Couleur du texte (mode sombre) ou écran (densité de pixels) changés : atlas à redessiner
+        if event.type() in (QEvent.PaletteChange, QEvent.StyleChange):
+            self._atlas = None
+            self.viewport().update()
+        super().changeEvent(event)
@@ -1,43 +1,71 @@
 from PyQt5.QtWidgets import QWidget, QHBoxLayout, QTextEdit, QScrollArea, QProgressDialog
 from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal
-from PyQt5.QtGui import QFont, QTextOption
+from PyQt5.QtGui import QFont, QTextOption, QTextCursor
 import logging
+from backend.config import PAGED_VIEW_MIN_CHARS
+from backend.document_model import DocumentModel
+from backend.line_store import LineStore
+from backend.scheduler import CancelledConversion, PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+from frontend.paged_viewer import PagedViewer
 
 class ConversionWorker(QThread):
-    """Thread de travail pour la conversion asynchrone."""
+    """Thread de travail pour la conversion asynchrone, paragraphe par paragraphe."""
     conversion_done = pyqtSignal(str, str)
+    chunk_converted = pyqtSignal(str)
     progress_updated = pyqtSignal(int)
 
-    def __init__(self, text, braille_engine, table, line_width, chunk_size=1000):
+    def __init__(self, text, braille_engine, table, line_width, chunk_size=1000, token=None):
         super().__init__()
         self.text = text
         self.braille_engine = braille_engine
         self.table = table
         self.line_width = line_width
         self.chunk_size = chunk_size
+        # Annulé dès que le texte change : le reste de la conversion est abandonné
+        self.token = token
+        # Une traduction par paragraphe : point de départ des mises à jour incrémentales
+        self.lines = []
+        self.line_outputs = []
 
     def run(self):
         try:
-            total_chunks = (len(self.text) + self.chunk_size - 1) // self.chunk_size
-            result_text = []
+            lines = self.text.split('\n')
             result_braille = []
+            converted = 0
+            next_report = self.chunk_size
+            reported = 0  # lignes déjà envoyées à l'affichage
 
-            for i in range(0, len(self.text), self.chunk_size):
-                chunk = self.text[i:i + self.chunk_size]
-                formatted_chunk = self.braille_engine.wrap_text_by_sentence(chunk, self.line_width)
-                braille_chunk = self.braille_engine.to_braille(formatted_chunk, self.table, self.line_width)
-                
-                result_text.append(formatted_chunk)
-                result_braille.append(braille_chunk)
-                
-                progress = int((i + len(chunk)) / len(self.text) * 100)
-                self.progress_updated.emit(progress)
-
-            self.conversion_done.emit('\n'.join(result_text), '\n'.join(result_braille))
+            stream = self.braille_engine.to_braille_stream(
+                lines, self.table, self.line_width, priority=PRIORITY_BACKGROUND, token=self.token
+            )
+            for line, braille_line in zip(lines, stream):
+                result_braille.append(braille_line)
+                converted += len(line) + 1
+                if converted >= next_report:
+                    # Les lignes traduites depuis le dernier envoi sont affichées sans attendre la fin
+                    self.chunk_converted.emit(self._chunk_text(result_braille, reported))
+                    reported = len(result_braille)
+                    self.progress_updated.emit(min(100, int(converted / len(self.text) * 100)))
+                    next_report = converted + self.chunk_size
+            if reported < len(result_braille):
+                self.chunk_converted.emit(self._chunk_text(result_braille, reported))
+
+            self.lines = lines
+            self.line_outputs = result_braille
+            self.progress_updated.emit(100)
+            self.conversion_done.emit(self.text, '\n'.join(result_braille))
+        except CancelledConversion:
+            logging.debug("ConversionWorker : conversion abandonnée, texte modifié")
         except Exception as e:
             logging.error(f"Erreur dans ConversionWorker: {str(e)}")
             self.conversion_done.emit("", "")
 
+    @staticmethod
+    def _chunk_text(result_braille, start):
+        """Lignes traduites à partir de `start`, précédées du retour à la ligne qui les sépare des précédentes."""
+        text = '\n'.join(result_braille[start:])
+        return '\n' + text if start else text
+
 class BrailleTab(QWidget):
     """Onglet pour l'édition de texte et braille avec support multi-pages et conversion asynchrone."""
     
@@ -70,6 +98,14 @@ class BrailleTab(QWidget):
         self._line_cache = {}  # Cache pour les lignes individuelles
         self._chunk_size = 1000  # Taille des morceaux pour le traitement
         self._max_cache_size = 1000  # Taille maximale du cache
+        # Texte des pages d'entrée, tenu à jour modification par modification, avec le
+        # braille de chaque paragraphe
+        self.document_model = DocumentModel()
+        self._page_lengths = {}
+        self._rendered_state = None  # (version du document, clé de traduction) affichée
+        # Vues paginées des grands documents (voir show_paged), à la place des pages
+        self.input_viewer = None
+        self.output_viewer = None
         self.init_ui()
 
     @property
@@ -118,6 +154,13 @@ class BrailleTab(QWidget):
         page_input.setLineWrapColumnOrWidth(self.parent.line_width)
         page_input.setAcceptRichText(True)
         page_input.textChanged.connect(self.on_text_changed)
+        page_input.document().contentsChange.connect(
+            lambda position, removed, added, page=page_input: self._on_contents_change(page, position, removed, added)
+        )
+        if self.pages_input:
+            # Les pages sont séparées par un retour à la ligne (voir get_all_text)
+            self.document_model.insert(len(self.document_model), "\n")
+        self._page_lengths[page_input] = 0
 
         page_output = QTextEdit()
         page_output.setFont(QFont(self.parent.current_font, self.parent.base_font_size))
@@ -141,6 +184,13 @@ class BrailleTab(QWidget):
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
 
+            if len(content) >= PAGED_VIEW_MIN_CHARS:
+                # Trop grand pour une mise en page Qt du document entier
+                self.show_paged(content)
+                progress.setValue(100)
+                self.update_conversion()
+                return
+
             # Diviser le contenu en morceaux
             chunks = [content[i:i + self._chunk_size] for i in range(0, len(content), self._chunk_size)]
             total_chunks = len(chunks)
@@ -169,6 +219,37 @@ class BrailleTab(QWidget):
             logging.error(f"Erreur lors du chargement du fichier: {str(e)}")
             raise
 
+    def show_paged(self, text):
+        """
+        Affiche `text` dans des vues paginées (texte modifiable, braille en lecture
+        seule) : seules la page affichée et ses voisines sont des widgets Qt, les
+        autres pages sont lues à la demande dans le modèle de document et le braille.
+        """
+        self.document_model = DocumentModel(text)
+        self._rendered_state = None
+        font = QFont(self.parent.current_font, self.parent.base_font_size)
+        rows_per_page, width = self.parent.lines_per_page, self.parent.line_width
+        if self.input_viewer is None:
+            self.input_viewer = PagedViewer(self.document_model, rows_per_page, width, font, read_only=False)
+            self.output_viewer = PagedViewer(LineStore(), rows_per_page, width, font)
+            self.input_viewer.edited.connect(self.on_text_changed)
+            self.input_container.hide()
+            self.output_container.hide()
+            self.layout().addWidget(self.input_viewer)
+            self.layout().addWidget(self.output_viewer)
+        else:
+            self.input_viewer.set_source(self.document_model)
+            self.output_viewer.set_source(LineStore())
+        self.input_viewer.go_to_line(0)
+        self.original_text = text
+
+    def _show_braille(self, braille):
+        """Affiche le braille du document, dans la vue paginée s'il y en a une."""
+        if self.output_viewer is not None:
+            self.output_viewer.set_source(LineStore(braille))
+        else:
+            self.text_output.setPlainText(braille)
+
     def process_chunk(self, chunk, chunk_index):
         """Traite un morceau de texte et met à jour le cache."""
         try:
@@ -284,12 +365,49 @@ class BrailleTab(QWidget):
         self.original_braille = self.get_all_braille()
         self.is_updating = False
 
+    def _page_offset(self, page):
+        """Position, dans le modèle de document, du début de la page d'entrée `page`."""
+        offset = 0
+        for other in self.pages_input:
+            if other is page:
+                return offset
+            offset += self._page_lengths.get(other, 0) + 1
+        return offset
+
+    def _on_contents_change(self, page, position, removed, added):
+        """Reporte une modification d'une page d'entrée dans le modèle, sans relire la page entière."""
+        try:
+            old_length = self._page_lengths.get(page, 0)
+            new_length = page.document().characterCount() - 1
+            # Qt compte parfois le dernier séparateur de paragraphe (setPlainText) : se caler sur les longueurs
+            removed = max(0, min(removed, old_length - position))
+            added = new_length - old_length + removed
+            inserted = ""
+            if added > 0:
+                cursor = QTextCursor(page.document())
+                cursor.setPosition(position)
+                cursor.setPosition(position + added, QTextCursor.KeepAnchor)
+                # Mêmes conventions que toPlainText
+                inserted = cursor.selectedText().replace("\u2029", "\n").replace("\u00a0", " ")
+            self._page_lengths[page] = new_length
+            start = self._page_offset(page) + position
+            self.document_model.replace(start, start + removed, inserted)
+        except Exception as e:
+            logging.error(f"Erreur lors du suivi des modifications: {str(e)}")
+            # Resynchroniser le modèle à partir du texte des pages
+            self._page_lengths = {p: p.document().characterCount() - 1 for p in self.pages_input}
+            self.document_model.set_text(self.get_all_text())
+
     def get_all_text(self):
         """Récupère tout le texte des pages d'entrée."""
+        if self.input_viewer is not None:
+            return self.document_model.text()
         return "\n".join(page.toPlainText() for page in self.pages_input)
 
     def get_all_braille(self):
         """Récupère tout le braille des pages de sortie."""
+        if self.output_viewer is not None:
+            return self.output_viewer.source.text()
         return "\n".join(page.toPlainText() for page in self.pages_output)
 
     def update_font_and_width(self):
@@ -302,6 +420,10 @@ class BrailleTab(QWidget):
             page_output.setFont(font)
             page_input.setLineWrapColumnOrWidth(self.parent.line_width)
             page_output.setLineWrapColumnOrWidth(self.parent.line_width)
+        for viewer in (self.input_viewer, self.output_viewer):
+            if viewer is not None:
+                viewer.set_font(font)
+                viewer.set_layout(self.parent.lines_per_page, self.parent.line_width)
 
     def connect_text_changed(self):
         """Connecte les signaux de changement de texte aux slots appropriés."""
@@ -332,76 +454,52 @@ class BrailleTab(QWidget):
 
         self.is_updating = True
         try:
-            text = self.get_all_text()
-            if not text:
+            model = self.document_model
+            if not len(model):
                 return
 
-            # Vérifier si le texte complet est dans le cache
-            cache_key = f"{text}_{self.parent.table_combo.currentText()}_{self.parent.line_width}"
-            if cache_key in self._conversion_cache:
-                formatted_text, formatted_braille = self._conversion_cache[cache_key]
-                self.text_output.setPlainText(formatted_braille)
+            # Rien n'a changé depuis le dernier affichage
+            translation_key = self._translation_key()
+            if self._rendered_state == (model.version, translation_key):
                 return
 
-            # Traiter les modifications ligne par ligne
-            old_lines = self.original_text.split('\n')
-            new_lines = text.split('\n')
-            modified_lines = set()
-
-            # Identifier les lignes modifiées
-            for i in range(min(len(old_lines), len(new_lines))):
-                if old_lines[i] != new_lines[i]:
-                    modified_lines.add(i)
-            for i in range(len(old_lines), len(new_lines)):
-                modified_lines.add(i)
-
-            if len(modified_lines) < len(new_lines) * 0.3:  # Si moins de 30% des lignes sont modifiées
-                # Traiter uniquement les lignes modifiées
-                braille_lines = self.original_braille.split('\n') if self.original_braille else [''] * len(old_lines)
-                for line_idx in modified_lines:
-                    if line_idx < len(new_lines):
-                        line = new_lines[line_idx]
-                        if line.strip():
-                            formatted_line, braille_line = self.process_line(line, line_idx)
-                            while line_idx >= len(braille_lines):
-                                braille_lines.append('')
-                            braille_lines[line_idx] = braille_line
-                        else:
-                            while line_idx >= len(braille_lines):
-                                braille_lines.append('')
-                            braille_lines[line_idx] = ""
-
-                # Ajuster la longueur des lignes
-                if len(braille_lines) > len(new_lines):
-                    braille_lines = braille_lines[:len(new_lines)]
-                elif len(braille_lines) < len(new_lines):
-                    braille_lines.extend([''] * (len(new_lines) - len(braille_lines)))
-
-                formatted_braille = '\n'.join(braille_lines)
-                self.text_output.setPlainText(formatted_braille)
+            # Seuls les paragraphes modifiés depuis la dernière traduction sont traduits
+            # (si moins de 30% des paragraphes sont concernés)
+            if model.stale_count(translation_key) <= int(model.paragraph_count * 0.3):
+                model.retranslate(translation_key, self._translate_paragraphs)
+                formatted_braille = model.braille_text()
+                self._show_braille(formatted_braille)
                 self.original_braille = formatted_braille
-                self.original_text = text
+                self._rendered_state = (model.version, translation_key)
             else:
+                text = model.text()
                 # Pour les modifications importantes, utiliser le worker
                 if len(text) > self._chunk_size:
-                    if self._conversion_thread and self._conversion_thread.isRunning():
-                        return
-
+                    engine = self.parent.braille_engine
+                    # Le texte a changé : le reste de la conversion en cours est abandonné
+                    # (new_cancellation_token annule le jeton précédent de l'onglet)
                     progress = QProgressDialog("Conversion en cours...", "Annuler", 0, 100, self)
-                    progress.setWindowModality(Qt.WindowModal)
                     progress.show()
 
                     self._conversion_thread = ConversionWorker(
                         text,
-                        self.parent.braille_engine,
+                        engine,
                         self.parent.available_tables[self.parent.table_combo.currentText()],
-                        self.parent.line_width
+                        self.parent.line_width,
+                        token=engine.new_cancellation_token(self)
                     )
-                    self._conversion_thread.conversion_done.connect(
-                        lambda t, b: self.on_conversion_complete(t, b, cache_key)
+                    worker = self._conversion_thread
+                    version = model.version
+                    self._show_braille("")
+                    worker.chunk_converted.connect(lambda piece: self._append_converted_chunk(worker, piece))
+                    worker.conversion_done.connect(
+                        lambda t, b: self.on_conversion_complete(t, b, translation_key, worker, version)
                     )
-                    self._conversion_thread.progress_updated.connect(progress.setValue)
-                    self._conversion_thread.start()
+                    worker.progress_updated.connect(progress.setValue)
+                    worker.finished.connect(progress.close)
+                    # canceled est aussi émis à la fermeture du dialogue : n'annuler que cette conversion
+                    progress.canceled.connect(lambda token=worker.token: token.cancel())
+                    worker.start()
                 else:
                     # Pour les petits fichiers, conversion directe
                     formatted_text = self.parent.braille_engine.wrap_text_by_sentence(text, self.parent.line_width)
@@ -410,21 +508,60 @@ class BrailleTab(QWidget):
                         self.parent.available_tables[self.parent.table_combo.currentText()],
                         self.parent.line_width
                     )
-                    self._conversion_cache[cache_key] = (formatted_text, formatted_braille)
-                    self.text_output.setPlainText(formatted_braille)
+                    self._show_braille(formatted_braille)
                     self.original_text = formatted_text
                     self.original_braille = formatted_braille
+                    # Braille du document entier : les paragraphes restent à traduire un par un
+                    self._rendered_state = (model.version, translation_key)
 
         except Exception as e:
             logging.error(f"Erreur lors de la mise à jour de la conversion: {str(e)}")
         finally:
             self.is_updating = False
 
-    def on_conversion_complete(self, formatted_text, formatted_braille, cache_key):
+    def _translation_key(self):
+        """Les traductions par paragraphe ne restent valables que pour cette table et cette largeur."""
+        return (
+            self.parent.table_combo.currentText(),
+            self.parent.line_width,
+            self.parent.braille_engine.custom_tables_version
+        )
+
+    def _translate_paragraphs(self, lines):
+        """Traduit un lot de paragraphes en un seul passage (une sortie par paragraphe)."""
+        return list(self.parent.braille_engine.to_braille_stream(
+            lines,
+            self.parent.available_tables[self.parent.table_combo.currentText()],
+            self.parent.line_width,
+            priority=PRIORITY_INTERACTIVE
+        ))
+
+    def _append_converted_chunk(self, worker, piece):
+        """Ajoute à la fin du braille un bloc converti par la conversion en cours."""
+        if worker is not self._conversion_thread:
+            return
+        if self.output_viewer is not None:
+            self.output_viewer.source.append(piece)
+            self.output_viewer.refresh_later()
+            return
+        cursor = QTextCursor(self.text_output.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(piece)
+
+    def on_conversion_complete(self, formatted_text, formatted_braille, translation_key=None, worker=None,
+                               version=None):
         """Gère la fin de la conversion asynchrone."""
         try:
-            self._conversion_cache[cache_key] = (formatted_text, formatted_braille)
-            self.text_output.setPlainText(formatted_braille)
+            if worker is not None and worker is not self._conversion_thread:
+                return
+            self._conversion_thread = None
+            # Braille de chaque paragraphe, si le texte n'a pas changé pendant la conversion
+            if worker is not None and worker.line_outputs:
+                if self.document_model.store_all(translation_key, worker.line_outputs, version):
+                    self._rendered_state = (version, translation_key)
+            if worker is None or not worker.line_outputs:
+                # Sinon le braille a déjà été affiché bloc par bloc
+                self._show_braille(formatted_braille)
             self.original_text = formatted_text
             self.original_braille = formatted_braille
         except Exception as e:
@@ -0,0 +1,209 @@
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QStackedLayout, QPlainTextEdit, QScrollBar, QLabel
+from PyQt5.QtCore import Qt, QTimer, QEvent, pyqtSignal
+from PyQt5.QtGui import QTextCursor
+import logging
+from backend.line_store import PageIndex
+
+
+class PagedViewer(QWidget):
+    """
+    Vue paginée d'un grand document : seules la page affichée et ses `neighbours`
+    voisines de chaque côté sont chargées dans des widgets Qt.
+
+    Les pages sont lues à la demande dans `source` (`LineStore`, ou `DocumentModel`
+    pour une vue modifiable) ; le nombre de pages et la position de la barre de
+    défilement viennent d'un `PageIndex`, sans mise en page Qt du document entier.
+    Dans une vue modifiable, chaque modification d'une page est reportée dans
+    `source.replace` et le découpage en pages est recalculé après une pause.
+    """
+    edited = pyqtSignal()
+    page_changed = pyqtSignal(int)
+
+    def __init__(self, source, rows_per_page=29, width=33, font=None, neighbours=1, read_only=True, parent=None):
+        super().__init__(parent)
+        self.source = source
+        self.rows_per_page = rows_per_page
+        self.width = width
+        self.neighbours = neighbours
+        self.read_only = read_only
+        self.current_page = 0
+        self.page_index = None
+        self._pages = {}  # page -> widget
+        self._ranges = {}  # widget -> (première ligne, ligne suivant la dernière) affichées
+        self._lengths = {}  # widget -> nombre de caractères affichés
+        self._font = font
+        self._filling = False
+        self._viewports = {}  # zone d'affichage -> widget de page
+
+        self._reindex_timer = QTimer(self)
+        self._reindex_timer.setSingleShot(True)
+        self._reindex_timer.setInterval(300)
+        self._reindex_timer.timeout.connect(self.reindex)
+
+        layout = QVBoxLayout(self)
+        row = QHBoxLayout()
+        self._stack_widget = QWidget()
+        self._stack = QStackedLayout(self._stack_widget)
+        self._pool = [self._make_page_widget() for _ in range(2 * neighbours + 1)]
+        self.scroll_bar = QScrollBar(Qt.Vertical)
+        self.scroll_bar.setPageStep(1)
+        self.scroll_bar.valueChanged.connect(self.show_page)
+        row.addWidget(self._stack_widget)
+        row.addWidget(self.scroll_bar)
+        layout.addLayout(row)
+        self.page_label = QLabel()
+        layout.addWidget(self.page_label)
+
+        self.reindex()
+
+    def _make_page_widget(self):
+        widget = QPlainTextEdit()
+        widget.setReadOnly(self.read_only)
+        widget.setLineWrapMode(QPlainTextEdit.WidgetWidth)
+        if self._font is not None:
+            widget.setFont(self._font)
+        # La molette arrive sur la zone d'affichage du widget
+        widget.viewport().installEventFilter(self)
+        self._viewports[widget.viewport()] = widget
+        widget.document().contentsChange.connect(
+            lambda position, removed, added, page_widget=widget: self._on_contents_change(
+                page_widget, position, removed, added
+            )
+        )
+        self._stack.addWidget(widget)
+        return widget
+
+    @property
+    def page_count(self):
+        return self.page_index.page_count if self.page_index else 0
+
+    def set_source(self, source):
+        """Affiche un autre document ; la ligne en haut de la page affichée reste affichée si elle existe."""
+        self.source = source
+        self._pages.clear()
+        self._ranges.clear()
+        self.reindex()
+
+    def set_font(self, font):
+        self._font = font
+        for widget in self._pool:
+            widget.setFont(font)
+
+    def set_layout(self, rows_per_page, width):
+        """Change la taille des pages : la ligne en haut de la page affichée reste affichée."""
+        self.rows_per_page = rows_per_page
+        self.width = width
+        self.reindex()
+
+    def refresh_later(self):
+        """Recalcule le découpage en pages après une pause (document prolongé ou modifié)."""
+        self._reindex_timer.start()
+
+    def reindex(self):
+        """Recalcule l'index des pages et recharge les pages affichées dont les lignes ont changé."""
+        self._reindex_timer.stop()
+        first_line = self.page_index.page_lines(self.current_page)[0] if self.page_index else 0
+        self.page_index = PageIndex(self.source.line_lengths(), self.rows_per_page, self.width)
+        self.scroll_bar.blockSignals(True)
+        self.scroll_bar.setRange(0, self.page_count - 1)
+        self.scroll_bar.blockSignals(False)
+        self.show_page(self.page_index.page_of_line(first_line), force=True)
+
+    def show_page(self, page, force=False):
+        """Affiche la page `page` ; ses voisines sont chargées d'avance, les autres pages libérées."""
+        page = max(0, min(page, self.page_count - 1))
+        if page == self.current_page and not force:
+            return
+        self.current_page = page
+        window = range(max(0, page - self.neighbours), min(self.page_count, page + self.neighbours + 1))
+        kept = {p: w for p, w in self._pages.items() if p in window}
+        free = [w for w in self._pool if w not in kept.values()]
+        self._pages = {}
+        for p in window:
+            widget = kept.get(p) or free.pop()
+            self._pages[p] = widget
+            lines = self.page_index.page_lines(p)
+            if self._ranges.get(widget) != lines:
+                self._fill(widget, lines)
+        self._stack.setCurrentWidget(self._pages[page])
+        self.scroll_bar.blockSignals(True)
+        self.scroll_bar.setValue(page)
+        self.scroll_bar.blockSignals(False)
+        self.page_label.setText(f"Page {page + 1} / {self.page_count}")
+        self.page_changed.emit(page)
+
+    def _fill(self, widget, lines):
+        """Charge dans `widget` les lignes (début, fin) lues dans la source, en gardant le curseur."""
+        cursor_position = widget.textCursor().position()
+        text = "\n".join(self.source.lines(*lines))
+        self._filling = True
+        try:
+            widget.setPlainText(text)
+        finally:
+            self._filling = False
+        self._ranges[widget] = lines
+        self._lengths[widget] = len(text)
+        cursor = widget.textCursor()
+        cursor.setPosition(min(cursor_position, len(text)))
+        widget.setTextCursor(cursor)
+
+    def go_to_line(self, line):
+        self.show_page(self.page_index.page_of_line(line))
+
+    def next_page(self):
+        self.show_page(self.current_page + 1)
+
+    def previous_page(self):
+        self.show_page(self.current_page - 1)
+
+    def eventFilter(self, obj, event):
+        # La molette au bout d'une page passe à la page voisine
+        widget = self._viewports.get(obj)
+        if widget is not None and event.type() == QEvent.Wheel:
+            bar = widget.verticalScrollBar()
+            delta = event.angleDelta().y()
+            if delta < 0 and bar.value() >= bar.maximum() and self.current_page + 1 < self.page_count:
+                self.next_page()
+                return True
+            if delta > 0 and bar.value() <= bar.minimum() and self.current_page > 0:
+                self.previous_page()
+                previous = self._pages[self.current_page].verticalScrollBar()
+                previous.setValue(previous.maximum())
+                return True
+        return super().eventFilter(obj, event)
+
+    def _on_contents_change(self, widget, position, removed, added):
+        """Reporte dans la source une modification faite dans une page."""
+        if self._filling or self.read_only or widget not in self._ranges:
+            return
+        try:
+            first_line, stop_line = self._ranges[widget]
+            old_length = self._lengths[widget]
+            new_length = widget.document().characterCount() - 1
+            removed = max(0, min(removed, old_length - position))
+            added = new_length - old_length + removed
+            inserted = ""
+            if added > 0:
+                cursor = QTextCursor(widget.document())
+                cursor.setPosition(position)
+                cursor.setPosition(position + added, QTextCursor.KeepAnchor)
+                inserted = cursor.selectedText().replace("\u2029", "\n").replace("\u00a0", " ")
+            start = self.source.line_start(first_line) + position
+            self.source.replace(start, start + removed, inserted)
+
+            # Les pages suivantes commencent plus loin (ou plus tôt) d'autant de lignes
+            delta = widget.document().blockCount() - (stop_line - first_line)
+            self._lengths[widget] = new_length
+            page = next(p for p, w in self._pages.items() if w is widget)
+            self.page_index.shift(page, delta)
+            for other in self._pages.values():
+                other_first, other_stop = self._ranges[other]
+                if other is widget:
+                    self._ranges[other] = (other_first, other_stop + delta)
+                elif other_first >= stop_line:
+                    self._ranges[other] = (other_first + delta, other_stop + delta)
+            self.refresh_later()
+            self.edited.emit()
+        except Exception as e:
+            logging.error(f"Erreur lors de la modification d'une page: {str(e)}")
+            self.reindex()
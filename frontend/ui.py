@@ -1,5 +1,4 @@
 import os
-import re
 import sys
 import time
 import shutil
@@ -11,18 +10,22 @@ from PyQt5.QtWidgets import (
     QApplication, QSpacerItem, QSizePolicy, QProgressDialog, QFontComboBox,
     QDialog, QDialogButtonBox
 )
-from PyQt5.QtCore import Qt, QTimer, QEvent, QTime, QSize, QThread, pyqtSignal
+from PyQt5.QtCore import Qt, QTimer, QEvent, QTime, QSize, QPoint, QThread, pyqtSignal
 from PyQt5.QtGui import QIcon, QFont, QTextCharFormat, QTextCursor, QTextBlockFormat, QTextImageFormat, QFontMetrics, QTextDocument, QTextOption
 from PyQt5.QtPrintSupport import QPrintDialog, QPrinter
 from backend.braille_engine import BrailleEngine
+from backend.layout import fill_words, ChunkedRender, TranslatedDocument, paragraph_chunks
+from backend.scheduler import CancelledConversion, PRIORITY_INTERACTIVE
 from backend.file_handler import FileHandler
 from backend.database import Database
 from backend.models import Texte, Fichier, Impression
-from backend.config import BRAILLE_FONT_NAME
+from backend.config import BRAILLE_FONT_NAME, VIEWPORT_MARGIN_SCREENS
+from backend.counters import TextCounters
 from backend.translator import Translator
 from frontend.auth import AuthWidget
 from frontend.styles import set_light_mode, set_dark_mode
 from frontend.custom_table import CustomBrailleTableWidget
+from frontend.braille_canvas import BrailleCanvas
 import pytesseract
 from PIL import Image, ImageEnhance
 import subprocess
@@ -59,43 +62,65 @@ for lang in required_langs:
         print(f"Avertissement : Le fichier de langue '{lang}.traineddata' est manquant.")
 
 class BrailleConversionThread(QThread):
-    conversion_done = pyqtSignal(object, str, str)
+    chunk_ready = pyqtSignal(object, int, str, bool)
+    conversion_done = pyqtSignal(object, object)
     progress_updated = pyqtSignal(int)
 
-    def __init__(self, braille_engine, text, table, line_width):
+    def __init__(self, braille_engine, text, table, line_width, token=None, chunk_chars=4000, visible_lines=None,
+                 languages=None):
         super().__init__()
         self.braille_engine = braille_engine
         self.text = text
         self.table = table
+        # {langue: table} : chaque paragraphe traduit avec la table de sa langue (None : `table` partout)
+        self.languages = languages
         self.line_width = line_width
-        self.full_text = text
-        self.limit = 500
+        # Taille des blocs de paragraphes traduits en parallèle et affichés dès qu'ils sont prêts
+        self.chunk_chars = chunk_chars
+        # Lignes (première, dernière) affichées, marge comprise : traduites en premier
+        self.visible_lines = visible_lines
+        # Jeton annulé lorsque le texte de l'onglet change : la conversion devient obsolète
+        self.token = token
+        self.started_at = time.perf_counter()
+        self.time_to_visible = None
+        # Vrai si le braille affiché bloc par bloc diffère du rendu du document entier
+        self.needs_refresh = False
 
     def run(self):
+        try:
+            self._run_conversion()
+        except CancelledConversion:
+            logging.debug("Conversion en Braille abandonnée : texte modifié")
+        except Exception as e:
+            logging.error(f"Erreur dans BrailleConversionThread: {str(e)}")
+
+    def _run_conversion(self):
         start_convert = time.time()
-        text_to_convert = self.text[:self.limit] if len(self.text) > self.limit else self.text
-        formatted_text = self.braille_engine.wrap_text_by_sentence(text_to_convert, self.line_width)
-        braille_text = self.braille_engine.to_braille(formatted_text, self.table, self.line_width)
-        formatted_braille = self.braille_engine.wrap_text_by_sentence(braille_text, self.line_width)
-        
-        self.progress_updated.emit(50)
-        if len(self.text) > self.limit:
-            formatted_text += "\n[... Texte tronqué, conversion en cours...]"
-            formatted_braille += "\n[... Braille tronqué, conversion en cours...]"
-        
+        version = self.braille_engine.custom_tables_version
+        chunks = list(paragraph_chunks(self.text.split("\n"), self.chunk_chars))
+        render = ChunkedRender(self.braille_engine.layout_cache, self.line_width, chunks)
+        visible = render.chunks_between(*self.visible_lines) if self.visible_lines else [0]
+        visible_set = set(visible)
+        translated = 0
+        # Zone affichée d'abord, puis le reste en arrière-plan ; chaque bloc est mis en
+        # page et envoyé à l'affichage dès sa traduction, à sa place dans le document
+        for index, braille_lines in self.braille_engine.translate_chunks(
+            chunks, self.table, visible=visible, token=self.token, languages=self.languages
+        ):
+            position, piece = render.place(index, braille_lines)
+            self.chunk_ready.emit(self, position, piece, index in visible_set)
+            translated += len(braille_lines)
+            self.progress_updated.emit(min(99, translated * 100 // render.line_count))
+
+        document = TranslatedDocument(
+            self.text, render.translated_lines, self.braille_engine.layout_cache,
+            table_path=self.table, version=version
+        )
+        self.needs_refresh = render.text() != document.render(self.line_width)
+        self.progress_updated.emit(100)
         convert_time = time.time() - start_convert
-        logging.debug(f"Temps de conversion initiale en Braille: {convert_time:.2f} secondes")
-        self.conversion_done.emit(self, formatted_text, formatted_braille)
-        
-        if len(self.text) > self.limit:
-            start_full_convert = time.time()
-            full_formatted_text = self.braille_engine.wrap_text_by_sentence(self.full_text, self.line_width)
-            full_braille_text = self.braille_engine.to_braille(full_formatted_text, self.table, self.line_width)
-            full_formatted_braille = self.braille_engine.wrap_text_by_sentence(full_braille_text, self.line_width)
-            self.progress_updated.emit(100)
-            full_convert_time = time.time() - start_full_convert
-            logging.debug(f"Temps de conversion complète en Braille: {full_convert_time:.2f} secondes")
-            self.conversion_done.emit(self, full_formatted_text, full_formatted_braille)
+        logging.debug(f"Temps de conversion en Braille: {convert_time:.2f} secondes")
+        self.conversion_done.emit(self, document)
 
 class BrailleTab(QWidget):
     def __init__(self, parent, file_path=None, save_type="Texte + Braille"):
@@ -107,6 +132,13 @@ class BrailleTab(QWidget):
         self.original_braille = ""
         self.is_updating = False
         self._conversion_thread = None
+        # Conversions démarrées, gardées jusqu'à `finished` même une fois abandonnées
+        self._conversion_threads = []
+        self.canvas_view = False
+        self._counters = {}  # document d'une zone -> TextCounters tenus à jour
+        # Traduction non mise en page du texte affiché : remise en page sans retraduction
+        self.braille_document = None
+        self.braille_document_width = None
         self.pending_changes = []
         self.last_modified_lines = set()
         self.init_ui()
@@ -129,10 +161,82 @@ class BrailleTab(QWidget):
         self.text_output.setStyleSheet("QTextEdit { border: 1px solid gray; }")
         output_layout.addWidget(self.text_output_label)
         output_layout.addWidget(self.text_output)
+
+        # Aperçu rapide du braille (atlas de glyphes) : remplace text_output à l'écran
+        # et lit son document, sans mise en page Qt
+        self.braille_canvas = BrailleCanvas(self.text_output.font())
+        self.braille_canvas.hide()
+        output_layout.addWidget(self.braille_canvas)
+        self.text_output.installEventFilter(self)
         
         # Ajouter les layouts à la mise en page principale
         layout.addLayout(input_layout)
         layout.addLayout(output_layout)
+        if getattr(self.parent, "fast_braille_view", False):
+            self.set_braille_view(True, getattr(self.parent, "dot_preview", False))
+
+    def set_braille_view(self, canvas, dot_preview=False):
+        """Affiche le braille dans l'aperçu rapide (`canvas`) ou dans la zone de texte modifiable."""
+        self.canvas_view = canvas
+        self.braille_canvas.set_dot_preview(dot_preview)
+        if canvas:
+            self.braille_canvas.set_font(self.text_output.font())
+            self.braille_canvas.set_document(self.text_output.document())
+            self.text_output.hide()
+            self.braille_canvas.show()
+        else:
+            self.braille_canvas.hide()
+            self.braille_canvas.set_source(None)
+            # Zoom appliqué à l'aperçu seul pendant qu'il était affiché
+            if self.braille_canvas.glyph_font != self.text_output.font():
+                self.text_output.setFont(self.braille_canvas.glyph_font)
+            self.text_output.show()
+
+    def text_counters(self, document):
+        """
+        Compteurs de `document` (document d'une des deux zones) : comptés en entier au
+        premier appel, puis tenus à jour par `contentsChange` en ne recomptant que les
+        blocs modifiés. Les compteurs des documents qui ne sont plus affichés (documents
+        remplacés par le zoom) sont oubliés.
+        """
+        counters = self._counters.get(document)
+        if counters is None:
+            shown = (self.text_input.document(), self.text_output.document())
+            self._counters = {d: c for d, c in self._counters.items() if d in shown}
+            counters = TextCounters(document.toPlainText())
+            self._counters[document] = counters
+            document.contentsChange.connect(
+                lambda position, removed, added, counted=document: self._on_counted_change(
+                    counted, position, removed, added
+                )
+            )
+        return counters
+
+    def _on_counted_change(self, document, position, removed, added):
+        """Recompte les seuls blocs touchés par une modification de `document`."""
+        counters = self._counters.get(document)
+        if counters is None:
+            return
+        end = min(position + added, document.characterCount() - 1)
+        first = document.findBlock(position).blockNumber()
+        changed = document.findBlock(end).blockNumber() - first + 1
+        # Blocs remplacés : blocs modifiés moins les blocs ajoutés au document
+        replaced = changed - (document.blockCount() - counters.paragraph_count)
+        if first < 0 or replaced < 0 or first + replaced > counters.paragraph_count:
+            counters.replace_lines(0, counters.paragraph_count, document.toPlainText().split("\n"))
+            return
+        lines = []
+        block = document.findBlockByNumber(first)
+        for _ in range(changed):
+            lines.append(block.text())
+            block = block.next()
+        counters.replace_lines(first, replaced, lines)
+
+    def eventFilter(self, obj, event):
+        # Police de la zone braille changée (nouvel onglet, police choisie) : l'aperçu suit
+        if obj is self.text_output and event.type() == QEvent.FontChange:
+            self.braille_canvas.set_font(self.text_output.font())
+        return super().eventFilter(obj, event)
 
     def connect_text_changed(self):
         self.text_input.textChanged.connect(self.parent.on_text_changed)
@@ -204,6 +308,10 @@ class BrailleUI(QMainWindow):
         self.available_tables = self.braille_engine.get_available_tables()
 
         self.dark_mode = False
+        self.fast_braille_view = False
+        self.dot_preview = False
+        # Paragraphes arabes, français et anglais traduits chacun avec la table de leur langue
+        self.auto_language = True
         self.min_line_width = 5
         self.line_width = 33  # Valeur par défaut initiale
         self.lines_per_page = 29
@@ -315,7 +423,42 @@ class BrailleUI(QMainWindow):
         # Mettre à jour le braille si le texte d'entrée n'est pas vide pour s'assurer que
         # la conversion utilise la self.line_width calculée.
         if tab.text_input.toPlainText().strip():
-             self.update_conversion()
+            if not self.relayout_braille(tab):
+                self.update_conversion()
+
+    def relayout_braille(self, tab):
+        """
+        Remet en page le braille de l'onglet à la largeur courante, sans retraduction.
+
+        Renvoie False si la traduction conservée ne correspond plus au texte, à la table
+        ou aux tables personnalisées (une conversion complète est alors nécessaire).
+        """
+        document = getattr(tab, "braille_document", None)
+        if document is None or self.conversion_mode != "text_to_braille":
+            return False
+        selected_table = self.available_tables.get(self.table_combo.currentText())
+        if not document.matches(tab.text_input.toPlainText(), selected_table, self.braille_engine.custom_tables_version):
+            return False
+        formatted_braille = document.render(self.line_width)
+        if formatted_braille != tab.text_output.toPlainText():
+            # Le curseur braille reste sur le même passage du texte
+            text_pos = None
+            if tab.braille_document_width is not None:
+                text_pos = document.offset_map(tab.braille_document_width).text_offset(
+                    tab.text_output.textCursor().position()
+                )
+            tab.text_output.blockSignals(True)
+            try:
+                tab.text_output.setPlainText(formatted_braille)
+                if text_pos is not None:
+                    self._restore_cursor_position(
+                        tab.text_output, document.offset_map(self.line_width).braille_offset(text_pos)
+                    )
+            finally:
+                tab.text_output.blockSignals(False)
+            tab.original_braille = formatted_braille
+        tab.braille_document_width = self.line_width
+        return True
 
     def update_line_width(self):
         """Calcule et applique la largeur de ligne aux zones de texte."""
@@ -396,7 +539,9 @@ class BrailleUI(QMainWindow):
         self.table_combo = QComboBox()
         self.table_combo.addItems(self.available_tables.keys())
         self.table_combo.setCurrentText("Français (grade 1)")
+        self.table_combo.currentTextChanged.connect(self.warm_up_selected_table)
         self.table_combo.currentTextChanged.connect(self.update_conversion)
+        self.warm_up_selected_table()
         table_layout.addWidget(self.table_combo_label)
         table_layout.addWidget(self.table_combo)
         
@@ -599,10 +744,27 @@ class BrailleUI(QMainWindow):
         print_action.triggered.connect(self.print_braille)
         preview_menu.addAction(print_action)
 
+        self.fast_braille_action = QAction("Aperçu braille rapide", self)
+        self.fast_braille_action.setCheckable(True)
+        self.fast_braille_action.toggled.connect(self.toggle_fast_braille_view)
+        preview_menu.addAction(self.fast_braille_action)
+
+        self.dot_preview_action = QAction("Afficher les points braille", self)
+        self.dot_preview_action.setCheckable(True)
+        self.dot_preview_action.setEnabled(False)
+        self.dot_preview_action.toggled.connect(self.toggle_dot_preview)
+        preview_menu.addAction(self.dot_preview_action)
+
         settings_menu = menu_bar.addMenu("Paramètres")
         dark_mode_action = QAction("Activer/Désactiver le mode sombre", self)
         dark_mode_action.triggered.connect(self.toggle_dark_mode)
         settings_menu.addAction(dark_mode_action)
+
+        self.auto_language_action = QAction("Table selon la langue de chaque paragraphe", self)
+        self.auto_language_action.setCheckable(True)
+        self.auto_language_action.setChecked(self.auto_language)
+        self.auto_language_action.toggled.connect(self.toggle_auto_language)
+        settings_menu.addAction(self.auto_language_action)
         
         # Ajouter les actions de paramètres avec des QAction
         line_width_action = QAction("Ajuster la largeur des lignes", self)
@@ -755,127 +917,51 @@ class BrailleUI(QMainWindow):
         self.update_conversion()
 
     def invert_text(self):
+        """
+        Inverse le sens de conversion de l'onglet courant en échangeant les documents
+        des deux zones.
+
+        Les `QTextDocument` passent d'une zone à l'autre tels quels (texte, formats et
+        historique d'annulation compris) : rien n'est recopié ni reformaté. Le texte et
+        le braille de référence (`original_text`, `original_braille`) et la traduction
+        conservée (`braille_document`) restent valables dans les deux sens, si bien
+        qu'aller et revenir ne relance aucune conversion.
+        """
         tab = self.tab_widget.currentWidget()
         if tab:
+            if tab._conversion_thread and tab._conversion_thread.isRunning():
+                # Les blocs convertis s'insèrent dans la zone de sortie : attendre la fin
+                self.status_bar.showMessage("Conversion en cours : inversion impossible pour le moment", 3000)
+                return
+
             tab.text_input.blockSignals(True)
             tab.text_output.blockSignals(True)
-
-            # Sauvegarder le contenu actuel des deux zones
-            current_input_text = tab.text_input.toPlainText()
-            current_output_text = tab.text_output.toPlainText()
-
-            # Sauvegarder les formats des deux zones
-            input_document = tab.text_input.document()
-            output_document = tab.text_output.document()
-            input_formats = []
-            output_formats = []
-
-            # Sauvegarder les formats de la zone d'entrée
-            block = input_document.begin()
-            while block.isValid():
-                it = block.begin()
-                while not it.atEnd():
-                    fragment = it.fragment()
-                    if fragment.isValid():
-                        char_format = fragment.charFormat()
-                        input_formats.append({
-                            'position': fragment.position(),
-                            'length': fragment.length(),
-                            'bold': char_format.fontWeight() == QFont.Bold,
-                            'italic': char_format.fontItalic(),
-                            'underline': char_format.fontUnderline()
-                        })
-                    it += 1
-                block = block.next()
-
-            # Sauvegarder les formats de la zone de sortie
-            block = output_document.begin()
-            while block.isValid():
-                it = block.begin()
-                while not it.atEnd():
-                    fragment = it.fragment()
-                    if fragment.isValid():
-                        char_format = fragment.charFormat()
-                        output_formats.append({
-                            'position': fragment.position(),
-                            'length': fragment.length(),
-                            'bold': char_format.fontWeight() == QFont.Bold,
-                            'italic': char_format.fontItalic(),
-                            'underline': char_format.fontUnderline()
-                        })
-                    it += 1
-                block = block.next()
-
-            if self.conversion_mode == "text_to_braille":
-                self.conversion_mode = "braille_to_text"
-                tab.text_input_label.setText("Braille :")
-                tab.text_output_label.setText("Texte :")
-
-                # Échanger le contenu des zones
-                # La zone Braille ne doit pas avoir de formats riches
-                tab.text_input.setPlainText(current_output_text)
-                tab.text_output.setPlainText(current_input_text)
-
-                # Restaurer les formats de l'ancienne zone d'entrée (Texte) vers la nouvelle zone de sortie (Texte)
-                output_cursor = tab.text_output.textCursor()
-                for fmt in input_formats:
-                    output_cursor.setPosition(fmt['position'])
-                    output_cursor.movePosition(QTextCursor.Right, QTextCursor.KeepAnchor, fmt['length'])
-                    char_format = QTextCharFormat()
-                    if fmt['bold']:
-                        char_format.setFontWeight(QFont.Bold)
-                    if fmt['italic']:
-                        char_format.setFontItalic(True)
-                    if fmt['underline']:
-                        char_format.setFontUnderline(True)
-                    output_cursor.mergeCharFormat(char_format)
-
-                # La nouvelle zone d'entrée (Braille) doit avoir tous ses formats riches supprimés
-                input_cursor = tab.text_input.textCursor()
-                input_cursor.select(QTextCursor.Document)
-                input_cursor.setCharFormat(QTextCharFormat()) # Supprimer tous les formats
-
-
-                # Mettre à jour les originaux
-                tab.original_text = current_input_text # L'original_text stocke maintenant le texte standard qui est dans text_output
-                tab.original_braille = current_output_text # L'original_braille stocke le texte braille qui est dans text_input
-
-            else:
-                self.conversion_mode = "text_to_braille"
-                tab.text_input_label.setText("Texte :")
-                tab.text_output_label.setText("Braille :")
-
-                # Échanger le contenu des zones
-                 # La zone Braille ne doit pas avoir de formats riches
-                tab.text_input.setPlainText(current_output_text)
-                tab.text_output.setPlainText(current_input_text)
-
-                # Restaurer les formats de l'ancienne zone de sortie (Texte) vers la nouvelle zone d'entrée (Texte)
-                input_cursor = tab.text_input.textCursor()
-                for fmt in output_formats:
-                    input_cursor.setPosition(fmt['position'])
-                    input_cursor.movePosition(QTextCursor.Right, QTextCursor.KeepAnchor, fmt['length'])
-                    char_format = QTextCharFormat()
-                    if fmt['bold']:
-                        char_format.setFontWeight(QFont.Bold)
-                    if fmt['italic']:
-                        char_format.setFontItalic(True)
-                    if fmt['underline']:
-                        char_format.setFontUnderline(True)
-                    input_cursor.mergeCharFormat(char_format)
-
-                 # La nouvelle zone de sortie (Braille) doit avoir tous ses formats riches supprimés
-                output_cursor = tab.text_output.textCursor()
-                output_cursor.select(QTextCursor.Document)
-                output_cursor.setCharFormat(QTextCharFormat()) # Supprimer tous les formats
-
-
-                # Mettre à jour les originaux
-                tab.original_text = current_output_text # L'original_text stocke maintenant le texte standard qui est dans text_input
-                tab.original_braille = current_input_text # L'original_braille stocke le texte braille qui est dans text_output
-
-            tab.text_input.blockSignals(False)
-            tab.text_output.blockSignals(False)
+            try:
+                input_document = tab.text_input.document()
+                output_document = tab.text_output.document()
+                input_font = tab.text_input.font()
+                output_font = tab.text_output.font()
+                # Un QTextEdit supprime le document qu'il remplace s'il en est le parent
+                input_document.setParent(tab)
+                output_document.setParent(tab)
+                tab.text_input.setDocument(output_document)
+                tab.text_output.setDocument(input_document)
+                tab.text_input.setFont(input_font)
+                tab.text_output.setFont(output_font)
+                if tab.canvas_view:
+                    tab.braille_canvas.set_document(tab.text_output.document())
+
+                if self.conversion_mode == "text_to_braille":
+                    self.conversion_mode = "braille_to_text"
+                    tab.text_input_label.setText("Braille :")
+                    tab.text_output_label.setText("Texte :")
+                else:
+                    self.conversion_mode = "text_to_braille"
+                    tab.text_input_label.setText("Texte :")
+                    tab.text_output_label.setText("Braille :")
+            finally:
+                tab.text_input.blockSignals(False)
+                tab.text_output.blockSignals(False)
             self.update_counters()
 
     def keyPressEvent(self, event):
@@ -1044,6 +1130,23 @@ class BrailleUI(QMainWindow):
         self.sync_text_areas(tab)
         self.update_counters()
 
+    def toggle_fast_braille_view(self, enabled):
+        """Affiche le braille de tous les onglets dans l'aperçu rapide (lecture seule) ou dans la zone modifiable."""
+        self.fast_braille_view = enabled
+        self.dot_preview_action.setEnabled(enabled)
+        for index in range(self.tab_widget.count()):
+            tab = self.tab_widget.widget(index)
+            if isinstance(tab, BrailleTab):
+                tab.set_braille_view(enabled, self.dot_preview)
+        self.status_bar.showMessage("Aperçu braille rapide activé" if enabled else "Aperçu braille rapide désactivé", 3000)
+
+    def toggle_dot_preview(self, enabled):
+        self.dot_preview = enabled
+        for index in range(self.tab_widget.count()):
+            tab = self.tab_widget.widget(index)
+            if isinstance(tab, BrailleTab):
+                tab.braille_canvas.set_dot_preview(enabled)
+
     def apply_zoom(self, value):
         """Met à jour le niveau de zoom pour les deux zones de texte et préserve les formats."""
         try:
@@ -1068,9 +1171,13 @@ class BrailleUI(QMainWindow):
             braille_start = braille_cursor.selectionStart() if braille_has_selection else braille_cursor.position()
             braille_end = braille_cursor.selectionEnd() if braille_has_selection else braille_cursor.position()
 
+            # Aperçu rapide : seul l'atlas des cellules est redessiné, le document braille
+            # n'est ni copié ni remis en page (la zone modifiable reprend la police en revenant)
+            canvas_view = getattr(current_tab, "canvas_view", False)
+
             # Sauvegarder les documents formatés (conservé pour préserver les styles)
             text_document = text_input.document().clone()
-            braille_document = braille_output.document().clone()
+            braille_document = None if canvas_view else braille_output.document().clone()
 
             # Appliquer le nouveau zoom à la taille de base de la police
             zoom_factor = value / 100.0
@@ -1085,11 +1192,15 @@ class BrailleUI(QMainWindow):
 
             # Restaurer les documents formatés (cela réinitialise la police)
             text_input.setDocument(text_document)
-            braille_output.setDocument(braille_document)
+            if canvas_view:
+                current_tab.braille_canvas.set_font(temp_font_output)
+            else:
+                braille_output.setDocument(braille_document)
 
             # Réappliquer la nouvelle taille de police après la restauration du document
             text_input.setFont(temp_font_input)
-            braille_output.setFont(temp_font_output)
+            if not canvas_view:
+                braille_output.setFont(temp_font_output)
 
             # Restaurer les curseurs et sélections
             text_cursor_restore = text_input.textCursor()
@@ -1384,6 +1495,12 @@ class BrailleUI(QMainWindow):
             tab.is_updating = False
             logging.debug("Finished sync_text_areas")
 
+    def warm_up_selected_table(self):
+        """Prépare les processus lou_translate de la table sélectionnée avant la première conversion."""
+        table_path = self.available_tables.get(self.table_combo.currentText())
+        if table_path:
+            self.braille_engine.warm_up_table(table_path)
+
     def _set_text_direction(self, tab):
         direction = Qt.RightToLeft if "Arabe" in self.table_combo.currentText() else Qt.LeftToRight
         tab.text_input.setLayoutDirection(direction)
@@ -1391,70 +1508,114 @@ class BrailleUI(QMainWindow):
 
     def _convert_to_braille(self, tab, current_input):
         selected_table = self.available_tables[self.table_combo.currentText()]
+        languages = self.language_tables()
         if len(current_input) <= 500:
             lines = current_input.split('\n')
-            braille_lines = []
-            for line in lines:
-                if line.strip():
-                    formatted_line = self.braille_engine.wrap_text_by_sentence(line, self.line_width)
-                    braille_line = self.braille_engine.to_braille(formatted_line, selected_table, self.line_width)
-                    braille_lines.append(braille_line)
-                else:
-                    braille_lines.append("")
+            line_tables = (
+                self.braille_engine.tables_for_lines(lines, selected_table, languages) if languages
+                else [selected_table] * len(lines)
+            )
+            # Toutes les lignes en un seul appel : une tournée de lots par table au lieu d'une par ligne
+            formatted_lines = [
+                self.braille_engine.wrap_text_by_sentence(line, self.line_width) if line.strip() else ""
+                for line in lines
+            ]
+            braille_lines = self.braille_engine.to_braille_many(formatted_lines, line_tables, self.line_width)
             formatted_braille = '\n'.join(braille_lines)
             tab.text_output.setPlainText(formatted_braille)
             tab.original_braille = formatted_braille
         else:
+            # Non modale : une nouvelle saisie annule aussitôt la conversion en cours
             progress_dialog = QProgressDialog("Conversion en Braille...", "Annuler", 0, 100, self)
-            progress_dialog.setWindowModality(Qt.WindowModal)
             progress_dialog.show()
 
-            thread = BrailleConversionThread(self.braille_engine, current_input, selected_table, self.line_width)
-            thread.conversion_done.connect(lambda t, ft, fb: self.on_conversion_done(tab, ft, fb))
+            thread = BrailleConversionThread(
+                self.braille_engine, current_input, selected_table, self.line_width,
+                token=self.braille_engine.new_cancellation_token(tab),
+                visible_lines=self._visible_line_range(tab.text_input), languages=languages
+            )
+            tab.text_output.clear()
+            tab.braille_document = None
+            thread.chunk_ready.connect(
+                lambda t, position, piece, visible: self.on_conversion_chunk(tab, t, position, piece, visible)
+            )
+            thread.conversion_done.connect(lambda t, document: self.on_conversion_done(tab, t, document))
             thread.progress_updated.connect(progress_dialog.setValue)
             thread.finished.connect(progress_dialog.close)
+            # canceled est aussi émis à la fermeture du dialogue : n'annuler que cette conversion
+            progress_dialog.canceled.connect(lambda token=thread.token: token.cancel())
+            # Une conversion abandonnée peut encore attendre un lot dans le moteur : détruire
+            # son QThread avant la fin de run() arrêterait l'application
+            tab._conversion_threads.append(thread)
+            thread.finished.connect(lambda t=thread: tab._conversion_threads.remove(t))
             thread.start()
             tab._conversion_thread = thread
 
     def _convert_to_text(self, tab, current_braille):
         selected_table = self.available_tables[self.table_combo.currentText()]
         braille_lines = current_braille.split('\n')
-        text_lines = []
-        for line in braille_lines:
-            if line.strip():
-                formatted_braille_line = self.braille_engine.wrap_text_by_sentence(line, self.line_width)
-                text_line = self.braille_engine.from_braille(formatted_braille_line, selected_table, self.line_width)
-                text_lines.append(text_line)
-            else:
-                text_lines.append("")
+        formatted_lines = [
+            self.braille_engine.wrap_text_by_sentence(line, self.line_width) if line.strip() else ""
+            for line in braille_lines
+        ]
+        text_lines = self.braille_engine.from_braille_many(formatted_lines, selected_table, self.line_width)
         formatted_text = '\n'.join(text_lines)
         tab.text_input.setPlainText(formatted_text)
         tab.original_text = formatted_text
 
-    def on_conversion_done(self, tab, formatted_text, formatted_braille):
-        if self.tab_widget.currentWidget() != tab:
+    @staticmethod
+    def _visible_line_range(text_edit, margin_screens=VIEWPORT_MARGIN_SCREENS):
+        """Lignes (première, dernière) affichées dans `text_edit`, élargies de `margin_screens` écrans de chaque côté."""
+        viewport = text_edit.viewport()
+        first = text_edit.cursorForPosition(QPoint(0, 0)).blockNumber()
+        last = text_edit.cursorForPosition(QPoint(viewport.width() - 1, viewport.height() - 1)).blockNumber()
+        screen = last - first + 1
+        return max(0, first - margin_screens * screen), last + margin_screens * screen
+
+    def on_conversion_chunk(self, tab, thread, position, piece, visible):
+        """Insère à sa place dans le braille un bloc converti par la conversion en cours de l'onglet."""
+        if tab._conversion_thread is not thread:
             return
+        text_output = tab.text_output
+        document = text_output.document()
+        # Un bloc inséré avant la zone affichée ne doit pas la faire défiler
+        top = text_output.cursorForPosition(QPoint(0, 0)).position()
+        keep_view = document.characterCount() > 1 and position <= top
+        text_output.blockSignals(True)
+        try:
+            if piece:
+                cursor = QTextCursor(document)
+                cursor.setPosition(position)
+                cursor.insertText(piece)
+            if keep_view:
+                block = document.findBlock(top + len(piece))
+                text_output.verticalScrollBar().setValue(
+                    int(document.documentLayout().blockBoundingRect(block).top())
+                )
+        finally:
+            text_output.blockSignals(False)
+        if visible and thread.time_to_visible is None:
+            thread.time_to_visible = time.perf_counter() - thread.started_at
+            self.braille_engine.record_time_to_visible(thread.time_to_visible)
 
-        tab.text_input.blockSignals(True)
-        tab.text_output.blockSignals(True)
-
-        input_cursor = tab.text_input.textCursor()
-        output_cursor = tab.text_output.textCursor()
-        input_pos = input_cursor.position()
-        output_pos = output_cursor.position()
-
-        tab.text_input.setPlainText(formatted_text)
-        tab.text_output.setPlainText(formatted_braille)
-        tab.original_text = formatted_text
-        tab.original_braille = formatted_braille
-
-        self._restore_cursor_position(tab.text_input, input_pos)
-        self._restore_cursor_position(tab.text_output, output_pos)
-
-        tab.text_input.blockSignals(False)
-        tab.text_output.blockSignals(False)
+    def on_conversion_done(self, tab, thread, document):
+        if tab._conversion_thread is not thread:
+            return
         tab._conversion_thread = None
+        # Le braille affiché est déjà complet : seul l'état de l'onglet est mis à jour
+        tab.braille_document = document
+        tab.braille_document_width = thread.line_width
+        tab.original_text = document.source_text
+        tab.original_braille = document.render(thread.line_width)
+        if thread.needs_refresh:
+            tab.text_output.blockSignals(True)
+            try:
+                tab.text_output.setPlainText(tab.original_braille)
+            finally:
+                tab.text_output.blockSignals(False)
         tab.connect_text_changed()
+        if tab.braille_document_width != self.line_width:
+            self.relayout_braille(tab)
         self.update_counters()
 
     def test_conversion(self):
@@ -1476,6 +1637,24 @@ class BrailleUI(QMainWindow):
         tab.text_input.setPlainText(test_text)
         self.update_conversion()
 
+    def toggle_auto_language(self, enabled):
+        """Active ou non la traduction de chaque paragraphe avec la table de sa langue, puis retraduit."""
+        self.auto_language = enabled
+        for index in range(self.tab_widget.count()):
+            tab = self.tab_widget.widget(index)
+            if isinstance(tab, BrailleTab):
+                # La traduction conservée a été faite avec l'autre réglage
+                tab.braille_document = None
+                tab.original_text = ""
+        self.update_conversion()
+
+    def language_tables(self):
+        """{langue: table} pour la table sélectionnée, ou None si la détection par paragraphe est désactivée."""
+        if not self.auto_language:
+            return None
+        selected_table = self.available_tables.get(self.table_combo.currentText())
+        return self.braille_engine.language_tables(selected_table) if selected_table else None
+
     def toggle_dark_mode(self):
         self.dark_mode = not self.dark_mode
         if self.dark_mode:
@@ -1595,26 +1774,7 @@ class BrailleUI(QMainWindow):
                 tab.original_braille = filtered_text
             else:
                 # Formater le texte en préservant les mots
-                words = filtered_text.split()
-                formatted_lines = []
-                current_line = []
-                current_length = 0
-                
-                for word in words:
-                    word_length = len(word)
-                    if current_length + word_length + len(current_line) <= self.line_width:
-                        current_line.append(word)
-                        current_length += word_length
-                    else:
-                        if current_line:
-                            formatted_lines.append(' '.join(current_line))
-                        current_line = [word]
-                        current_length = word_length
-                
-                if current_line:
-                    formatted_lines.append(' '.join(current_line))
-                
-                formatted_text = '\n'.join(formatted_lines)
+                formatted_text = fill_words(filtered_text, self.line_width)
                 tab.text_input.setPlainText(formatted_text)
                 tab.original_text = formatted_text
 
@@ -1944,7 +2104,7 @@ class BrailleUI(QMainWindow):
         try:
             dialog = CustomBrailleTableWidget(self.braille_engine, self)
             if dialog.exec_():
-                self.braille_engine.update_custom_table()
+                self.braille_engine.update_custom_tables()
                 self.table_combo.clear()
                 self.table_combo.addItems(self.braille_engine.get_available_tables().keys())
                 self.table_combo.setCurrentText("Personnalisée" if "Personnalisée" in self.braille_engine.get_available_tables() else "Français (grade 1)")
@@ -2041,27 +2201,20 @@ class BrailleUI(QMainWindow):
             return
 
         try:
-            text = tab.text_input.toPlainText()
-            # Calculer le nombre de lignes visuelles en tenant compte du wrapping
-            visual_line_count = 0
-            document = tab.text_input.document()
-            block = document.begin()
-            while block.isValid():
-                layout = block.layout()
-                if layout:
-                    visual_line_count += layout.lineCount()
-                block = block.next()
-
-            line_count = visual_line_count # Utiliser le nombre de lignes visuelles
-            word_count = sum(len(re.findall(r'\b\w+\b', line)) for line in text.split('\n'))
-            page_count = (line_count + self.lines_per_page - 1) // self.lines_per_page if self.lines_per_page > 0 else 1
+            # Compteurs tenus à jour à chaque modification : pas de parcours du document
+            counters = tab.text_counters(tab.text_input.document())
+            counters.set_width(self.line_width)
+            line_count = counters.line_count
+            word_count = counters.word_count
+            page_count = counters.page_count(self.lines_per_page)
 
             self.page_count.setText(str(page_count))
             self.line_count.setText(str(line_count))
             self.word_count.setText(str(word_count))
 
+            usage_time = getattr(self, 'current_usage_time_str', "Temps d'utilisation : --:--:--")
             self.status_bar.showMessage(
-                f"{getattr(self, 'current_usage_time_str', 'Temps d\'utilisation : --:--:--')} | Pages: {page_count} | Lignes: {line_count} | Mots: {word_count}", 3000
+                f"{usage_time} | Pages: {page_count} | Lignes: {line_count} | Mots: {word_count}", 3000
             )
         except Exception as e:
             logging.error(f"Erreur dans update_counters : {str(e)}")
@@ -2085,52 +2238,9 @@ class BrailleUI(QMainWindow):
             return
         tab.process_pending_changes()
 
-        # Détection automatique de la langue si en mode Texte -> Braille
-        logging.debug("process_debounced_conversion: Mode de conversion: %s", self.conversion_mode)
-        if self.conversion_mode == "text_to_braille":
-            tab = self.tab_widget.currentWidget()
-            if tab:
-                text_to_analyze = tab.text_input.toPlainText()
-                logging.debug("process_debounced_conversion: Texte à analyser pour détection de langue: %s", text_to_analyze[:100])
-                if text_to_analyze.strip():
-                    try:
-                        detected_lang_code = self.translator.detect_language(text_to_analyze)
-                        logging.debug(f"process_debounced_conversion: Langue détectée (code) : {detected_lang_code}")
-                        
-                        # Mapper le code de langue détecté à un nom de table Braille disponible
-                        lang_code_to_table_name = {
-                            'fr': 'Français (grade 1)',
-                            'ar': 'Arabe (grade 1)',
-                            'en': 'Anglais (grade 1)',
-                            'en-us': 'Anglais (grade 1)',
-                            'en-gb': 'Anglais (grade 1)'
-                        }
-                        
-                        corresponding_table_name = lang_code_to_table_name.get(detected_lang_code)
-                        logging.debug(f"process_debounced_conversion: Table correspondante mappée : {corresponding_table_name}")
-                        
-                        if corresponding_table_name and corresponding_table_name in self.available_tables:
-                            current_table = self.table_combo.currentText()
-                            if current_table != corresponding_table_name:
-                                logging.debug(f"process_debounced_conversion: Changement de table : {current_table} -> {corresponding_table_name}")
-                                # Désactiver temporairement les signaux pour éviter les boucles
-                                self.table_combo.blockSignals(True)
-                                self.table_combo.setCurrentText(corresponding_table_name)
-                                self.table_combo.blockSignals(False)
-                                # Forcer la mise à jour de la conversion
-                                self.update_conversion()
-                                self.status_bar.showMessage(f"Langue détectée : {detected_lang_code}, table sélectionnée : {corresponding_table_name}", 3000)
-                            else:
-                                logging.debug("process_debounced_conversion: La table actuelle correspond à la langue détectée.")
-                        else:
-                            logging.debug(f"process_debounced_conversion: Aucune table correspondante trouvée pour le code langue : {detected_lang_code}")
-                            self.status_bar.showMessage(f"Langue détectée : {detected_lang_code}. Aucune table Braille correspondante disponible.", 3000)
-
-                    except Exception as e:
-                        logging.error(f"process_debounced_conversion: Erreur lors de la détection automatique de la langue : {str(e)}", exc_info=True)
-                        self.status_bar.showMessage("Erreur lors de la détection de la langue", 3000)
-
-        # Continuer avec la mise à jour normale de la conversion
+        # Pas de changement de la table sélectionnée selon la langue détectée : en mode
+        # Texte -> Braille, chaque paragraphe est traduit avec la table de sa langue
+        # (voir language_tables)
         self.update_conversion()
 
     def update_conversion(self):
@@ -2140,8 +2250,11 @@ class BrailleUI(QMainWindow):
             return
 
         if tab._conversion_thread and tab._conversion_thread.isRunning():
-            logging.debug("update_conversion skipped: conversion thread is running")
-            return
+            # Le texte a changé : la conversion complète en cours est obsolète. Seul le jeton
+            # l'arrête ; le thread reste dans tab._conversion_threads jusqu'à sa fin
+            logging.debug("update_conversion: abandon de la conversion en cours")
+            self.braille_engine.cancel_conversions(tab)
+            tab._conversion_thread = None
 
         tab.is_updating = True
         logging.debug("Déclenchement de la conversion en temps réel")
@@ -2163,15 +2276,26 @@ class BrailleUI(QMainWindow):
                 if current_input_text != tab.original_text:
                     logging.debug("Mode Texte->Braille: text_input changed, converting to Braille")
                     if current_input_text.strip():
-                        # Effectuer une reconversion complète lorsque le texte d'entrée change
-                        formatted_text = self.braille_engine.wrap_text_by_sentence(current_input_text, self.line_width)
-                        formatted_braille = self.braille_engine.to_braille(formatted_text, self.available_tables[selected_table], self.line_width)
+                        # La traduction est conservée sans mise en page : un changement de
+                        # largeur ne demandera qu'une remise en page (voir relayout_braille)
+                        tab.braille_document = self.braille_engine.translate_document(
+                            current_input_text, self.available_tables[selected_table],
+                            priority=PRIORITY_INTERACTIVE, languages=self.language_tables()
+                        )
+                        formatted_braille = tab.braille_document.render(self.line_width)
+                        tab.braille_document_width = self.line_width
                         tab.text_output.setPlainText(formatted_braille)
                         tab.original_braille = formatted_braille
                         tab.original_text = current_input_text
+                        # Curseur braille au passage correspondant au curseur du texte
+                        offset_map = tab.braille_document.offset_map(self.line_width)
+                        self._restore_cursor_position(
+                            tab.text_output, offset_map.braille_offset(tab.text_input.textCursor().position())
+                        )
                     else:
                         tab.text_output.clear()
                         tab.original_braille = ""
+                        tab.braille_document = None
 
             elif self.conversion_mode == "braille_to_text":
                 # En mode Braille -> Texte, la zone d'entrée principale est text_input (où on tape le Braille)
@@ -2181,7 +2305,10 @@ class BrailleUI(QMainWindow):
                     if current_input_text.strip():
                         # Effectuer une conversion Braille -> Texte
                         # La fonction from_braille gère déjà le wrapping si nécessaire.
-                        text = self.braille_engine.from_braille(current_input_text, self.available_tables[selected_table], self.line_width)
+                        text = self.braille_engine.from_braille(
+                            current_input_text, self.available_tables[selected_table], self.line_width,
+                            priority=PRIORITY_INTERACTIVE
+                        )
                         tab.text_output.setPlainText(text)
                         tab.original_text = text # original_text stocke maintenant le texte clair généré
                         tab.original_braille = current_input_text # original_braille stocke le Braille tapé
@@ -0,0 +1,43 @@
+import asyncio
+import threading
+import time
+import unittest
+from backend.async_conversion import AsyncConversionGate
+
+
+class TestAsyncConversionGate(unittest.TestCase):
+    def test_identical_requests_are_coalesced(self):
+        gate = AsyncConversionGate(max_concurrency=2)
+        calls = []
+
+        def convert(token):
+            calls.append(threading.get_ident())
+            time.sleep(0.05)
+            return "⠃⠗⠇"
+
+        async def main():
+            return await asyncio.gather(*[gate.run("key", convert) for _ in range(5)])
+
+        self.assertEqual(asyncio.run(main()), ["⠃⠗⠇"] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(gate.coalesced, 4)
+
+    def test_timeout_cancels_the_token_of_abandoned_work(self):
+        gate = AsyncConversionGate()
+        tokens = []
+
+        def convert(token):
+            tokens.append(token)
+            time.sleep(0.2)
+            return "trop tard"
+
+        async def main():
+            with self.assertRaises(asyncio.TimeoutError):
+                await gate.run("lent", convert, timeout=0.01)
+
+        asyncio.run(main())
+        self.assertTrue(tokens and tokens[0].cancelled)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+from backend.batch_tuner import BatchTuner
+
+
+class TestBatchTuner(unittest.TestCase):
+    def test_fast_full_batches_grow_and_slow_batches_shrink(self):
+        tuner = BatchTuner(target_latency=0.1, initial_size=50, min_size=8, max_size=500)
+        key = ("fr.utb", "forward")
+        for _ in range(10):
+            size, _ = tuner.plan(key, 1000)
+            tuner.record_batch(key, size, 0.001)
+        grown = tuner.snapshot()[key]["batch_size"]
+        self.assertGreater(grown, 50)
+        for _ in range(10):
+            size, _ = tuner.plan(key, 1000)
+            tuner.record_batch(key, size, 1.0)
+        self.assertLess(tuner.snapshot()[key]["batch_size"], grown)
+        self.assertGreaterEqual(tuner.snapshot()[key]["batch_size"], 8)
+
+    def test_best_parallelism_is_kept(self):
+        tuner = BatchTuner(initial_size=10, max_parallel=4, explore_every=0)
+        key = ("fr.utb", "forward")
+        for _ in range(4):
+            _, parallel = tuner.plan(key, 100)
+            tuner.record_dispatch(key, parallel, 100, 0.1 if parallel == 2 else 1.0)
+        self.assertEqual(tuner.plan(key, 100)[1], 2)
+        self.assertEqual(tuner.plan(key, 5), (10, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
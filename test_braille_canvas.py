@@ -0,0 +1,77 @@
+import os
+import sys
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtGui import QFont, QTextDocument
+from PyQt5.QtWidgets import QApplication
+
+from backend.line_store import LineStore
+from frontend.braille_canvas import BrailleCanvas
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class RecordingLines(LineStore):
+    """`LineStore` qui note les plages lues par le canevas."""
+
+    def __init__(self, text):
+        super().__init__(text)
+        self.requests = []
+
+    def lines(self, start, stop):
+        self.requests.append((start, stop))
+        return super().lines(start, stop)
+
+
+class TestBrailleCanvas(unittest.TestCase):
+    def setUp(self):
+        self.source = RecordingLines("\n".join("⠁⠃⠉" * (1 + i % 5) for i in range(500)))
+        self.canvas = BrailleCanvas(QFont("DejaVu Sans", 12))
+        self.canvas.resize(300, 200)
+        self.canvas.set_source(self.source)
+        self.canvas.show()
+        app.processEvents()
+
+    def tearDown(self):
+        self.canvas.close()
+        self.canvas.deleteLater()
+
+    def visible_range(self):
+        """Plage de lignes lue lors d'un affichage complet de la zone visible."""
+        self.source.requests.clear()
+        self.canvas.viewport().repaint()
+        self.assertEqual(len(self.source.requests), 1)
+        return self.source.requests[0]
+
+    def rows(self):
+        return int(self.canvas.viewport().height() // self.canvas.atlas.cell_height) + 1
+
+    def test_only_visible_lines_are_read(self):
+        self.assertEqual(self.visible_range(), (0, self.rows()))
+        self.canvas.verticalScrollBar().setValue(120)
+        self.assertEqual(self.visible_range(), (120, 120 + self.rows()))
+        self.assertLess(self.rows(), 50)
+
+    def test_zoom_shows_fewer_lines(self):
+        rows = self.rows()
+        page_step = self.canvas.verticalScrollBar().pageStep()
+        self.canvas.set_font(QFont("DejaVu Sans", 24))
+        self.assertLess(self.rows(), rows)
+        self.assertLess(self.canvas.verticalScrollBar().pageStep(), page_step)
+        self.assertEqual(self.canvas.verticalScrollBar().maximum(), 500 - self.canvas.verticalScrollBar().pageStep())
+        self.canvas.verticalScrollBar().setValue(300)
+        self.assertEqual(self.visible_range(), (300, 300 + self.rows()))
+
+    def test_document_edits_update_the_scroll_range(self):
+        document = QTextDocument("\n".join("⠁" for _ in range(3)))
+        self.canvas.set_document(document)
+        self.assertEqual(self.canvas.verticalScrollBar().maximum(), 0)
+        document.setPlainText("\n".join("⠁" for _ in range(400)))
+        page_step = self.canvas.verticalScrollBar().pageStep()
+        self.assertEqual(self.canvas.verticalScrollBar().maximum(), 400 - page_step)
+
+
+if __name__ == "__main__":
+    unittest.main()
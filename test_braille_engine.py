@@ -0,0 +1,274 @@
+import importlib
+import os
+import stat
+import sys
+import tempfile
+import time
+import types
+import unittest
+from itertools import count, islice
+from unittest import mock
+
+from backend import braille_engine
+from backend.braille_engine import LouisBackend
+from backend.scheduler import PRIORITY_BACKGROUND, PRIORITY_VISIBLE
+
+# Faux lou_translate : lettres a-z <-> cellules braille, autres caractères inchangés
+FAKE_LOU_TRANSLATE = """
+import sys
+letters = "abcdefghijklmnopqrstuvwxyz"
+cells = "⠁⠃⠉⠙⠑⠋⠛⠓⠊⠚⠅⠇⠍⠝⠕⠏⠟⠗⠎⠞⠥⠧⠺⠭⠽⠵"
+if "--version" in sys.argv:
+    print("lou_translate (liblouis) 3.21.0")
+    sys.exit(0)
+mapping = dict(zip(letters, cells)) if "--backward" not in sys.argv else dict(zip(cells, letters))
+for line in sys.stdin:
+    sys.stdout.write("".join(mapping.get(char, char) for char in line))
+    sys.stdout.flush()
+"""
+TABLES = ("fr-bfu-comp6.utb", "fr-bfu-g2.ctb", "ar-ar-g1.utb", "en-us-g1.ctb", "en-us-g2.ctb")
+
+
+def fake_louis(translate_string=lambda tables, line, mode=0: line.upper()):
+    """Faux module `louis` : majuscules à l'aller, minuscules au retour."""
+    return types.SimpleNamespace(
+        dotsIO=1, ucBrl=2, version=lambda: "fake",
+        translateString=translate_string,
+        backTranslateString=lambda tables, line, mode=0: line.lower(),
+    )
+
+
+def make_engine(directory, louis_module=None, module=braille_engine):
+    """
+    Moteur (de `module`) sur un faux lou_translate et des tables vides, sans cache
+    disque ; sans liblouis en mémoire, sauf `louis_module` (faux module `louis`).
+    """
+    lou_path = os.path.join(directory, "lou_translate")
+    with open(lou_path, "w", encoding="utf-8") as script:
+        script.write(f"#!{sys.executable}\n{FAKE_LOU_TRANSLATE}")
+    os.chmod(lou_path, os.stat(lou_path).st_mode | stat.S_IXUSR)
+    tables_dir = os.path.join(directory, "tables")
+    os.makedirs(tables_dir)
+    for table in TABLES + ("unicode.dis",):
+        with open(os.path.join(tables_dir, table), "w", encoding="utf-8") as table_file:
+            table_file.write(f"# {table}\n")
+    # None dans sys.modules : `import louis` lève ImportError
+    with mock.patch.dict(sys.modules, {"louis": louis_module}), \
+            mock.patch.object(module, "TRANSLATION_DISK_CACHE_PATH", ""):
+        return module.BrailleEngine(lou_path, tables_dir)
+
+
+@unittest.skipIf(os.name == "nt", "scripts exécutables POSIX")
+class TestBrailleEngine(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.engine = make_engine(self.directory.name)
+        self.tables = self.engine.get_available_tables()
+        self.backend_lines = []
+        translate = self.engine.backend.translate
+
+        def recording_translate(lines, table_path, forward=True, capitalize=False):
+            self.backend_lines.append((os.path.basename(table_path), list(lines)))
+            return translate(lines, table_path, forward, capitalize)
+
+        self.engine.backend.translate = recording_translate
+
+    def tearDown(self):
+        self.engine.shutdown()
+        self.directory.cleanup()
+
+    def sent_lines(self):
+        return [line for _, lines in self.backend_lines for line in lines]
+
+    def recording_submissions(self, submitted):
+        """Note (première ligne du bloc, priorité) de chaque bloc soumis à l'exécuteur."""
+        submit = self.engine.executor.submit
+
+        def recording_submit(fn, chunk, *args, priority=PRIORITY_VISIBLE, **kwargs):
+            submitted.append((chunk[0], priority))
+            return submit(fn, chunk, *args, priority=priority, **kwargs)
+
+        return mock.patch.object(self.engine.executor, "submit", recording_submit)
+
+    def test_language_tables_from_registry(self):
+        names = {language: os.path.basename(path)
+                 for language, path in self.engine.language_tables(self.tables["Français (grade 2)"]).items()}
+        self.assertEqual(names, {"ar": "ar-ar-g1.utb", "en": "en-us-g1.ctb", "fr": "fr-bfu-g2.ctb"})
+
+    def test_cold_table_waits_for_its_pool_instead_of_spawning_per_batch(self):
+        table = self.tables["Anglais (grade 1)"]
+        with mock.patch.object(self.engine.backend, "_run_lou_translate", side_effect=AssertionError("processus par lot")):
+            self.assertEqual(self.engine.to_braille("abc", table, line_width=80), "⠁⠃⠉")
+            self.assertEqual(self.engine.from_braille("⠁⠃⠉", table, line_width=80), "abc")
+
+    def test_chunks_start_with_visible_ones_then_nearest_first(self):
+        table = self.tables["Anglais (grade 2)"]
+        chunks = [[f"c{index}"] for index in range(10)]
+        submitted = []
+        with self.recording_submissions(submitted):
+            results = dict(self.engine.translate_chunks(chunks, table, visible=[6], max_in_flight=1))
+
+        expected = ["c6", "c5", "c7", "c4", "c8", "c3", "c9", "c2", "c1", "c0"]
+        # Un seul bloc à la fois : le moteur reçoit les blocs dans l'ordre de soumission
+        self.assertEqual(self.sent_lines(), expected)
+        self.assertEqual(submitted, [("c6", PRIORITY_VISIBLE)] + [(line, PRIORITY_BACKGROUND) for line in expected[1:]])
+        self.assertEqual(results, {index: [f"⠉{index}"] for index in range(10)})
+
+    def test_all_visible_chunks_are_submitted_before_the_rest(self):
+        table = self.tables["Anglais (grade 2)"]
+        chunks = [[f"c{index}"] for index in range(8)]
+        submitted = []
+        with self.recording_submissions(submitted):
+            results = dict(self.engine.translate_chunks(chunks, table, visible=[3, 4], max_in_flight=2))
+
+        self.assertEqual(submitted[:2], [("c3", PRIORITY_VISIBLE), ("c4", PRIORITY_VISIBLE)])
+        self.assertEqual(
+            submitted[2:], [(f"c{index}", PRIORITY_BACKGROUND) for index in (2, 5, 1, 6, 0, 7)]
+        )
+        self.assertEqual(sorted(results), list(range(8)))
+
+    def test_stream_keeps_order_across_batches(self):
+        table = self.tables["Français (grade 1)"]
+        lines = ["" if i % 5 == 0 else f"{'abc'[i % 3]}{i}\n" for i in range(50)]
+        braille = list(self.engine.to_braille_stream(lines, table, line_width=80, chunk_size=7, max_in_flight=3))
+        expected = ["" if not line else "⠁⠃⠉"["abc".index(line[0])] + line[1:].rstrip("\n") for line in lines]
+        self.assertEqual(braille, expected)
+        text = list(self.engine.from_braille_stream(braille, table, line_width=80, chunk_size=4, max_in_flight=2))
+        self.assertEqual(text, [line.rstrip("\n") for line in lines])
+
+    def test_stream_reads_ahead_at_most_max_in_flight_batches(self):
+        table = self.tables["Français (grade 1)"]
+        read = []
+
+        def endless_input():
+            for i in count():
+                read.append(i)
+                yield f"a{i}"
+
+        stream = self.engine.to_braille_stream(endless_input(), table, chunk_size=5, max_in_flight=3)
+        for produced, line in enumerate(islice(stream, 40), start=1):
+            self.assertEqual(line, f"⠁{produced - 1}")
+            self.assertLessEqual(len(read) - produced, 5 * 3)
+        stream.close()
+
+    def test_closing_a_stream_cancels_pending_batches(self):
+        table = self.tables["Français (grade 1)"]
+        translate = self.engine.backend.translate
+        translated = set()  # blocs (de 10 lignes) partis au moteur
+
+        def slow_translate(lines, table_path, forward=True, capitalize=False):
+            chunks = {int(line[1:]) // 10 for line in lines}
+            # Premier bloc rapide : les suivants sont encore en cours ou en file à la fermeture
+            time.sleep(0 if chunks == {0} else 0.3)
+            translated.update(chunks)
+            return translate(lines, table_path, forward, capitalize)
+
+        self.engine.backend.translate = slow_translate
+        stream = self.engine.to_braille_stream((f"b{i}" for i in range(400)), table, chunk_size=10, max_in_flight=8)
+        self.assertEqual(next(stream), "⠃0")
+        stream.close()
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            stats = self.engine.scheduler_stats()["background"]
+            if stats["queued"] == 0 and stats["submitted"] == stats["completed"] + stats["cancelled"]:
+                break
+            time.sleep(0.05)
+        self.assertEqual(stats["queued"], 0)
+        self.assertEqual(stats["submitted"], stats["completed"] + stats["cancelled"])
+        # Seuls les blocs lus avant la fermeture sont soumis, et ceux encore en file ne partent pas au moteur
+        self.assertLessEqual(stats["submitted"], 8)
+        self.assertLess(len(translated), stats["submitted"])
+
+    def test_mixed_document_uses_the_table_of_each_language_run(self):
+        translate = self.engine.backend.translate
+
+        def tagged_translate(lines, table_path, forward=True, capitalize=False):
+            tag = os.path.basename(table_path).split("-")[0]
+            return [f"{tag}:{output}" for output in translate(lines, table_path, forward, capitalize)]
+
+        self.engine.backend.translate = tagged_translate
+        french = self.tables["Français (grade 1)"]
+        languages = self.engine.language_tables(french)
+        lines = ["le chat dort dans la maison.", "مرحبا بالعالم", "1234", "", "une autre phrase dans le texte.", "مرحبا"]
+        expected = [
+            "fr:⠇⠑ ⠉⠓⠁⠞ ⠙⠕⠗⠞ ⠙⠁⠝⠎ ⠇⠁ ⠍⠁⠊⠎⠕⠝.", "ar:" + "مرحبا بالعالم"[::-1], "ar:4321", "",
+            "fr:⠥⠝⠑ ⠁⠥⠞⠗⠑ ⠏⠓⠗⠁⠎⠑ ⠙⠁⠝⠎ ⠇⠑ ⠞⠑⠭⠞⠑.", "ar:" + "مرحبا"[::-1],
+        ]
+        document = self.engine.translate_document("\n".join(lines), french, languages=languages)
+        self.assertEqual(document.translated_lines, expected)
+        self.assertFalse(document.word_aligned)
+        # Une table ne reçoit que les lignes de sa langue, quel que soit le découpage en blocs
+        sent = {(table, line) for table, batch in self.backend_lines for line in batch}
+        self.assertEqual({table for table, _ in sent}, {"fr-bfu-comp6.utb", "ar-ar-g1.utb"})
+        self.assertIn(("ar-ar-g1.utb", "4321"), sent)
+        chunks = [lines[:3], lines[3:]]
+        translated = dict(self.engine.translate_chunks(chunks, french, languages=languages))
+        self.assertEqual(translated[0] + translated[1], expected)
+
+    def test_fast_path_is_dropped_when_the_table_changes(self):
+        table = self.tables["Français (grade 1)"]
+        self.assertIsNotNone(self.engine.build_fast_path(table))
+        self.assertEqual(self.engine._translate_lines(["abc"], table), ["⠁⠃⠉"])
+        self.assertNotIn("abc", self.sent_lines())
+
+        with open(table, "a", encoding="utf-8") as table_file:
+            table_file.write("always abc 1\n")
+        os.utime(table, (time.time() + 10, time.time() + 10))
+        self.assertEqual(self.engine._translate_lines(["abc"], table), ["⠁⠃⠉"])
+        self.assertIn("abc", self.sent_lines())
+        # Nouvelle correspondance sondée en arrière-plan, sans a, b ni c (règle sur plusieurs caractères)
+        deadline = time.monotonic() + 10
+        while table not in self.engine._fast_paths and time.monotonic() < deadline:
+            time.sleep(0.05)
+        fingerprint, fast_path = self.engine._fast_paths[table]
+        self.assertEqual(fingerprint, self.engine.table_registry.fingerprint(table))
+        self.assertIsNone(fast_path.translate("abc"))
+
+
+@unittest.skipIf(os.name == "nt", "scripts exécutables POSIX")
+class TestBackendSelection(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.engines = []
+
+    def tearDown(self):
+        for engine in self.engines:
+            engine.shutdown()
+        self.directory.cleanup()
+
+    def engine(self, louis_module, module=braille_engine):
+        engine = make_engine(tempfile.mkdtemp(dir=self.directory.name), louis_module, module)
+        self.engines.append(engine)
+        return engine
+
+    def test_in_process_backend_is_preferred(self):
+        engine = self.engine(fake_louis())
+        self.assertIsInstance(engine.backend, LouisBackend)
+        table = engine.get_available_tables()["Français (grade 1)"]
+        self.assertEqual(engine.backend.translate(["abc"], table), ["ABC"])
+        self.assertEqual(engine.backend.translate(["ABC"], table, forward=False), ["abc"])
+        # Mode majuscules absent de liblouis en mémoire : confié au faux lou_translate
+        self.assertEqual(engine.backend.translate(["abc"], table, capitalize=True), ["⠁⠃⠉"])
+
+    def test_subprocess_backend_when_probe_fails(self):
+        def broken(tables, line, mode=0):
+            raise RuntimeError("table introuvable")
+
+        engine = self.engine(fake_louis(broken))
+        self.assertIsInstance(engine.backend, braille_engine.SubprocessBackend)
+        table = engine.get_available_tables()["Français (grade 1)"]
+        self.assertEqual(engine.backend.translate(["abc"], table), ["⠁⠃⠉"])
+
+    def test_engine_imports_without_louis_module(self):
+        with mock.patch.dict(sys.modules, {"louis": None}):
+            for name in ("backend.braille_engine", "backend.language_detector"):
+                sys.modules.pop(name)
+            module = importlib.import_module("backend.braille_engine")
+        engine = self.engine(None, module)
+        self.assertIsInstance(engine.backend, module.SubprocessBackend)
+        table = engine.get_available_tables()["Français (grade 1)"]
+        self.assertEqual(engine.to_braille("abc", table, line_width=80), "⠁⠃⠉")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,15 @@
 import unittest
+from unittest import mock
+from backend import braille_engine
 from backend.braille_engine import BrailleEngine
 import json
 import os
 
 class TestBrailleConversion(unittest.TestCase):
     def setUp(self):
-        self.braille_engine = BrailleEngine()
+        # Pas de cache disque : les tests n'écrivent rien dans l'arborescence ni le dossier de l'utilisateur
+        with mock.patch.object(braille_engine, "TRANSLATION_DISK_CACHE_PATH", ""):
+            self.braille_engine = BrailleEngine()
         with open('custom_tables.json', 'r', encoding='utf-8') as f:
             self.custom_tables = json.load(f)
         
@@ -118,5 +122,16 @@ class TestBrailleConversion(unittest.TestCase):
         self.assertIsNotNone(text_ar_back, "La conversion depuis le braille a échoué lors du collage (arabe).")
         self.assertEqual(text_ar, text_ar_back, "Le texte arabe reconverti ne correspond pas après collage en mode inverse.")
 
+    def test_many_matches_single_conversions(self):
+        """Les conversions groupées donnent le même résultat que les conversions une à une"""
+        texts = ["Bonjour le monde", "", "Ça va bien", "Bonjour le monde", "Noël approche\nÀ bientôt"]
+        tables = [self.french_table] * 4 + [self.arabic_table]
+        braille = self.braille_engine.to_braille_many(texts, tables)
+        self.assertEqual(braille, [self.braille_engine.to_braille(t, p) for t, p in zip(texts, tables)])
+        self.assertEqual(
+            self.braille_engine.from_braille_many(braille[:4], self.french_table),
+            [self.braille_engine.from_braille(b, self.french_table) for b in braille[:4]]
+        )
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,24 @@
+import unittest
+from backend.counters import TextCounters
+
+
+class TestTextCounters(unittest.TestCase):
+    def test_counts_rows_and_words(self):
+        counters = TextCounters("un deux trois\n\n" + "x" * 70, width=33)
+        self.assertEqual(counters.word_count, 4)
+        # 13 caractères : 1 rangée, ligne vide : 1, 70 caractères : 3
+        self.assertEqual(counters.line_count, 5)
+        self.assertEqual(counters.page_count(2), 3)
+
+    def test_replace_lines_matches_full_count(self):
+        counters = TextCounters("a b\nc\nd e f", width=2)
+        counters.replace_lines(1, 1, ["g h i j", "", "k"])
+        expected = TextCounters("a b\ng h i j\n\nk\nd e f", width=2)
+        self.assertEqual((counters.word_count, counters.line_count, counters.paragraph_count),
+                         (expected.word_count, expected.line_count, expected.paragraph_count))
+        counters.set_width(100)
+        self.assertEqual(counters.line_count, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+from backend.custom_substitution import SubstitutionTrie
+
+
+class TestSubstitutionTrie(unittest.TestCase):
+    def test_forward_replaces_like_sequential_replace(self):
+        table = {"à": "⠡", "ç": "⠯", "l'": "⠇⠄", "é": "⠈⠑"}
+        text = "l'été à Alger, ça va"
+        expected = text
+        for char_text, braille in table.items():
+            expected = expected.replace(char_text, braille)
+        self.assertEqual(SubstitutionTrie.forward(table).apply(text), expected)
+
+    def test_longest_match_wins(self):
+        trie = SubstitutionTrie([("a", "1"), ("ab", "2"), ("abc", "3")])
+        self.assertEqual(trie.apply("abcabxa"), "32x1")
+
+    def test_backward_prefers_longest_braille_and_first_duplicate(self):
+        table = {"َ": "⠨", "ً": "⠸⠨", "،": "⠂", ",": "⠂"}
+        trie = SubstitutionTrie.backward(table)
+        self.assertEqual(trie.apply("⠸⠨⠨⠂"), "ًَ،")
+
+    def test_empty_table_returns_text_unchanged(self):
+        trie = SubstitutionTrie.forward({})
+        self.assertFalse(trie)
+        self.assertEqual(trie.apply("texte"), "texte")
+
+
+if __name__ == '__main__':
+    unittest.main()
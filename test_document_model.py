@@ -0,0 +1,52 @@
+import unittest
+from backend.document_model import DocumentModel
+
+
+class TestDocumentModel(unittest.TestCase):
+    def test_edits_follow_a_plain_string(self):
+        text = "\n".join(f"paragraphe {i}" for i in range(50))
+        model = DocumentModel(text, chunk_size=4)
+        edits = [(3, 3, "x"), (20, 40, ""), (5, 5, "a\nb\n"), (0, len(text) // 2, "début\n"), (7, 9, "\n\n")]
+        for start, end, inserted in edits:
+            model.replace(start, end, inserted)
+            text = text[:start] + inserted + text[end:]
+            self.assertEqual(model.text(), text)
+            self.assertEqual(len(model), len(text))
+            self.assertEqual(model.paragraph_count, text.count("\n") + 1)
+        self.assertEqual(model.slice(4, 30), text[4:30])
+        index, position = model.locate(12)
+        self.assertEqual(model.paragraph_start(index) + position, 12)
+
+    def test_only_edited_paragraphs_are_retranslated(self):
+        calls = []
+
+        def translate(lines):
+            calls.append(list(lines))
+            return [line.upper() for line in lines]
+
+        model = DocumentModel("\n".join(f"paragraphe {i}" for i in range(100)), chunk_size=8)
+        self.assertEqual(model.retranslate("fr", translate), 100)
+        calls.clear()
+
+        model.insert(0, "titre\n\n")
+        start = model.paragraph_start(40)
+        model.replace(start, start + len("paragraphe"), "ligne")
+        self.assertEqual(model.stale_count("fr"), 2)
+        model.retranslate("fr", translate)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(calls[0]), ["ligne 38", "titre"])
+        self.assertEqual(model.braille_text(), model.text().upper())
+        self.assertEqual(model.stale_count("en"), 101)
+
+    def test_full_translation_is_dropped_if_the_document_changed(self):
+        model = DocumentModel("a\nb")
+        version = model.version
+        model.insert(1, "c")
+        self.assertFalse(model.store_all("fr", ["A", "B"], version))
+        self.assertTrue(model.store_all("fr", ["AC", "B"], model.version))
+        self.assertEqual(model.braille_text(), "AC\nB")
+        self.assertEqual(model.stale_count("fr"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+from backend.fast_path import Grade1FastPath, table_context_characters
+
+CELLS = {"a": "⠁", "b": "⠃", "c": "⠉", "e": "⠑", "1": "⠁", "2": "⠃", ",": "⠂", "-": "⠤", " ": "⠀"}
+
+
+def toy_translate(lines):
+    """Table jouet : indicateur de majuscule, indicateur numérique et trait d'union doublé en tiret."""
+    outputs = []
+    for line in lines:
+        line = line.replace("--", "—").replace("  ", " ")
+        output, previous = [], ""
+        for char in line:
+            # Indicateurs en tête d'une suite de chiffres ou de majuscules seulement
+            if char.isdigit() and not previous.isdigit():
+                output.append("⠼")
+            if char.isupper() and not previous.isupper():
+                output.append("⠨")
+            previous = char
+            char = char.lower()
+            output.append("⠠⠤" if char == "—" else CELLS.get(char, "⠿"))
+        outputs.append("".join(output))
+    return outputs
+
+
+class TestGrade1FastPath(unittest.TestCase):
+    def setUp(self):
+        self.fast_path = Grade1FastPath.probe(toy_translate, candidates="abceABC12,-")
+
+    def test_probe_separates_context_dependent_characters(self):
+        self.assertEqual(set(self.fast_path.mapping), set("abce, "))
+        self.assertTrue({"A", "B", "C", "1", "2", "-"} <= self.fast_path.dependent)
+        self.assertFalse(self.fast_path.double_spaces)
+
+    def test_translate_only_covered_lines(self):
+        self.assertEqual(self.fast_path.translate("abc, ace"), toy_translate(["abc, ace"])[0])
+        for line in ("Abc", "a1", "a-b", " abc", "abc ", "a  b", "abd"):
+            self.assertIsNone(self.fast_path.translate(line))
+
+    def test_verify_reports_mismatches(self):
+        corpus = ["abc, bac", "Cab", "cab e"]
+        self.assertEqual(self.fast_path.verify(corpus, toy_translate), [])
+        wrong = Grade1FastPath({**self.fast_path.mapping, "e": "⠿"})
+        self.assertEqual(wrong.verify(corpus, toy_translate), [("cab e", "⠉⠁⠃⠀⠿", "⠉⠁⠃⠀⠑")])
+
+
+    def test_multi_character_rules_are_context_dependent(self):
+        # Règle de trois caractères : invisible pour le sondage par paires
+        def ellipsis_translate(lines):
+            return [toy_translate([line.replace("...", "…")])[0].replace("⠿", "⠦") for line in lines]
+
+        blind = Grade1FastPath.probe(ellipsis_translate, candidates="abc.")
+        self.assertNotEqual(blind.translate("a..."), ellipsis_translate(["a..."])[0])
+
+        with tempfile.TemporaryDirectory() as directory:
+            table = os.path.join(directory, "toy.utb")
+            with open(table, "w", encoding="utf-8") as table_file:
+                table_file.write("# table jouet\nalways a 1\nalways ... 236\nmidnum , 2\nnofor context \"b\" @2\n")
+            dependent = table_context_characters([table])
+        self.assertEqual(dependent, {".", ",", "b"})
+        fast_path = Grade1FastPath.probe(ellipsis_translate, candidates="abc.,", dependent=dependent)
+        self.assertIsNone(fast_path.translate("a..."))
+        self.assertEqual(fast_path.translate("ca"), "⠉⠁")
+
+
+if __name__ == "__main__":
+    unittest.main()
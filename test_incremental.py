@@ -0,0 +1,18 @@
+import unittest
+from backend.incremental import diff_lines
+
+
+class TestDiffLines(unittest.TestCase):
+    def test_inserted_line_does_not_shift_the_rest(self):
+        old = ["un", "deux", "trois", "quatre"]
+        new = ["zéro", "un", "deux", "trois bis", "quatre"]
+        self.assertEqual(diff_lines(old, new), [
+            ("insert", 0, 0, 0, 1),
+            ("equal", 0, 2, 1, 3),
+            ("replace", 2, 3, 3, 4),
+            ("equal", 3, 4, 4, 5),
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
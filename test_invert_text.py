@@ -0,0 +1,91 @@
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtGui import QFont, QTextCursor
+from PyQt5.QtWidgets import QApplication, QLabel, QTextEdit, QWidget
+
+from frontend.braille_canvas import BrailleCanvas
+from frontend.ui import BrailleUI
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+def type_text(edit, text):
+    cursor = edit.textCursor()
+    cursor.movePosition(QTextCursor.End)
+    cursor.insertText(text)
+
+
+class TestInvertText(unittest.TestCase):
+    def setUp(self):
+        tab = QWidget()
+        tab._conversion_thread = None
+        tab.text_input = QTextEdit(tab)
+        tab.text_output = QTextEdit(tab)
+        tab.text_input.setFont(QFont("DejaVu Sans", 11))
+        tab.text_output.setFont(QFont("DejaVu Sans", 15))
+        tab.text_input_label = QLabel("Texte :", tab)
+        tab.text_output_label = QLabel("Braille :", tab)
+        tab.canvas_view = True
+        tab.braille_canvas = BrailleCanvas(parent=tab)
+        tab.braille_canvas.set_document(tab.text_output.document())
+        self.tab = tab
+        self.counters = []
+        self.window = SimpleNamespace(
+            tab_widget=SimpleNamespace(currentWidget=lambda: tab),
+            status_bar=SimpleNamespace(showMessage=lambda *args: None),
+            conversion_mode="text_to_braille",
+            update_counters=lambda: self.counters.append(True),
+        )
+
+    def tearDown(self):
+        self.tab.deleteLater()
+
+    def test_documents_are_swapped_with_their_undo_history(self):
+        type_text(self.tab.text_input, "bonjour")
+        type_text(self.tab.text_output, "⠃⠕⠝⠚⠕⠥⠗")
+        input_document = self.tab.text_input.document()
+        output_document = self.tab.text_output.document()
+
+        BrailleUI.invert_text(self.window)
+
+        self.assertIs(self.tab.text_input.document(), output_document)
+        self.assertIs(self.tab.text_output.document(), input_document)
+        self.assertEqual(self.tab.text_input.toPlainText(), "⠃⠕⠝⠚⠕⠥⠗")
+        self.assertEqual(self.tab.text_output.toPlainText(), "bonjour")
+        # Chaque zone garde sa police, le canevas suit le nouveau document de sortie
+        self.assertEqual(self.tab.text_input.font().pointSize(), 11)
+        self.assertEqual(self.tab.text_output.font().pointSize(), 15)
+        self.assertIs(self.tab.braille_canvas.source.document, input_document)
+        self.assertEqual(self.window.conversion_mode, "braille_to_text")
+        self.assertEqual(self.tab.text_input_label.text(), "Braille :")
+        self.assertEqual(self.counters, [True])
+
+        # L'historique d'annulation suit le document
+        self.assertTrue(self.tab.text_input.document().isUndoAvailable())
+        self.tab.text_input.undo()
+        self.assertEqual(self.tab.text_input.toPlainText(), "")
+        self.tab.text_output.undo()
+        self.assertEqual(self.tab.text_output.toPlainText(), "")
+
+    def test_round_trip_keeps_both_documents(self):
+        type_text(self.tab.text_input, "texte")
+        input_document = self.tab.text_input.document()
+        output_document = self.tab.text_output.document()
+
+        BrailleUI.invert_text(self.window)
+        BrailleUI.invert_text(self.window)
+
+        self.assertIs(self.tab.text_input.document(), input_document)
+        self.assertIs(self.tab.text_output.document(), output_document)
+        self.assertEqual(self.tab.text_input.toPlainText(), "texte")
+        self.assertEqual(self.window.conversion_mode, "text_to_braille")
+        self.assertEqual(self.tab.text_output_label.text(), "Braille :")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+from backend.language_detector import LanguageDetector
+
+
+class TestLanguageDetector(unittest.TestCase):
+    def test_detects_script_and_latin_language(self):
+        detector = LanguageDetector()
+        self.assertEqual(detector.detect_language("مرحبا بكم في محول النصوص إلى البرايل!"), "ar")
+        self.assertEqual(detector.detect_language("Bienvenue dans le convertisseur de texte"), "fr")
+        self.assertEqual(detector.detect_language("Welcome to the text converter"), "en")
+        # Quelques mots arabes dans un texte français : l'écriture majoritaire l'emporte
+        self.assertEqual(detector.detect_language("Le mot مرحبا veut dire bonjour dans la langue arabe"), "fr")
+
+    def test_sample_is_bounded_and_includes_edited_paragraph(self):
+        text = "The cat is on the table.\n" * 1000 + "Le chien dort dans la maison et le chat mange."
+        paragraphs = LanguageDetector.sample(text, position=len(text) - 5, sample_chars=100)
+        self.assertLessEqual(sum(len(p) for p in paragraphs[:-1]), 100)
+        self.assertEqual(paragraphs[-1], "Le chien dort dans la maison et le chat mange.")
+
+    def test_language_runs_attach_undecided_lines_to_previous_run(self):
+        detector = LanguageDetector()
+        lines = ["1234", "Le chat dort dans la maison.", "", "مرحبا بالعالم", "2024", "The cat is on the table."]
+        self.assertEqual(detector.language_runs(lines, default="fr"), [("fr", 0, 3), ("ar", 3, 5), ("en", 5, 6)])
+        self.assertEqual(detector.language_runs(["1234", ""], default="fr", previous="ar"), [("ar", 0, 2)])
+        self.assertEqual(LanguageDetector.table_language("Arabe (grade 1)"), "ar")
+
+    def test_profiles_are_cached_per_paragraph(self):
+        detector = LanguageDetector(cache_size=2)
+        detector.detect_paragraphs(["un", "deux", "trois"])
+        self.assertEqual(list(detector._profiles), ["deux", "trois"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from backend.layout import (
+    BRAILLE, SENTENCE, STREAM, ChunkedRender, LayoutCache, LineBreaks, StreamingRender, TranslatedDocument, break_spans, break_tokens,
+    fill_words, paragraph_chunks, tokenize, wrap_stream,
+)
+
+
+class TestLayout(unittest.TestCase):
+    def test_wrap_keeps_words_and_cuts_only_long_ones(self):
+        cache = LayoutCache()
+        self.assertEqual(cache.wrap_sentence("le petit chat dort", 9), "le petit\nchat dort")
+        self.assertEqual(cache.wrap_sentence("abcdefghij xy", 4), "abcd\nefgh\nij\nxy")
+        self.assertEqual(cache.wrap_sentence("un\n\ndeux", 10), "un\n\ndeux")
+
+    def test_line_breaks_are_computed_once_for_all_widths(self):
+        breaks = LineBreaks("un deux trois quatre")
+        tokens = breaks.tokens
+        self.assertEqual(breaks.wrap(8), ["un deux", "trois", "quatre"])
+        self.assertEqual(breaks.wrap(13), ["un deux trois", "quatre"])
+        self.assertIs(breaks.tokens, tokens)
+
+    def test_policies_reproduce_each_historical_wrapper(self):
+        tokens = tokenize("ab   cdefgh ij")
+        self.assertEqual(break_tokens(tokens, 4, SENTENCE), ["ab", "cdef", "gh", "ij"])
+        self.assertEqual(break_tokens(tokens, 4, BRAILLE), ["ab", "cdef", "gh", "ij"])
+        self.assertEqual(break_tokens(tokenize("ab cdefgh"), 4, STREAM), ["ab", "cdefgh"])
+        self.assertEqual(wrap_stream("un\ndeux trois", 8), "un\ndeux\ntrois")
+        self.assertEqual(fill_words("un   deux\ntrois", 8), "un deux\ntrois")
+
+    def test_line_level_breaking_matches_token_breaking(self):
+        text = " le  braille anticonstitutionnellement est\tun système " * 20
+        for width in (1, 3, 7, 12, 33):
+            for policy in (SENTENCE, STREAM):
+                self.assertEqual(break_spans(text, width, policy), break_tokens(tokenize(text), width, policy))
+
+    def test_document_renders_any_width_without_retranslation(self):
+        document = TranslatedDocument("a b\n\nc", ["⠁ ⠃", "", "⠉"], LayoutCache(), table_path="t.utb", version=1)
+        self.assertEqual(document.render(1), "⠁\n⠃\n⣍\n⠉")
+        self.assertEqual(document.render(10), "⠁ ⠃\n⣍\n⠉")
+        self.assertTrue(document.matches("a b\n\nc", "t.utb", 1))
+        self.assertFalse(document.matches("a b\n\nc", "t.utb", 2))
+
+    def test_chunks_end_on_paragraph_boundaries(self):
+        lines = ["un deux", "trois", "", "quatre", "", "", "cinq six sept"]
+        chunks = list(paragraph_chunks(lines, 8))
+        self.assertEqual(chunks, [["un deux", "trois", ""], ["quatre", ""], ["", "cinq six sept"]])
+        self.assertEqual(list(paragraph_chunks(["abcdef"] * 3, 4)), [["abcdef", "abcdef"], ["abcdef"]])
+
+    def test_streamed_chunks_render_like_the_whole_document(self):
+        lines = ["⠁ ⠃ ⠉", "", "", "⠙  ", "", "", "", "⠑ ⠋", ""]
+        cache = LayoutCache()
+        expected = TranslatedDocument("\n".join(lines), lines, cache).render(3)
+        for size in range(1, 12):
+            render = StreamingRender(cache, 3)
+            self.assertEqual("".join(render.feed(chunk) for chunk in paragraph_chunks(lines, size)), expected)
+            self.assertEqual(render.translated_lines, lines)
+
+    def test_chunks_placed_out_of_order_render_like_the_whole_document(self):
+        lines = ["⠁ ⠃ ⠉", "", "", "⠙", "", "⠑ ⠋ ⠛", "", "", "", "⠓", ""]
+        cache = LayoutCache()
+        expected = TranslatedDocument("\n".join(lines), lines, cache).render(3)
+        chunks = list(paragraph_chunks(lines, 3))
+        render = ChunkedRender(cache, 3, chunks)
+        self.assertEqual(render.chunks_between(4, 5), [1, 2])
+        rendered = ""
+        for index in [2, 0, 4, 3, 1]:
+            position, piece = render.place(index, chunks[index])
+            rendered = rendered[:position] + piece + rendered[position:]
+        self.assertTrue(render.complete)
+        self.assertEqual(rendered, expected)
+        self.assertEqual(render.translated_lines, lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+from backend.document_model import DocumentModel
+from backend.line_store import LineStore, PageIndex
+
+
+class TestLineStore(unittest.TestCase):
+    def test_lines_are_read_on_demand(self):
+        store = LineStore("un\ndeux")
+        store.append(" trois\n\nquatre")
+        self.assertEqual(store.line_count, 4)
+        self.assertEqual(store.lines(1, 3), ["deux trois", ""])
+        self.assertEqual(store.lines(2, 10), ["", "quatre"])
+        self.assertEqual(store.line_start(3), len("un\ndeux trois\n\n"))
+        self.assertEqual(list(store.line_lengths()), [2, 10, 0, 6])
+
+    def test_page_index_counts_wrapped_rows(self):
+        lengths = [10, 0, 25, 3, 40, 1]
+        index = PageIndex(lengths, rows_per_page=3, width=10)
+        # 25 caractères : 3 rangées, 40 : 4 (page à elle seule)
+        self.assertEqual([index.page_lines(page) for page in range(index.page_count)],
+                         [(0, 2), (2, 3), (3, 4), (4, 5), (5, 6)])
+        self.assertEqual(index.page_of_line(2), 1)
+        index.shift(1, 2)
+        self.assertEqual(index.page_lines(1), (2, 5))
+        self.assertEqual(index.page_lines(4), (7, 8))
+
+    def test_document_model_reads_like_a_line_store(self):
+        text = "\n".join(f"paragraphe {i}" for i in range(20))
+        model = DocumentModel(text, chunk_size=3)
+        store = LineStore(text)
+        self.assertEqual(model.lines(4, 11), store.lines(4, 11))
+        self.assertEqual(model.line_start(7), store.line_start(7))
+        self.assertEqual(list(model.line_lengths()), list(store.line_lengths()))
+
+
+if __name__ == "__main__":
+    unittest.main()
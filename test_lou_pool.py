@@ -0,0 +1,110 @@
+import os
+import stat
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from backend.lou_pool import LouTranslatePool, LouPoolError
+
+# Faux lou_translate : renvoie chaque ligne en majuscules, ligne par ligne
+ECHO = """
+import sys, time
+for line in sys.stdin:
+    time.sleep({delay})
+    sys.stdout.write(line.upper())
+    sys.stdout.flush()
+"""
+
+# Faux lou_translate dont la sortie reste dans le tampon (comme sans stdbuf sous Windows)
+BUFFERED = """
+import os, sys
+output = os.fdopen(1, "w", buffering=65536)
+for line in sys.stdin:
+    output.write(line.upper())
+"""
+
+
+def fake_executable(directory, name, source):
+    path = os.path.join(directory, name)
+    with open(path, "w", encoding="utf-8") as script:
+        script.write(f"#!{sys.executable}\n{source}")
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR)
+    return path
+
+
+@unittest.skipIf(os.name == "nt", "scripts exécutables POSIX")
+class TestLouTranslatePool(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.pools = []
+
+    def tearDown(self):
+        for pool in self.pools:
+            pool.shutdown()
+
+    def pool(self, source=ECHO.format(delay=0), **options):
+        options.setdefault("check_interval", 3600)
+        pool = LouTranslatePool(fake_executable(self.directory, "lou_translate", source), self.directory, **options)
+        self.pools.append(pool)
+        return pool
+
+    @staticmethod
+    def group_stats(pool):
+        return next(iter(pool.stats().values()))
+
+    def test_first_batch_waits_for_warm_up(self):
+        pool = self.pool(min_workers=2)
+        self.assertEqual(pool.translate(["ab", "c"], "t.utb"), ["AB", "C"])
+        pool.warm("t.utb")
+        stats = self.group_stats(pool)
+        self.assertEqual((stats["total"], stats["busy"]), (2, 0))
+
+    def test_dead_process_is_restarted(self):
+        pool = self.pool(min_workers=1)
+        pool.warm("t.utb")
+        worker = pool._groups[next(iter(pool._groups))].idle[0]
+        worker.process.kill()
+        worker.process.wait()
+        pool.check_workers()
+        stats = self.group_stats(pool)
+        self.assertEqual((stats["total"], stats["restarts"]), (1, 1))
+        self.assertEqual(pool.translate(["x"], "t.utb"), ["X"])
+
+    def test_grows_to_max_workers_then_shrinks_idle_groups(self):
+        pool = self.pool(ECHO.format(delay=0.2), min_workers=1, max_workers=3, idle_timeout=0)
+        pool.warm("t.utb")
+        results = []
+        threads = [
+            threading.Thread(target=lambda i=i: results.append(pool.translate([f"l{i}"], "t.utb")))
+            for i in range(6)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(results), [[f"L{i}"] for i in range(6)])
+        self.assertEqual(self.group_stats(pool)["total"], 3)
+        pool.check_workers()
+        self.assertEqual(self.group_stats(pool)["total"], 1)
+
+    def test_unresponsive_process_disables_pool_at_warm_up(self):
+        pool = self.pool(BUFFERED, probe_timeout=0.3)
+        start = time.monotonic()
+        pool.warm("t.utb")
+        self.assertLess(time.monotonic() - start, 2.0)
+        self.assertFalse(pool.available)
+        with self.assertRaises(LouPoolError):
+            pool.translate(["ab"], "t.utb")
+
+    def test_unresponsive_process_fails_first_batch_within_probe_timeout(self):
+        pool = self.pool(BUFFERED, probe_timeout=0.3)
+        start = time.monotonic()
+        with self.assertRaises(LouPoolError):
+            pool.translate(["ab"], "t.utb")
+        self.assertLess(time.monotonic() - start, 2.0)
+        self.assertFalse(pool.available)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+from backend.layout import LayoutCache, TranslatedDocument
+from backend.offset_map import OffsetMap
+
+
+class TestOffsetMap(unittest.TestCase):
+    def test_lookups_interpolate_between_anchors(self):
+        offset_map = OffsetMap()
+        for text_offset, braille_offset in [(0, 0), (4, 2), (4, 3), (10, 9)]:
+            offset_map.add(text_offset, braille_offset)
+        offset_map.add(3, 12)  # recule dans le texte : ignoré
+        self.assertEqual(len(offset_map), 4)
+        self.assertEqual(offset_map.braille_offset(2), 1)
+        self.assertEqual(offset_map.braille_offset(4), 2)
+        self.assertEqual(offset_map.braille_offset(4, prefer_first=False), 3)
+        self.assertEqual(offset_map.braille_offset(7), 6)
+        self.assertEqual(offset_map.text_offset(6), 7)
+        self.assertEqual(offset_map.text_offset(50), 10)
+
+    def test_document_map_follows_wrapping_and_separators(self):
+        text = "bonjour le monde\n\nsalut"
+        lines = [line.upper() for line in text.split("\n")]
+        document = TranslatedDocument(text, lines, LayoutCache())
+        rendered = document.render(8)
+        self.assertEqual(rendered, "BONJOUR\nLE MONDE\n⣍\nSALUT")
+        offset_map = document.offset_map(8)
+        for position, char in enumerate(text):
+            if char.strip():
+                braille_position = offset_map.braille_offset(position)
+                self.assertEqual(rendered[braille_position], char.upper())
+                self.assertEqual(offset_map.text_offset(braille_position), position)
+
+    def test_liblouis_positions_give_character_anchors(self):
+        # "ab" contracté en une seule cellule, "c" en deux
+        document = TranslatedDocument("abc", ["XYZ"], LayoutCache(), input_positions=[[0, 2, 2]])
+        offset_map = document.offset_map(33)
+        self.assertEqual(offset_map.braille_offset(2), 1)
+        self.assertEqual(offset_map.text_offset(2), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import tempfile
+import threading
+import unittest
+from backend.persistent_cache import PersistentTranslationCache
+
+
+class TestPersistentTranslationCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "cache.db")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_entries_survive_reopening_and_are_scoped_by_namespace(self):
+        cache = PersistentTranslationCache(self.path, compaction_interval=0)
+        cache.put_many("table-v1", True, False, [("bonjour", "⠃⠕⠝⠚⠕⠥⠗")])
+        cache.close()
+
+        reopened = PersistentTranslationCache(self.path, compaction_interval=0)
+        self.assertEqual(reopened.get_many("table-v1", True, False, ["bonjour", "monde"]), {"bonjour": "⠃⠕⠝⠚⠕⠥⠗"})
+        self.assertEqual(reopened.get_many("table-v2", True, False, ["bonjour"]), {})
+        self.assertEqual(reopened.get_many("table-v1", False, False, ["bonjour"]), {})
+        reopened.close()
+
+    def test_compaction_enforces_size_cap(self):
+        cache = PersistentTranslationCache(self.path, max_bytes=200, compaction_interval=0)
+        cache.put_many("t", True, False, [(f"ligne {i}", "⠇" * 10) for i in range(20)])
+        cache.compact()
+        self.assertLessEqual(cache.stats()["bytes"], 200)
+        cache.close()
+
+    def test_threads_share_one_connection_closed_on_shutdown(self):
+        cache = PersistentTranslationCache(self.path, compaction_interval=0.01)
+        cache.put_many("t", True, False, [(f"ligne {i}", "⠇") for i in range(10)])
+
+        def read():
+            for _ in range(50):
+                cache.get_many("t", True, False, ["ligne 1", "ligne 2", "absente"])
+
+        threads = [threading.Thread(target=read) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual((cache.hits, cache.misses), (8 * 50 * 2, 8 * 50))
+        cache.close()
+        self.assertIsNone(cache._conn)
+        self.assertEqual(cache.get_many("t", True, False, ["ligne 1"]), {})
+        self.assertIsNone(cache._conn)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import threading
+import unittest
+from concurrent.futures import CancelledError
+from backend.scheduler import (
+    PriorityExecutor, TokenRegistry,
+    PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+)
+
+
+class Owner:
+    pass
+
+
+class TestPriorityExecutor(unittest.TestCase):
+    def setUp(self):
+        self.executor = PriorityExecutor(max_workers=1)
+        self.gate = threading.Event()
+        # Occupe l'unique thread pour accumuler des tâches en file
+        self.blocker = self.executor.submit(self.gate.wait)
+
+    def tearDown(self):
+        self.gate.set()
+        self.executor.shutdown(wait=True)
+
+    def test_interactive_work_runs_before_background_work(self):
+        order = []
+        background = [self.executor.submit(order.append, f"bg{i}", priority=PRIORITY_BACKGROUND) for i in range(3)]
+        interactive = self.executor.submit(order.append, "typing", priority=PRIORITY_INTERACTIVE)
+        self.gate.set()
+        for future in background + [interactive]:
+            future.result(timeout=5)
+        self.assertEqual(order, ["typing", "bg0", "bg1", "bg2"])
+
+    def test_new_token_drops_outdated_work(self):
+        tokens = TokenRegistry(self.executor)
+        owner = Owner()
+        old_token = tokens.new_token(owner)
+        stale = self.executor.submit(lambda: "stale", priority=PRIORITY_BACKGROUND, token=old_token)
+        new_token = tokens.new_token(owner)
+        fresh = self.executor.submit(lambda: "fresh", token=new_token)
+        self.assertTrue(old_token.cancelled)
+        self.gate.set()
+        self.assertEqual(fresh.result(timeout=5), "fresh")
+        with self.assertRaises(CancelledError):
+            stale.result(timeout=5)
+        self.assertEqual(self.executor.stats()["background"]["cancelled"], 1)
+
+    def test_nested_submit_runs_inline(self):
+        self.gate.set()
+        outer = self.executor.submit(lambda: self.executor.submit(lambda: 42).result(timeout=5))
+        self.assertEqual(outer.result(timeout=5), 42)
+
+
+if __name__ == "__main__":
+    unittest.main()
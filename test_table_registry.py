@@ -0,0 +1,72 @@
+import os
+import tempfile
+import time
+import unittest
+from backend.table_registry import TableRegistry
+
+
+class TestTableRegistry(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.tables_dir = self.directory.name
+        self.write("fr-bfu-comp6.utb", "#+language: fr\ninclude commun.uti\n")
+        self.write("fr-bfu-g2.ctb", "#+language: fr\n#+grade: 2\ninclude fr-bfu-comp6.utb\n")
+        self.write("commun.uti", "include fr-bfu-comp6.utb\nalways a 1\n")
+        self.write("ar-ar-g1.utb", "")
+        self.registry = TableRegistry(
+            self.tables_dir, {"Français (grade 1)": "fr-bfu-comp6.utb", "Arabe (grade 1)": "ar-ar-g1.utb"},
+            check_interval=3600
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, filename, content, delay=0):
+        path = os.path.join(self.tables_dir, filename)
+        with open(path, "w", encoding="utf-8") as table_file:
+            table_file.write(content)
+        if delay:
+            # mtime différent même sur un système de fichiers à la seconde près
+            os.utime(path, (time.time() + delay, time.time() + delay))
+        return path
+
+    def test_metadata_is_reread_when_the_file_changes(self):
+        info = self.registry.get("fr-bfu-g2.ctb")
+        self.assertEqual((info.language, info.grade, info.includes), ("fr", 2, ["fr-bfu-comp6.utb"]))
+        self.assertIs(self.registry.get("fr-bfu-g2.ctb"), info)
+        self.write("fr-bfu-g2.ctb", "#+language: fr\n#+grade: 1\n", delay=10)
+        self.assertEqual(self.registry.get("fr-bfu-g2.ctb").grade, 1)
+
+    def test_directory_listing_is_throttled(self):
+        self.assertEqual(set(self.registry.available_tables()), {"Français (grade 1)", "Arabe (grade 1)"})
+        self.registry.display_names["Anglais (grade 1)"] = "en-us-g1.ctb"
+        self.write("en-us-g1.ctb", "")
+        os.utime(self.tables_dir, (time.time() + 10, time.time() + 10))
+        self.assertIsNone(self.registry.get("en-us-g1.ctb"))
+        self.registry.refresh(force=True)
+        self.assertEqual(self.registry.get("en-us-g1.ctb").language, "en")
+
+    def test_include_cycles_terminate(self):
+        closure = self.registry.include_closure(os.path.join(self.tables_dir, "fr-bfu-g2.ctb"))
+        self.assertEqual(
+            [os.path.basename(path) for path in closure], ["fr-bfu-g2.ctb", "fr-bfu-comp6.utb", "commun.uti"]
+        )
+
+    def test_fingerprint_follows_included_files(self):
+        table = os.path.join(self.tables_dir, "fr-bfu-g2.ctb")
+        fingerprint = self.registry.fingerprint(table)
+        self.assertEqual(self.registry.fingerprint(table), fingerprint)
+        self.write("commun.uti", "include fr-bfu-comp6.utb\nalways a 2\n", delay=10)
+        self.assertNotEqual(self.registry.fingerprint(table), fingerprint)
+
+    def test_language_and_grade_index(self):
+        self.assertEqual(self.registry.languages(), ["ar", "fr"])
+        self.assertEqual(
+            [info.filename for info in self.registry.tables_for_language("fr", grade=1)], ["fr-bfu-comp6.utb"]
+        )
+        self.assertEqual(self.registry.tables_for_language("FR", grade=2)[0].display_name, None)
+        self.assertEqual(self.registry.tables_for_language("ar")[0].display_name, "Arabe (grade 1)")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+from backend.translation_cache import TranslationMemo
+
+
+class TestTranslationMemo(unittest.TestCase):
+    def test_hits_and_misses_are_counted(self):
+        memo = TranslationMemo()
+        key = ("fr.utb", True, False, 1, "bonjour")
+        self.assertIsNone(memo.get(key))
+        memo.put(key, "⠃⠕⠝⠚⠕⠥⠗")
+        self.assertEqual(memo.get_many([key, ("fr.utb", False, False, 1, "bonjour")]), ["⠃⠕⠝⠚⠕⠥⠗", None])
+        stats = memo.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+
+    def test_byte_budget_evicts_least_recently_used(self):
+        memo = TranslationMemo(max_bytes=1000)
+        keys = [("t", True, False, 1, f"ligne {i}") for i in range(10)]
+        memo.put(keys[0], "a")
+        for key in keys[1:]:
+            memo.get(keys[0])
+            memo.put(key, "b")
+        self.assertLessEqual(memo.stats()["bytes"], 1000)
+        self.assertEqual(memo.get(keys[0]), "a")
+        self.assertIsNone(memo.get(keys[1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,14 +15,14 @@ class TestBrailleConverter(unittest.TestCase):
 
     def test_text_to_braille(self):
         text = "Bonjour"
-        table = self.ui.available_tables["Français (Grade 1)"]
+        table = self.ui.available_tables["Français (grade 1)"]
         braille = self.engine.to_braille(text, table)
         self.assertTrue(len(braille) > 0, "Conversion en Braille échouée")
         self.assertIn("⠃⠕⠝⠚⠕⠥⠗", braille, "Conversion incorrecte")
 
     def test_braille_to_text(self):
         braille = "⠃⠕⠝⠚⠕⠥⠗"
-        table = self.ui.available_tables["Français (Grade 1)"]
+        table = self.ui.available_tables["Français (grade 1)"]
         text = self.engine.from_braille(braille, table)
         self.assertEqual(text.lower(), "bonjour", "Conversion inverse incorrecte")
 
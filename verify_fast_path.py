@@ -0,0 +1,52 @@
+"""
+Vérifie la traduction directe des tables de grade 1 (backend/fast_path.py) : chaque
+ligne d'un corpus traduisible sans liblouis est aussi traduite par liblouis et les
+écarts sont affichés.
+
+    python verify_fast_path.py corpus.txt [autre.txt ...] [--tables fr-bfu-comp6.utb,ar-ar-g1.utb]
+"""
+import argparse
+import os
+import sys
+
+from backend.braille_engine import BrailleEngine
+from backend.config import LOU_TRANSLATE_PATH, TABLES_DIRECTORY
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", nargs="+")
+    parser.add_argument("--tables", default="fr-bfu-comp6.utb,ar-ar-g1.utb")
+    parser.add_argument("--lou-path", default=LOU_TRANSLATE_PATH)
+    parser.add_argument("--tables-dir", default=TABLES_DIRECTORY)
+    args = parser.parse_args()
+
+    texts = []
+    for path in args.corpus:
+        with open(path, encoding="utf-8") as corpus_file:
+            texts.append(corpus_file.read())
+
+    engine = BrailleEngine(args.lou_path, args.tables_dir)
+    failures = 0
+    try:
+        for table in args.tables.split(","):
+            table_path = os.path.join(engine.tables_dir, table)
+            fast_path = engine.build_fast_path(table_path)
+            if fast_path is None:
+                print(f"{table} : pas de traduction directe (table absente, grade différent de 1 ou désactivée)")
+                continue
+            lines = [line for text in texts for line in text.split("\n")]
+            covered = sum(1 for line in lines if fast_path.covers(line))
+            mismatches = engine.verify_fast_path(table_path, texts)
+            print(f"{table} : {len(fast_path)} caractères sans contexte, {covered}/{len(lines)} lignes couvertes, "
+                  f"{len(mismatches)} écarts")
+            for line, fast, expected in mismatches[:20]:
+                print(f"  {line!r}\n    directe : {fast}\n    liblouis : {expected}")
+            failures += len(mismatches)
+    finally:
+        engine.shutdown()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())